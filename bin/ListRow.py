@@ -1,7 +1,3 @@
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
 from typing import List, Dict, Any
 
 class ListRow:
@@ -0,0 +1,106 @@
+"""ASCIIフィルタ
+
+読み込んだExcelシートの文字列をASCIIコードのみとする正規化処理を、列単位でまとめて提供する
+
+"""
+from collections import namedtuple
+from typing import List, Any, Sequence
+
+
+class AsciiFilter:
+    """ASCIIフィルタ
+
+    読み込んだExcelシートの値が文字列の場合、No-Break SpaceをSpaceに変換し、ASCIIコード以外を削除する
+    文字列以外の場合はそのまま保持する
+    セル単位ではなく列単位（pandasの列、または値の並び）で処理する
+
+    """
+
+    def strip_to_ascii(org: Any) -> Any:
+        """ASCIIコード以外削除
+
+        引数が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除して返却する
+        文字列以外の場合はそのまま返却する
+
+        Args:
+            org (Any): 元データ
+
+        Returns:
+            Any: ASCIIコード以外削除データ（文字列以外の場合は元データ）
+        """
+        if org and type(org) == str and not org.isascii():
+            # No-Break SpaceをSpaceに変換しascii以外の文字コードを除去
+            return org.replace('\u00a0', '\u0020').encode('ascii', 'ignore').decode('utf-8')
+        return org
+
+    def filter_column(values: Sequence[Any]) -> List[Any]:
+        """列のASCIIコード以外削除
+
+        列の値のうち、ASCIIコード以外を含む文字列のみを変換する
+        ASCIIコードのみの文字列と文字列以外の値は、元のオブジェクトをそのまま返却する
+
+        Args:
+            values (Sequence[Any]): 列の値
+
+        Returns:
+            List[Any]: ASCIIコード以外を削除した列の値
+        """
+        return [value.replace('\u00a0', '\u0020').encode('ascii', 'ignore').decode('utf-8')
+                if type(value) == str and not value.isascii() else value for value in values]
+
+    def filter_frame(sheet):
+        """シートのASCIIコード以外削除
+
+        pandasで読み込んだシートの文字列を含む列を、pandasの文字列操作で列ごとにまとめて変換する
+
+        Args:
+            sheet (pd.DataFrame): pandasで読み込んだシート
+
+        Returns:
+            pd.DataFrame: ASCIIコード以外を削除したシート（変換対象の列がない場合は元のシート）
+        """
+        import pandas as pd
+        converted = {}
+        for i, (_, column) in enumerate(sheet.items()):
+            # 数値、真偽値などの列には文字列が含まれないため変換しない
+            if not (pd.api.types.is_object_dtype(column.dtype) or pd.api.types.is_string_dtype(column.dtype)):
+                continue
+            try:
+                ascii_column = column.str.replace('\u00a0', '\u0020', regex=False).str.encode('ascii', 'ignore').str.decode('utf-8')
+            except AttributeError:
+                # 文字列を含まない列（真偽値のみなど）は変換しない
+                continue
+            # 文字列以外の値は変換結果が欠損値となるため、元の値に戻す
+            converted[i] = ascii_column.where(ascii_column.notna(), column)
+        if not converted:
+            return sheet
+        sheet = sheet.copy(deep=False)
+        for i, ascii_column in converted.items():
+            sheet.isetitem(i, ascii_column)
+        return sheet
+
+    def rows(sheet) -> List[tuple]:
+        """行タプル生成
+
+        pandasで読み込んだシートのASCIIコード以外を削除し、列名を属性名とする行タプルのリストを返却する
+        各行の値はDataFrame.iterrowsで取り出した値と同じとなる
+
+        Args:
+            sheet (pd.DataFrame): pandasで読み込んだシート
+
+        Returns:
+            List[tuple]: 行タプル（namedtuple）のリスト
+        """
+        row_type = AsciiFilter.row_type(list(sheet.columns))
+        return [row_type._make(values) for values in AsciiFilter.filter_frame(sheet).values]
+
+    def row_type(columns: List[Any]) -> type:
+        """行タプル型生成
+
+        Args:
+            columns (List[Any]): 列名リスト
+
+        Returns:
+            type: 列名を属性名とする行タプル型（属性名として使えない列名は「_列番号」）
+        """
+        return namedtuple('SheetRow', [str(column) for column in columns], rename=True)
@@ -0,0 +1,107 @@
+"""上限付きキャッシュ
+
+実行条件項目、コマンド情報、ホスト名などをキーとする生成済みの値を、件数の上限を守って保持する
+
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class BoundedCache:
+    """上限付きキャッシュ
+
+    キーと値を保持し、件数が上限を超えた場合は最後に使用された日時が古いものから破棄する（LRU）
+    複数のスレッドから同時に使用できる
+    常駐プロセスで設定情報を読み込み直した場合など、保持している値が不要になった場合はclear()で破棄する
+
+    """
+
+    def __init__(self, max_entries: int):
+        """初期化
+
+        Args:
+            max_entries (int): 保持する件数の上限
+
+        Raises:
+            ValueError: max_entriesが1未満の場合に発生
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be 1 or more. value:{max_entries}")
+        self.__max_entries: int = max_entries
+        # キーと値（使用日時が古い順）
+        self.__entries: OrderedDict = OrderedDict()
+        # キャッシュの排他ロック
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """件数
+
+        Returns:
+            int: 保持している件数
+        """
+        return len(self.__entries)
+
+    @property
+    def max_entries(self) -> int:
+        """件数上限プロパティ
+
+        Returns:
+            int: 保持する件数の上限
+        """
+        return self.__max_entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """取得
+
+        取得できた場合は、キーを最後に使用されたものとする
+
+        Args:
+            key (Hashable): キー
+            default (Any): キーがない場合に返却する値
+
+        Returns:
+            Any: キーの値 キーがない場合はdefault
+
+        Raises:
+            TypeError: キーのハッシュ値を求められない場合に発生
+        """
+        with self.__lock:
+            # move_to_endはハッシュ値を求められないキーもKeyErrorとするため、先に値を参照する
+            try:
+                value = self.__entries[key]
+            except KeyError:
+                return default
+            self.__entries.move_to_end(key)
+            return value
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        """登録
+
+        キーがない場合は値を登録し、上限を超えた場合は最後に使用された日時が最も古いものを破棄する
+        他のスレッドが先に登録した場合は、その値を返却する
+
+        Args:
+            key (Hashable): キー
+            value (Any): 値
+
+        Returns:
+            Any: 登録されているキーの値
+
+        Raises:
+            TypeError: キーのハッシュ値を求められない場合に発生
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                return self.__entries[key]
+            self.__entries[key] = value
+            if len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+            return value
+
+    def clear(self) -> None:
+        """全破棄
+        """
+        with self.__lock:
+            self.__entries.clear()
@@ -1,17 +1,17 @@
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
 from typing import List, Dict, Any
+from MM_ImmutableConfig import ImmutableConfig
 
 
-class CommandConfig:
+class CommandConfig(ImmutableConfig):
     """実行コマンド設定情報
 
     実行するコマンドの設定を保持する
 
     """
 
+    # 属性はインスタンスごとの__dict__ではなくスロットに保持し、初期化後は変更できないものとする（ImmutableConfigの初期化で設定する）
+    __slots__ = ('__node', '__no', '__task', '__item', '__when', '__command', '__var', '__check_kind', '__result_OK', '__result_NG', '__option')
+
     def __init__(self, node: str, no: str, task: str, item: str, when: str, command: str, var: str, check_kind: str, result_OK: str, result_NG: str, option: str):
         """初期化
 
@@ -29,17 +29,7 @@ class CommandConfig:
             option (str): 後続処理判定項目 エラー時、後続処理を停止するか判定する項目 disableである場合は後続処理を停止せずに実行、
                           ableの場合は後続処理を停止させる
         """
-        self.__node: str = node
-        self.__no: str = no
-        self.__task: str = task
-        self.__item: str = item
-        self.__when: str = when
-        self.__command: str = command
-        self.__var: str = var
-        self.__check_kind: str = check_kind
-        self.__result_OK: str = result_OK
-        self.__result_NG: str = result_NG
-        self.__option: str = option
+        ImmutableConfig.__init__(self, node, no, task, item, when, command, var, check_kind, result_OK, result_NG, option)
 
     @property
     def node(self) -> str:
@@ -161,40 +151,3 @@ class CommandConfig:
             str: インスタンス属性の後続処理判定項目
         """
         return self.__option
-
-    def __str__(self) -> str:
-        """インスタンスの文字列表示
-
-        インスタンス属性の名前と値を表示する
-
-        Returns:
-            str: インスタンス属性の名前と値を表示した文字列
-        """
-        return str(vars(self))
-
-    def __repr__(self) -> str:
-        """インスタンスの文字列表現
-
-        本来の文字列表現ではなく__str__()と同様の文字列とする
-
-        Returns:
-            str: __str__()が返却する文字列
-        """
-        return self.__str__()
-
-    def __eq__(self, __o: object) -> bool:
-        """等価演算子
-
-        比較対象オブジェクトが自身と等価かどうかを判定する
-        同一クラスかつインスタンス変数がすべて等価の場合等価とする
-
-        Args:
-            __o (object): 比較対象オブジェクト
-
-        Returns:
-            bool: 比較対象オブジェクトが自身と等価の場合true 等価でない場合false
-        """
-        if not isinstance(__o, self.__class__):
-            return NotImplemented
-        return self.__dict__ == __o.__dict__
-
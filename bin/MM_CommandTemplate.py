@@ -0,0 +1,187 @@
+"""コマンドテンプレート
+
+コマンド情報の{{変数名}}（{{Group_AMF}}、{{LIST001.DN}}など）を1回だけ分割し、ホストごとの値で置き換える
+
+"""
+import re
+from typing import List, Dict, Any, Iterable, Mapping, Tuple
+
+from MM_ListTable import LIST_COLUMNS
+from MM_BoundedCache import BoundedCache
+
+# 変数の記載（{{変数名}}、前後の空白は無視する）
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*([^{}]*?)\s*\}\}')
+# テンプレートごとに保持する置き換え結果の上限（超えた場合は最後に使用された日時が古いものから破棄する）
+RENDER_CACHE_MAX_ENTRIES = 4096
+# 保持するコマンドテンプレート数の上限
+TEMPLATE_CACHE_MAX_ENTRIES = 4096
+# 値がない場合の目印
+MISSING = object()
+
+# 生成済みのコマンドテンプレート（キーはコマンド情報）
+templates: BoundedCache = BoundedCache(TEMPLATE_CACHE_MAX_ENTRIES)
+
+
+class CommandTemplate:
+    """コマンドテンプレート
+
+    コマンド情報を、文字列の部分と変数の部分に分割して保持し、1回の結合で置き換え後の文字列を生成する
+    変数の値は、置き換え時に渡す辞書（MAINシートのキー、LISTシートの行など）から引く
+    変数名全体がキーにない場合は、最初の"."より前をキーとした値から、残りの名前の要素、属性を順に引く
+    値がない変数は、{{変数名}}のまま残す
+    置き換え結果は変数の値の組（文字列以外の値は型と文字列にした値）ごとに保持し、同じ値の組は2回目から結合しない
+
+    """
+
+    def __init__(self, source: str):
+        """初期化
+
+        Args:
+            source (str): コマンド情報
+        """
+        self.__source: str = source
+        parts: List[str] = PLACEHOLDER_PATTERN.split(source)
+        # 文字列の部分（変数の数+1個）と、変数名（記載順、同じ変数を複数回記載した場合はそれぞれ）
+        self.__literals: Tuple[str, ...] = tuple(parts[0::2])
+        self.__names: Tuple[str, ...] = tuple(parts[1::2])
+        # 変数名ごとの記載（値がない場合に残す文字列）
+        self.__placeholders: Tuple[str, ...] = tuple(match.group(0) for match in PLACEHOLDER_PATTERN.finditer(source))
+        # 変数の値の組ごとの置き換え結果
+        self.__rendered: BoundedCache = BoundedCache(RENDER_CACHE_MAX_ENTRIES)
+
+    def compile(source: str) -> 'CommandTemplate':
+        """コマンドテンプレート取得
+
+        同じコマンド情報のコマンドテンプレートは、生成済みのものを返却する（シナリオ、ホストをまたいで共有し、TEMPLATE_CACHE_MAX_ENTRIES件まで保持する）
+
+        Args:
+            source (str): コマンド情報
+
+        Returns:
+            CommandTemplate: コマンドテンプレート
+        """
+        template = templates.get(source)
+        if template is None:
+            template = templates.setdefault(source, CommandTemplate(source))
+        return template
+
+    def clear_cache() -> None:
+        """コマンドテンプレート破棄
+
+        生成済みのコマンドテンプレートと置き換え結果を破棄する（設定情報の再読み込み時に使用する）
+        """
+        templates.clear()
+
+    @property
+    def source(self) -> str:
+        """コマンド情報プロパティ
+
+        Returns:
+            str: 分割したコマンド情報
+        """
+        return self.__source
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """変数名プロパティ
+
+        Returns:
+            Tuple[str, ...]: コマンド情報に記載された変数名（記載順）
+        """
+        return self.__names
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """置き換え
+
+        Args:
+            values (Mapping[str, Any]): 変数名（または変数名の最初の"."より前）から値を引く辞書
+
+        Returns:
+            str: 変数を値で置き換えたコマンド情報
+        """
+        if not self.__names:
+            return self.__source
+        bound = tuple(CommandTemplate.__lookup(values, name) for name in self.__names)
+        # 1、1.0、Trueは等しい値となるため、文字列以外の値は型と文字列にした値の組をキーとする
+        # （リストなどハッシュ値を求められない値も、文字列にしてキーとする）
+        key = tuple(value if value.__class__ is str else (value.__class__, str(value)) for value in bound)
+        rendered = self.__rendered.get(key)
+        if rendered is None:
+            rendered = self.__rendered.setdefault(key, self.__join(bound))
+        return rendered
+
+    def render_all(self, values_list: Iterable[Mapping[str, Any]]) -> List[str]:
+        """一括置き換え
+
+        Args:
+            values_list (Iterable[Mapping[str, Any]]): ホストごとの変数の値の辞書
+
+        Returns:
+            List[str]: ホストごとの置き換えたコマンド情報（辞書の並び順）
+        """
+        render = self.render
+        return [render(values) for values in values_list]
+
+    def main_values(mainConfigs: Iterable[Any]) -> Dict[str, Any]:
+        """MAINシート変数取得
+
+        Args:
+            mainConfigs (Iterable[Any]): メイン設定情報（key、valueプロパティを持つ行）
+
+        Returns:
+            Dict[str, Any]: MAINシートのキーと値（同じキーは先に記載された値）
+        """
+        values: Dict[str, Any] = {}
+        for mainConfig in mainConfigs:
+            values.setdefault(mainConfig.key, mainConfig.value)
+        return values
+
+    def list_values(listConfig: Any, sheet_name: str = 'LIST001') -> Dict[str, Any]:
+        """LISTシート変数取得
+
+        Args:
+            listConfig (Any): 接続設定情報の行（ListConfig、ListTableRowなど、LIST_COLUMNSのプロパティを持つ行）
+            sheet_name (str): 変数名の接頭辞とするLISTシート名（{{LIST001.DN}}のLIST001）
+
+        Returns:
+            Dict[str, Any]: "LISTシート名.列名（大文字）"と値
+        """
+        return {f'{sheet_name}.{column.upper()}': getattr(listConfig, column) for column in LIST_COLUMNS}
+
+    def __join(self, bound: Tuple[Any, ...]) -> str:
+        """結合
+
+        Args:
+            bound (Tuple[Any, ...]): 変数ごとの値（変数の記載順）
+
+        Returns:
+            str: 文字列の部分と値を交互に結合した文字列
+        """
+        parts: List[str] = [self.__literals[0]]
+        for value, placeholder, literal in zip(bound, self.__placeholders, self.__literals[1:]):
+            parts.append(placeholder if value is MISSING else value if isinstance(value, str) else str(value))
+            parts.append(literal)
+        return ''.join(parts)
+
+    def __lookup(values: Mapping[str, Any], name: str) -> Any:
+        """変数の値取得
+
+        Args:
+            values (Mapping[str, Any]): 変数名から値を引く辞書
+            name (str): 変数名
+
+        Returns:
+            Any: 変数の値 ない場合（None、欠損値を含む）はMISSING
+        """
+        value = values.get(name, MISSING)
+        if value is MISSING and '.' in name:
+            head, *parts = name.split('.')
+            value = values.get(head, MISSING)
+            for part in parts:
+                if value is MISSING or value is None:
+                    return MISSING
+                value = value.get(part, MISSING) if isinstance(value, Mapping) else getattr(value, part, MISSING)
+        # 値はリストなどの場合もあるため、欠損値（NaN）は数値の場合のみ判定する
+        if value is None or (isinstance(value, float) and value != value):
+            return MISSING
+        return value
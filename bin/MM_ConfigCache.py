@@ -0,0 +1,229 @@
+"""設定情報キャッシュ
+
+読み込み済みの設定情報（MainLoadConfig/SubLoadConfig/ListLoadConfig）をディスクに保存し、
+シナリオ設定情報ファイルが更新されていない場合は、ファイルを読み込まずに保存した設定情報を返却する
+
+"""
+import os
+import hashlib
+import pickle
+import stat
+from typing import List, Any
+
+from MM_ScenarioSource import ScenarioSource
+
+
+# ローダバージョン ローダが生成する設定情報の構造を変更した場合は値を上げ、既存のキャッシュを無効にする
+LOADER_VERSION = 8
+# キャッシュファイルの拡張子
+CACHE_SUFFIX = '.pickle'
+
+
+class ConfigCache:
+    """設定情報キャッシュ
+
+    シナリオ設定情報ファイルの内容のハッシュ値とローダバージョンをキーに、読み込み済みの設定情報を保持する
+    ファイルの内容が変わるとキーが変わるため、更新前の設定情報が返却されることはない
+    キャッシュファイル数が上限を超えた場合は、最後に使用された日時が古いものから削除する
+    キャッシュファイルはpickle形式のため、キャッシュディレクトリは実行ユーザ以外が書き込めない場所とすること
+    キャッシュディレクトリの所有者が実行ユーザでない場合、またはグループ、他のユーザが書き込める場合は、キャッシュを使用しない
+
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 32):
+        """初期化
+
+        Args:
+            cache_dir (str): キャッシュディレクトリ 存在しない場合は実行ユーザのみが読み書きできる権限（0o700）で作成する
+            max_entries (int): キャッシュファイル数の上限
+
+        Raises:
+            ValueError: max_entriesが1未満の場合に発生
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be 1 or more. value:{max_entries}")
+        self.__cache_dir: str = cache_dir
+        self.__max_entries: int = max_entries
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # キャッシュディレクトリを安全に使用できるか（使用できない場合、get()はNoneを返却し、put()は保存しない）
+        self.__enabled: bool = ConfigCache.__is_private(cache_dir)
+
+    @property
+    def cache_dir(self) -> str:
+        """キャッシュディレクトリプロパティ
+
+        インスタンス属性のキャッシュディレクトリを取得する
+
+        Returns:
+            str: キャッシュディレクトリ
+        """
+        return self.__cache_dir
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュ使用可否プロパティ
+
+        Returns:
+            bool: キャッシュディレクトリの所有者が実行ユーザで、グループ、他のユーザが書き込めない場合はTrue
+        """
+        return self.__enabled
+
+    @property
+    def max_entries(self) -> int:
+        """キャッシュファイル数上限プロパティ
+
+        インスタンス属性のキャッシュファイル数の上限を取得する
+
+        Returns:
+            int: キャッシュファイル数の上限
+        """
+        return self.__max_entries
+
+    def key(config_file_name: str, config_name: str, engine: str) -> str:
+        """キャッシュキー生成
+
+        シナリオ設定情報ファイルの内容のハッシュ値、設定情報名、読み込みエンジン、ローダバージョンからキーを生成する
+
+        Args:
+            config_file_name (str): シナリオ設定情報ファイルパス（CSV/TSVの場合はディレクトリ）
+            config_name (str): 設定情報名（main/sub/list）
+            engine (str): 読み込みエンジン
+
+        Returns:
+            str: キャッシュキー
+        """
+        file_hash = hashlib.sha256()
+        # ディレクトリの場合は、格納されたファイルのファイル名と内容をファイル名の順に連結する
+        for file_name in ScenarioSource.files(config_file_name):
+            if file_name != config_file_name:
+                file_hash.update(os.path.basename(file_name).encode('utf-8') + b'\0')
+            with open(file_name, 'rb') as config_file:
+                for chunk in iter(lambda: config_file.read(1024 * 1024), b''):
+                    file_hash.update(chunk)
+        return f'{config_name}-{engine}-v{LOADER_VERSION}-{file_hash.hexdigest()}'
+
+    def get(self, key: str) -> Any:
+        """キャッシュ取得
+
+        指定されたキーの設定情報をキャッシュから取得する
+        取得できた場合はキャッシュファイルの使用日時を更新する
+
+        Args:
+            key (str): キャッシュキー
+
+        Returns:
+            Any: 設定情報 キャッシュにない場合、読み込めない場合、またはキャッシュを使用できない場合はNone
+        """
+        if not self.__enabled:
+            return None
+        cache_file_name = self.__path(key)
+        try:
+            with open(cache_file_name, 'rb') as cache_file:
+                config = pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 壊れたキャッシュファイルは削除し、キャッシュにないものとして扱う
+            ConfigCache.__remove(cache_file_name)
+            return None
+        # 使用日時を更新する（削除順の判定に使用） 読み込み後に他プロセスが削除した場合は更新しない
+        try:
+            os.utime(cache_file_name)
+        except OSError:
+            pass
+        return config
+
+    def put(self, key: str, config: Any) -> None:
+        """キャッシュ登録
+
+        指定されたキーで設定情報をキャッシュに保存し、上限を超えたキャッシュファイルを削除する
+        キャッシュを使用できない場合は保存しない
+
+        Args:
+            key (str): キャッシュキー
+            config (Any): 設定情報
+        """
+        if not self.__enabled:
+            return
+        cache_file_name = self.__path(key)
+        # 書き込み途中のファイルを読み込まないよう、一時ファイルに書き込んでから置き換える
+        tmp_file_name = f'{cache_file_name}.{os.getpid()}.tmp'
+        with open(tmp_file_name, 'wb') as tmp_file:
+            pickle.dump(config, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file_name, cache_file_name)
+        self.__evict()
+
+    def clear(self) -> None:
+        """キャッシュ全削除
+
+        キャッシュディレクトリ内のキャッシュファイルをすべて削除する
+        """
+        for cache_file_name in self.__entries():
+            ConfigCache.__remove(cache_file_name)
+
+    def __path(self, key: str) -> str:
+        """キャッシュファイルパス取得
+
+        Args:
+            key (str): キャッシュキー
+
+        Returns:
+            str: キャッシュファイルパス
+        """
+        return os.path.join(self.__cache_dir, key + CACHE_SUFFIX)
+
+    def __entries(self) -> List[str]:
+        """キャッシュファイル一覧取得
+
+        Returns:
+            List[str]: キャッシュファイルパスのリスト
+        """
+        return [os.path.join(self.__cache_dir, file_name)
+                for file_name in os.listdir(self.__cache_dir) if file_name.endswith(CACHE_SUFFIX)]
+
+    def __evict(self) -> None:
+        """キャッシュファイル削除
+
+        キャッシュファイル数が上限を超えている場合、使用日時が古いものから上限まで削除する
+        """
+        entries = []
+        for cache_file_name in self.__entries():
+            try:
+                entries.append((os.stat(cache_file_name).st_mtime_ns, cache_file_name))
+            except FileNotFoundError:
+                # 他プロセスが削除済み
+                continue
+        entries.sort(reverse=True)
+        for _, cache_file_name in entries[self.__max_entries:]:
+            ConfigCache.__remove(cache_file_name)
+
+    def __is_private(cache_dir: str) -> bool:
+        """キャッシュディレクトリ権限確認
+
+        Args:
+            cache_dir (str): キャッシュディレクトリ
+
+        Returns:
+            bool: 所有者が実行ユーザで、グループ、他のユーザが書き込めないディレクトリの場合はTrue
+                  （ユーザIDがないOS（Windows）の場合は、ディレクトリであればTrue）
+        """
+        try:
+            dir_stat = os.stat(cache_dir)
+        except OSError:
+            return False
+        if not stat.S_ISDIR(dir_stat.st_mode):
+            return False
+        if not hasattr(os, 'getuid'):
+            return True
+        return dir_stat.st_uid == os.getuid() and not dir_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def __remove(cache_file_name: str) -> None:
+        """キャッシュファイル削除（存在しない場合は何もしない）
+
+        Args:
+            cache_file_name (str): キャッシュファイルパス
+        """
+        try:
+            os.remove(cache_file_name)
+        except FileNotFoundError:
+            pass
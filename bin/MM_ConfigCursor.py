@@ -0,0 +1,156 @@
+"""設定情報カーソル
+
+読み込んだ設定情報の行を、カーソルごとの位置で順に取り出す
+
+"""
+import threading
+from typing import List, Any, Callable, Sequence
+
+
+class ConfigCursor:
+    """設定情報カーソル
+
+    メイン設定情報、接続設定情報などの行の並びに対して、読み出し位置をカーソルごとに保持する
+    同じ設定情報に複数のカーソルを生成でき、それぞれ独立に読み進める（再入可能）
+    読み出し位置の更新は排他ロックで行うため、1つのカーソルを複数のスレッドから使用した場合も、
+    各行はいずれか1つのスレッドにだけ返却される
+
+        cursor = ConfigCursor(listConfig.listConfigs, ListRow)
+        for listrow_info in cursor:
+            ...
+
+    """
+
+    def __init__(self, rows: Sequence[Any], row_class: Callable[[Any], Any] = None):
+        """初期化
+
+        Args:
+            rows (Sequence[Any]): 設定情報の行（mainConfigs、listConfigsなど、行番号で参照できるもの）
+            row_class (Callable[[Any], Any]): 取り出した行を変換するクラス（MainRow、ListRowなど） Noneの場合は変換しない
+        """
+        self.__rows: Sequence[Any] = rows
+        self.__row_class: Callable[[Any], Any] = row_class
+        # 次に取り出す行番号
+        self.__position: int = 0
+        # 読み出し位置の排他ロック
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """行数
+
+        Returns:
+            int: 設定情報の行数（読み出し位置によらない）
+        """
+        return len(self.__rows)
+
+    def __iter__(self) -> 'ConfigCursor':
+        """行の繰り返し
+
+        現在の読み出し位置から末尾まで取り出す（取り出した行はカーソルの位置を進める）
+
+        Returns:
+            ConfigCursor: 自身
+        """
+        return self
+
+    def __next__(self) -> Any:
+        """次の行取得（繰り返し用）
+
+        Returns:
+            Any: 次の行
+
+        Raises:
+            StopIteration: 末尾まで取り出した場合に発生
+        """
+        return self.next()
+
+    @property
+    def position(self) -> int:
+        """読み出し位置プロパティ
+
+        Returns:
+            int: 次に取り出す行番号
+        """
+        return self.__position
+
+    @property
+    def remaining(self) -> int:
+        """残り行数プロパティ
+
+        Returns:
+            int: 末尾までの取り出していない行数
+        """
+        return max(len(self.__rows) - self.__position, 0)
+
+    def next(self) -> Any:
+        """次の行取得
+
+        Returns:
+            Any: 次の行（row_classが指定された場合は変換した行）
+
+        Raises:
+            StopIteration: 末尾まで取り出した場合に発生
+        """
+        with self.__lock:
+            position = self.__position
+            if position >= len(self.__rows):
+                raise StopIteration
+            self.__position = position + 1
+        return self.__convert(self.__rows[position])
+
+    def next_batch(self, n: int) -> List[Any]:
+        """複数行取得
+
+        次の行からn行をまとめて取り出す 複数のスレッドで呼び出した場合も、同じ行は含まれない
+
+        Args:
+            n (int): 取り出す行数
+
+        Returns:
+            List[Any]: 取り出した行（行の並び順） 末尾に達した場合はn行未満、すべて取り出し済みの場合は空のリスト
+
+        Raises:
+            ValueError: 行数が負の場合に発生
+        """
+        if n < 0:
+            raise ValueError(f'batch size must not be negative. value:{n}')
+        with self.__lock:
+            start = self.__position
+            end = max(min(start + n, len(self.__rows)), start)
+            self.__position = end
+        return [self.__convert(self.__rows[position]) for position in range(start, end)]
+
+    def seek(self, position: int) -> None:
+        """読み出し位置設定
+
+        Args:
+            position (int): 次に取り出す行番号（負の値は末尾から、行数以上は末尾）
+
+        Raises:
+            IndexError: 負の値が行数を超える場合に発生
+        """
+        length = len(self.__rows)
+        if position < 0:
+            position += length
+            if position < 0:
+                raise IndexError('ConfigCursor position out of range')
+        with self.__lock:
+            self.__position = min(position, length)
+
+    def reset(self) -> None:
+        """読み出し位置初期化
+
+        先頭の行から取り出し直す
+        """
+        self.seek(0)
+
+    def __convert(self, row: Any) -> Any:
+        """行変換
+
+        Args:
+            row (Any): 設定情報の行
+
+        Returns:
+            Any: row_classで変換した行 row_classがNoneの場合はそのまま
+        """
+        return row if self.__row_class is None else self.__row_class(row)
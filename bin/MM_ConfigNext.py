@@ -1,7 +1,5 @@
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
+import threading
+import weakref
 from typing import List, Dict, Any
 
 from MainRow import MainRow
@@ -9,18 +7,29 @@ from MainRow import MainRow
 from ListRow import ListRow
 
 from MM_ListConfig import ListConfig
+from MM_ConfigCursor import ConfigCursor
 
-main_cnt = 0
-sub_cnt = 0
-list_cnt = 0
+# main_next/list_nextが使用する、設定情報ごとのカーソル（設定情報が破棄されるとカーソルも破棄される）
+main_cursors = weakref.WeakKeyDictionary()
+list_cursors = weakref.WeakKeyDictionary()
+# カーソル辞書の排他ロック
+cursors_lock = threading.Lock()
 
 class MM_ConfigNext:
 
+    def main_cursor(config_info):
+        # 設定情報に結び付いた新しいカーソルを返す（カーソルごとに先頭から読み進める）
+        return ConfigCursor(config_info.mainConfigs, MainRow)
+
+    # def sub_cursor(config_info):
+    #     return ConfigCursor(config_info.subConfigs, SubRow)
+
+    def list_cursor(config_info):
+        return ConfigCursor(config_info.listConfigs, ListRow)
+
     def main_next(config_info):
-        global main_cnt
-        mainrow_info = MainRow(config_info.mainConfigs[main_cnt])
-        main_cnt += 1
-        return mainrow_info
+        # 従来どおり呼び出すたびに次の行を返す 読み出し位置は設定情報ごとに保持する
+        return MM_ConfigNext.__next(main_cursors, config_info, MM_ConfigNext.main_cursor)
 
     # def sub_next(config_info):
     #     global sub_cnt
@@ -29,7 +38,23 @@ class MM_ConfigNext:
     #     return subrow_info
 
     def list_next(config_info):
-        global list_cnt
-        listrow_info = ListRow(config_info.listConfigs[list_cnt])
-        list_cnt += 1
-        return listrow_info
\ No newline at end of file
+        return MM_ConfigNext.__next(list_cursors, config_info, MM_ConfigNext.list_cursor)
+
+    def reset(config_info):
+        # main_next/list_nextの読み出し位置を先頭に戻す（同じ設定情報を再度繰り返す場合に呼び出す）
+        with cursors_lock:
+            for cursors in (main_cursors, list_cursors):
+                cursor = cursors.get(config_info)
+                if cursor is not None:
+                    cursor.reset()
+
+    def __next(cursors, config_info, new_cursor):
+        with cursors_lock:
+            cursor = cursors.get(config_info)
+            if cursor is None:
+                cursor = cursors[config_info] = new_cursor(config_info)
+        try:
+            return cursor.next()
+        except StopIteration:
+            # 末尾を超えた場合は、従来のリスト参照と同じくIndexErrorとする
+            raise IndexError('config row index out of range') from None
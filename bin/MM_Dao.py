@@ -1,7 +1,4 @@
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
+import os
 from typing import List, Dict, Any
 
 from MM_MainLoadConfig import MainLoadConfig
@@ -9,26 +6,105 @@ from MM_SubLoadConfig import SubLoadConfig
 from MM_ListLoadConfig import ListLoadConfig
 from MM_ConfigNext import MM_ConfigNext
 from MainRow import MainRow
+from MM_Workbook import Workbook, ENGINE_PANDAS
+from MM_ConfigCache import ConfigCache
+from MM_ScenarioSource import ScenarioSource
+from MM_MultiLoadConfig import MultiLoadConfig
+from MM_HostRunner import HostRunner
+from MM_HostPattern import HostPattern
+from MM_WhenExpression import WhenExpression
+from MM_CommandTemplate import CommandTemplate
 
 mainconfigFile = "C:\\python\\MM_scenario_config.xlsx"
 subconfigFile = "C:\\python\\MM_scenario_config.xlsx"
 listconfigFile = "C:\\python\\MM_scenario_config.xlsx"
+# 設定ファイルはxlsxのほか、CSV/TSVディレクトリ、JSON Lines（.jsonl）、SQLite（.sqlite）を指定できる
+# （xlsxからの変換は MM_ScenarioSource.py を使用する）
+# シート読み込みエンジン（"pandas"：従来方式、"openpyxl"：読み取り専用ストリーミング、"xml"：xlsxのXML直接解析）
+configEngine = ENGINE_PANDAS
+# 設定情報キャッシュディレクトリ（Noneの場合はキャッシュを使用しない）
+# 実行ユーザ以外が書き込めるディレクトリは、キャッシュを使用しない（キャッシュファイルはpickle形式のため）
+configCacheDir = os.path.join(os.path.expanduser("~"), ".cache", "MM_config_cache")
+# 設定情報キャッシュファイル数の上限
+configCacheMaxEntries = 32
+# SUB/LISTシートを並列に読み込むプロセス数（0の場合はCPU数、Noneの場合は並列に読み込まない）
+configWorkers = None
+# 複数のワークブックを並列に読み込むプロセス数（0の場合はCPU数、Noneの場合は並列に読み込まない）
+configWorkbookWorkers = 0
+# ホストを並列に実行する数の上限（0の場合は上限なし、Noneの場合は並列に実行しない）と、地域ごと、SSH接続ホスト（踏み台）ごとの上限
+hostWorkers = 16
+hostRegionLimit = None
+hostRemoteHostLimit = 4
+# シナリオの前後のコマンドとの順序を保つタスク名の接頭辞（更新する対象を変数（VAR）に宣言しない設定変更などのタスク）
+# 空のタプルの場合は、実行条件項目、コマンド情報の参照と変数の更新のみでコマンドの依存関係を求める
+scenarioOrderedTasks = ('CMD_CONFIG',)
 
 class MM_Dao:
 
-    def load(config_name: str):
+    def load(config_name: str, engine: str = None, use_cache: bool = True):
 
+        # 読み込みエンジンの指定がない場合はモジュール設定値を使用する
+        engine = engine or configEngine
         if config_name == "main":
-            config = MainLoadConfig(mainconfigFile)
+            config_file_name = mainconfigFile
 
         elif config_name == "sub":
-            config = SubLoadConfig(subconfigFile)
+            config_file_name = subconfigFile
 
         elif config_name == "list":
-            config = ListLoadConfig(listconfigFile)
-        
+            config_file_name = listconfigFile
+
+        # Excel以外の形式の場合、読み込みエンジンはファイル形式から決定する
+        engine = ScenarioSource.engine(config_file_name) or engine
+        # ファイル内容が前回の読み込みから変わっていなければ、キャッシュした設定情報を返却する
+        cache = ConfigCache(configCacheDir, configCacheMaxEntries) if use_cache and configCacheDir else None
+        if cache is not None:
+            cache_key = ConfigCache.key(config_file_name, config_name, engine)
+            config = cache.get(cache_key)
+            if config is not None:
+                return MM_Dao.__bind(config_name, config)
+
+        # 同じファイルに対するMAIN/SUB/LISTの読み込みはワークブックセッションを共有する
+        if config_name == "main":
+            config = MainLoadConfig(Workbook.open(config_file_name, engine))
+
+        elif config_name == "sub":
+            config = SubLoadConfig(Workbook.open(config_file_name, engine), configWorkers)
+
+        elif config_name == "list":
+            config = ListLoadConfig(Workbook.open(config_file_name, engine), configWorkers)
+
+        if cache is not None:
+            if config_name == "sub":
+                # サブシートは参照時に読み込むため、キャッシュに保存する前に全サブシートを読み込む
+                # （読み込まずに保存すると、キャッシュから復元した後の参照で毎回ファイルを読み込み直すことになる）
+                config.load_sheets()
+            cache.put(cache_key, config)
+        return MM_Dao.__bind(config_name, config)
+
+    def __bind(config_name: str, config):
+        # MainRow/ListConfigの列情報（get_row_mainkey()、get__row_nf()など）は、最後にloadしたメイン設定情報、接続設定情報を参照する
+        # （ローダの生成、キャッシュからの復元では切り替わらない 複数のローダの列情報は各ローダのget_row_mainkey()、get_column_list()を使用する）
+        if config_name in ("main", "list"):
+            config.bind()
         return config
     
+    def load_all(config_files, engine: str = None, ignore_errors: bool = False):
+        # 拠点ごとのワークブック（ディレクトリ、globパタン、ファイルパスのリスト）を並列に読み込み、一つに統合する
+        # 読み込みに失敗したファイルがある場合はValueErrorとする（ignore_errors=Trueの場合は警告を出し、除いて統合する）
+        # ListConfigの列情報は統合した接続設定情報を参照する
+        config = MultiLoadConfig(config_files, configWorkbookWorkers, engine or configEngine, ignore_errors)
+        config.bind()
+        return config
+
+    def reload(config_info):
+        # 前回の読み込みから変更されたシートだけを読み込み直す
+        # 変更前の実行条件項目、コマンド情報から生成したホスト名パタン、実行条件式、コマンドテンプレートは破棄する
+        HostPattern.clear_cache()
+        WhenExpression.clear_cache()
+        CommandTemplate.clear_cache()
+        return config_info.reload()
+
     def main_next(config_info):
         row_config = MM_ConfigNext.main_next(config_info)
         return row_config
@@ -41,6 +117,26 @@ class MM_Dao:
         row_config = MM_ConfigNext.list_next(config_info)
         return row_config
 
+    def main_cursor(config_info):
+        # スレッドごと、ホストの繰り返しごとに独立して読み進めるカーソル（next/next_batch/seek/reset、for文で使用する）
+        return MM_ConfigNext.main_cursor(config_info)
+
+    def list_cursor(config_info):
+        return MM_ConfigNext.list_cursor(config_info)
+
+    def run_hosts(config_info, task, on_result=None):
+        # 削除フラグが0の接続設定情報の行ごとにtaskを並列に実行し、実行結果を行の並び順に返す
+        runner = HostRunner(config_info.listConfigs, hostWorkers, hostRegionLimit, hostRemoteHostLimit)
+        return runner.run(task, on_result)
+
+    def get_graph(config_info, scenario):
+        # シナリオの実行コマンドの依存グラフを返す（シナリオがない場合はNone）
+        return config_info.get_graph(scenario, scenarioOrderedTasks)
+
+    def reset(config_info):
+        # main_next/list_nextの読み出し位置を先頭に戻す
+        MM_ConfigNext.reset(config_info)
+
 
 if __name__ == '__main__':
     MM_main_config = MM_Dao.load("main")
@@ -0,0 +1,292 @@
+"""擬似NF
+
+実機の代わりにDNS設定コマンド（amf_dns_show/amf_dns_up/amf_dns_delで使用するgshコマンド）に応答する、プロセス内の擬似NF
+
+"""
+import asyncio
+import shlex
+import time
+from typing import List, Dict, Set, Tuple, Union
+
+from MM_Transport import Session, Transport, CommandResult, STATUS_OK, STATUS_NG, FIELD_SEPARATOR, ENCODING
+
+# 応答するコマンドの接頭辞
+COMMAND_PREFIX = 'gsh'
+# DNSサーバの一覧、DNSサーバアドレスの一覧に表示するクラス
+DNS_CLASS = 'ps Class'
+
+
+class FakeNF:
+    """擬似NF
+
+    コマンド実行対象ホストごとに、DNSサーバ、DNSサーバアドレス、未反映の設定変更を保持し、gshコマンドに応答する
+      list_dns_server、list_dns_server_address all：登録済みの一覧
+      create_dns_server、create_dns_server_address -dn ドメイン名 -ns ネットワークシステム名：未反映の追加（"New"）
+      delete_dns_server、delete_dns_server_address -dn ドメイン名 -ns ネットワークシステム名：未反映の削除（"Deleted"）
+      list_config_pending：未反映の設定変更の一覧、check_config：設定の確認
+      activate_config_pending：未反映の設定変更の反映、undo_config_pending：未反映の設定変更の破棄
+    応答には、コマンドごと（またはすべてのコマンド共通）の遅延を加える
+    serve()でTCPサーバとして起動した場合は、StreamTransportで接続できる
+
+    """
+
+    def __init__(self, latency: Union[float, Dict[str, float]] = 0.0):
+        """初期化
+
+        Args:
+            latency (Union[float, Dict[str, float]]): 応答の遅延（秒） 辞書の場合はgshのサブコマンドごと（辞書にないサブコマンドは遅延なし）
+        """
+        self.__latency: Union[float, Dict[str, float]] = latency
+        # コマンド実行対象ホストごとのDNSサーバ、DNSサーバアドレス（ドメイン名、ネットワークシステム名）
+        self.__servers: Dict[str, Set[Tuple[str, str]]] = {}
+        self.__addresses: Dict[str, Set[Tuple[str, str]]] = {}
+        # コマンド実行対象ホストごとの未反映の設定変更（New/Deleted、種類（server/address）、ドメイン名、ネットワークシステム名）
+        self.__pending: Dict[str, List[Tuple[str, str, str, str]]] = {}
+        # 応答したコマンド数
+        self.__commands: int = 0
+
+    @property
+    def commands(self) -> int:
+        """応答コマンド数プロパティ
+
+        Returns:
+            int: これまでに応答したコマンド数
+        """
+        return self.__commands
+
+    def add_server(self, nf: str, dn: str, ns: str) -> None:
+        """DNSサーバ登録（試験データの準備用）
+
+        DNSサーバとDNSサーバアドレスを、未反映の設定変更なしで登録する
+
+        Args:
+            nf (str): コマンド実行対象ホスト名
+            dn (str): ドメイン名
+            ns (str): ネットワークシステム名
+        """
+        self.__servers.setdefault(nf, set()).add((dn, ns))
+        self.__addresses.setdefault(nf, set()).add((dn, ns))
+
+    def servers(self, nf: str) -> Set[Tuple[str, str]]:
+        """DNSサーバ取得
+
+        Args:
+            nf (str): コマンド実行対象ホスト名
+
+        Returns:
+            Set[Tuple[str, str]]: 反映済みのDNSサーバ（ドメイン名、ネットワークシステム名）
+        """
+        return set(self.__servers.get(nf, ()))
+
+    async def execute(self, nf: str, command: str) -> Tuple[str, str]:
+        """コマンド応答
+
+        Args:
+            nf (str): コマンド実行対象ホスト名
+            command (str): コマンド
+
+        Returns:
+            Tuple[str, str]: 結果（OK/NG）と出力
+        """
+        try:
+            words = shlex.split(command)
+        except ValueError as error:
+            return STATUS_NG, f'syntax error: {error}\n'
+        subcommand = words[1] if len(words) > 1 and words[0] == COMMAND_PREFIX else None
+        latency = self.__latency.get(subcommand, 0.0) if isinstance(self.__latency, dict) else self.__latency
+        if latency:
+            await asyncio.sleep(latency)
+        self.__commands += 1
+        if subcommand is None:
+            return STATUS_NG, f'command not found: {command}\n'
+        return self.respond(nf, subcommand, FakeNF.__options(words[2:]))
+
+    def respond(self, nf: str, subcommand: str, options: Dict[str, str]) -> Tuple[str, str]:
+        """サブコマンド応答
+
+        Args:
+            nf (str): コマンド実行対象ホスト名
+            subcommand (str): gshのサブコマンド
+            options (Dict[str, str]): オプション（-dn、-nsなど、先頭の"-"を除いた名前と値）
+
+        Returns:
+            Tuple[str, str]: 結果（OK/NG）と出力
+        """
+        servers = self.__servers.setdefault(nf, set())
+        addresses = self.__addresses.setdefault(nf, set())
+        pending = self.__pending.setdefault(nf, [])
+        if subcommand == 'list_dns_server':
+            return STATUS_OK, FakeNF.__table(servers)
+        if subcommand == 'list_dns_server_address':
+            return STATUS_OK, FakeNF.__table(addresses)
+        if subcommand in ('create_dns_server', 'create_dns_server_address', 'delete_dns_server', 'delete_dns_server_address'):
+            if 'dn' not in options or 'ns' not in options:
+                return STATUS_NG, f'{subcommand}: -dn and -ns are required\n'
+            action = 'New' if subcommand.startswith('create') else 'Deleted'
+            kind = 'address' if subcommand.endswith('address') else 'server'
+            pending.append((action, kind, options['dn'], options['ns']))
+            return STATUS_OK, ''
+        if subcommand == 'list_config_pending':
+            # 空白を含むドメイン名、ネットワークシステム名もshlex.split()で分割できるよう引用する
+            return STATUS_OK, ''.join(f'"{action}" {kind} {shlex.quote(dn)} {shlex.quote(ns)}\n' for action, kind, dn, ns in pending)
+        if subcommand == 'check_config':
+            return STATUS_OK, 'Info: configuration is valid\n'
+        if subcommand == 'activate_config_pending':
+            for action, kind, dn, ns in pending:
+                target = addresses if kind == 'address' else servers
+                if action == 'New':
+                    target.add((dn, ns))
+                else:
+                    target.discard((dn, ns))
+            pending.clear()
+            return STATUS_OK, 'activated\n'
+        if subcommand == 'undo_config_pending':
+            pending.clear()
+            return STATUS_OK, 'undone\n'
+        return STATUS_NG, f'unknown subcommand: {subcommand}\n'
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        """TCPサーバ起動
+
+        StreamSessionの行単位のコマンド送信に応答するTCPサーバを起動する
+
+        Args:
+            host (str): 待ち受けアドレス
+            port (int): 待ち受けポート 0の場合は空いているポート（server.sockets[0].getsockname()[1]で取得する）
+
+        Returns:
+            asyncio.AbstractServer: 起動したサーバ（close()で停止する）
+        """
+        return await asyncio.start_server(self.__handle, host, port)
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """接続処理
+
+        Args:
+            reader (asyncio.StreamReader): 受信ストリーム
+            writer (asyncio.StreamWriter): 送信ストリーム
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                nf, _, command = line.decode(ENCODING).rstrip('\n').partition(FIELD_SEPARATOR)
+                status, output = await self.execute(nf, command)
+                payload = output.encode(ENCODING)
+                writer.write(f'{status} {len(payload)}\n'.encode(ENCODING) + payload)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def __options(words: List[str]) -> Dict[str, str]:
+        """オプション解析
+
+        Args:
+            words (List[str]): サブコマンドより後の語
+
+        Returns:
+            Dict[str, str]: "-名前 値"の名前と値
+        """
+        options: Dict[str, str] = {}
+        for name, value in zip(words, words[1:]):
+            if name.startswith('-') and not value.startswith('-'):
+                options[name[1:]] = value
+        return options
+
+    def __table(entries: Set[Tuple[str, str]]) -> str:
+        """一覧出力
+
+        Args:
+            entries (Set[Tuple[str, str]]): ドメイン名とネットワークシステム名
+
+        Returns:
+            str: 1行に1件の一覧（ドメイン名、ネットワークシステム名の順に並べる）
+        """
+        return ''.join(f'{dn} {ns} {DNS_CLASS}\n' for dn, ns in sorted(entries))
+
+
+class LocalSession(Session):
+    """擬似NFセッション
+
+    プロセス内の擬似NFにソケットを介さずコマンドを渡す
+
+    """
+
+    def __init__(self, remote_host: str, fakeNF: FakeNF):
+        """初期化
+
+        Args:
+            remote_host (str): SSH接続ホスト名
+            fakeNF (FakeNF): 擬似NF
+        """
+        self.__remote_host: str = remote_host
+        self.__fakeNF: FakeNF = fakeNF
+
+    async def run(self, nf: str, command: str) -> CommandResult:
+        """コマンド実行
+
+        Args:
+            nf (str): コマンド実行対象ホスト名
+            command (str): コマンド
+
+        Returns:
+            CommandResult: 実行結果
+        """
+        start = time.perf_counter()
+        status, output = await self.__fakeNF.execute(nf, command)
+        return CommandResult(self.__remote_host, nf, command, output, status, time.perf_counter() - start)
+
+
+class LocalTransport(Transport):
+    """擬似NFトランスポート
+
+    プロセス内の擬似NFに接続する（試験、負荷試験用）
+
+    """
+
+    def __init__(self, fakeNF: FakeNF, connect_latency: float = 0.0):
+        """初期化
+
+        Args:
+            fakeNF (FakeNF): 擬似NF
+            connect_latency (float): セッション接続の遅延（秒）
+        """
+        self.__fakeNF: FakeNF = fakeNF
+        self.__connect_latency: float = connect_latency
+
+    async def open(self, remote_host: str, ip: str) -> Session:
+        """セッション接続
+
+        Args:
+            remote_host (str): SSH接続ホスト名
+            ip (str): 接続先IP（使用しない）
+
+        Returns:
+            Session: 擬似NFセッション
+        """
+        if self.__connect_latency:
+            await asyncio.sleep(self.__connect_latency)
+        return LocalSession(remote_host, self.__fakeNF)
+
+
+if __name__ == '__main__':
+    from MM_ListLoadConfig import ListLoadConfig
+    from MM_Transport import SessionPool
+
+    async def main(config_file_name: str) -> None:
+        # LISTシートの全ホストにamf_dns_showのコマンドを送信し、所要時間を表示する
+        fakeNF = FakeNF(latency=0.05)
+        listConfigs = ListLoadConfig(config_file_name).listConfigs
+        for row in listConfigs:
+            fakeNF.add_server(row.nf, row.dn, row.ns)
+        start = time.perf_counter()
+        async with SessionPool(LocalTransport(fakeNF, connect_latency=0.1)) as pool:
+            results = await asyncio.gather(*(pool.run(row.remote_host, row.ip, row.nf, command)
+                                             for row in listConfigs
+                                             for command in ('gsh list_dns_server', 'gsh list_dns_server_address all')))
+            print(f'{len(results)} commands, {pool.opened} sessions, {time.perf_counter() - start:.2f}s')
+
+    asyncio.run(main('MM_scenario_config_one.xlsx'))
@@ -0,0 +1,196 @@
+"""ホスト名パタン
+
+実行条件項目（WHEN）のホスト名パタン（"tam.*"、"osc.*"など）の選択肢をまとめて1つの照合器にする
+
+"""
+import re
+from typing import List, Dict, Iterable, Tuple
+
+from MM_BoundedCache import BoundedCache
+
+# 実行条件項目の文字列リテラル（"tam.*"など）
+LITERAL_PATTERN = re.compile(r'"([^"]*)"')
+# 実行条件項目の選択肢の区切り
+OR_SEPARATOR = '||'
+# 正規表現の特殊文字（これらを含まない選択肢は文字列として照合する）
+REGEX_SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+# 前方一致の選択肢の末尾（"tam.*"は"tam"で始まるホスト名に一致する）
+PREFIX_SUFFIX = '.*'
+# 前方一致の照合木で、そのノードまでの文字列を接頭辞とする選択肢の番号を保持するキー（1文字のキーと衝突しない）
+PREFIX_KEY = ''
+# 完全一致の照合木で、そのノードまでの文字列と一致する選択肢の番号を保持するキー
+EXACT_KEY = None
+# 保持するホスト名パタン数の上限（超えた場合は最後に使用された日時が古いものから破棄する）
+PATTERN_CACHE_MAX_ENTRIES = 1024
+# ホスト名パタンごとに保持する照合結果の上限
+MATCH_CACHE_MAX_ENTRIES = 65536
+
+# 生成済みのホスト名パタン（キーは実行条件項目）
+patterns: BoundedCache = BoundedCache(PATTERN_CACHE_MAX_ENTRIES)
+
+
+class HostPattern:
+    """ホスト名パタン
+
+    選択肢（正規表現）のいずれかにホスト名全体が一致するかを、選択肢ごとの照合を繰り返さずに判定する
+    文字列と前方一致（"tam.*"）の選択肢は1つの照合木（トライ）にまとめ、ホスト名を1回たどって照合する
+    それ以外の選択肢は、選択肢ごとに名前付きグループとした1つの正規表現にまとめて照合する
+    複数の選択肢に一致する場合は、先に記載された選択肢に一致したものとする
+    照合結果はホスト名ごとに保持し（MATCH_CACHE_MAX_ENTRIES件まで）、同じホスト名は2回目から照合しない
+
+    """
+
+    def __init__(self, alternatives: Iterable[str]):
+        """初期化
+
+        Args:
+            alternatives (Iterable[str]): 選択肢（ホスト名全体に一致する正規表現、記載順）
+
+        Raises:
+            re.error: 選択肢が正規表現として不正な場合に発生
+        """
+        self.__alternatives: Tuple[str, ...] = tuple(alternatives)
+        # 文字列と前方一致の選択肢の照合木（1文字ごとの入れ子の辞書）
+        self.__trie: Dict = {}
+        # それ以外の選択肢の番号と正規表現
+        regex_alternatives: List[str] = []
+        for number, alternative in enumerate(self.__alternatives):
+            if alternative.endswith(PREFIX_SUFFIX) and HostPattern.__is_literal(alternative[:-len(PREFIX_SUFFIX)]):
+                HostPattern.__node(self.__trie, alternative[:-len(PREFIX_SUFFIX)]).setdefault(PREFIX_KEY, number)
+            elif HostPattern.__is_literal(alternative):
+                HostPattern.__node(self.__trie, alternative).setdefault(EXACT_KEY, number)
+            else:
+                re.compile(alternative)
+                regex_alternatives.append(f'(?P<p{number}>{alternative})')
+        self.__regex = re.compile('|'.join(regex_alternatives)) if regex_alternatives else None
+        # ホスト名ごとの一致した選択肢の番号（一致しない場合は-1）
+        self.__results: BoundedCache = BoundedCache(MATCH_CACHE_MAX_ENTRIES)
+
+    def compile(expression: str) -> 'HostPattern':
+        """ホスト名パタン取得
+
+        実行条件項目から選択肢を取り出し、ホスト名パタンを返却する
+        同じ実行条件項目のホスト名パタンは、生成済みのものを返却する（PATTERN_CACHE_MAX_ENTRIES件まで保持する）
+        選択肢は実行条件項目の文字列リテラル（handover == "tam.*" || handover == "osc.*"）、
+        文字列リテラルがない場合は"||"で区切った各項目（tam.*||osc.*）とする
+
+        Args:
+            expression (str): 実行条件項目
+
+        Returns:
+            HostPattern: 実行条件項目の選択肢のホスト名パタン
+        """
+        hostPattern = patterns.get(expression)
+        if hostPattern is None:
+            alternatives = LITERAL_PATTERN.findall(expression)
+            if not alternatives:
+                alternatives = [alternative.strip() for alternative in expression.split(OR_SEPARATOR) if alternative.strip()]
+            hostPattern = patterns.setdefault(expression, HostPattern(alternatives))
+        return hostPattern
+
+    def clear_cache() -> None:
+        """ホスト名パタン破棄
+
+        生成済みのホスト名パタンと照合結果を破棄する（設定情報の再読み込み時に使用する）
+        """
+        patterns.clear()
+
+    @property
+    def alternatives(self) -> Tuple[str, ...]:
+        """選択肢プロパティ
+
+        Returns:
+            Tuple[str, ...]: 選択肢（記載順）
+        """
+        return self.__alternatives
+
+    def match(self, host: str) -> str:
+        """照合
+
+        Args:
+            host (str): ホスト名
+
+        Returns:
+            str: ホスト名が一致した選択肢 一致しない場合はNone
+        """
+        number = self.__results.get(host)
+        if number is None:
+            number = self.__results.setdefault(host, self.__match_number(host))
+        return self.__alternatives[number] if number >= 0 else None
+
+    def matches(self, host: str) -> bool:
+        """一致判定
+
+        Args:
+            host (str): ホスト名
+
+        Returns:
+            bool: ホスト名がいずれかの選択肢に一致する場合true 一致しない場合false
+        """
+        return self.match(host) is not None
+
+    def classify(self, hosts: Iterable[str]) -> List[str]:
+        """一括照合
+
+        Args:
+            hosts (Iterable[str]): ホスト名
+
+        Returns:
+            List[str]: ホスト名ごとの一致した選択肢（ホスト名の並び順） 一致しない場合はNone
+        """
+        match = self.match
+        return [match(host) for host in hosts]
+
+    def __match_number(self, host: str) -> int:
+        """選択肢番号照合
+
+        Args:
+            host (str): ホスト名
+
+        Returns:
+            int: ホスト名が一致した選択肢のうち、先に記載された選択肢の番号 一致しない場合は-1
+        """
+        numbers: List[int] = []
+        node = self.__trie
+        for char in host:
+            if PREFIX_KEY in node:
+                numbers.append(node[PREFIX_KEY])
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            if PREFIX_KEY in node:
+                numbers.append(node[PREFIX_KEY])
+            if EXACT_KEY in node:
+                numbers.append(node[EXACT_KEY])
+        if self.__regex is not None:
+            regex_match = self.__regex.fullmatch(host)
+            if regex_match is not None:
+                numbers.append(int(regex_match.lastgroup[1:]))
+        return min(numbers) if numbers else -1
+
+    def __is_literal(alternative: str) -> bool:
+        """文字列判定
+
+        Args:
+            alternative (str): 選択肢
+
+        Returns:
+            bool: 選択肢が正規表現の特殊文字を含まない場合true 含む場合false
+        """
+        return not REGEX_SPECIAL_CHARS.intersection(alternative)
+
+    def __node(trie: Dict, text: str) -> Dict:
+        """照合木ノード取得
+
+        Args:
+            trie (Dict): 照合木
+            text (str): 文字列（ノードがない場合は追加する）
+
+        Returns:
+            Dict: 文字列をたどったノード
+        """
+        node = trie
+        for char in text:
+            node = node.setdefault(char, {})
+        return node
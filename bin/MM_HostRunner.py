@@ -0,0 +1,160 @@
+"""ホスト並列実行
+
+接続設定情報の行（ホスト）ごとにシナリオを実行する処理を、同時実行数の上限を守ってスレッドプールで並列に実行する
+
+"""
+from collections import namedtuple, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Tuple, Union
+
+from MM_ListTable import ListTable
+
+# ホストごとの実行結果（接続設定情報の行、行の位置、処理の返却値、処理が発生させた例外）
+HostResult = namedtuple('HostResult', ['row', 'position', 'result', 'error'])
+
+
+class HostRunner:
+    """ホスト並列実行
+
+    削除フラグで絞り込んだ接続設定情報の行ごとに処理（1ホスト分のシナリオ実行）を呼び出す
+    1ホストの処理は1つのスレッドで呼び出すため、ホスト内のステップの順序は処理が決めたとおりに保たれる
+    同時に実行するホスト数は、全体の上限に加えて、地域（region）ごと、SSH接続ホスト（remote_host、踏み台）ごとの上限を守る
+    上限により開始できないホストは、同じ地域、SSH接続ホストのホストが終了するまで待ち、他のホストを先に開始する
+    処理が例外を発生させたホストは、例外を実行結果に記録し、他のホストの処理は続ける
+
+    """
+
+    def __init__(self, listConfigs: Iterable[Any], workers: int = 0,
+                 region_limit: Union[int, Dict[str, int]] = None, remote_host_limit: Union[int, Dict[str, int]] = None,
+                 del_flg: int = 0):
+        """初期化
+
+        Args:
+            listConfigs (Iterable[Any]): 接続設定情報（ListTable、またはregion、remote_host、del_flgのプロパティを持つ行）
+            workers (int): 全体の同時実行ホスト数の上限 0の場合は上限なし Noneの場合は並列に実行せず、行の並び順に実行する
+            region_limit (Union[int, Dict[str, int]]): 地域ごとの同時実行ホスト数の上限（辞書の場合は地域ごと、辞書にない地域は上限なし） Noneの場合は上限なし
+            remote_host_limit (Union[int, Dict[str, int]]): SSH接続ホストごとの同時実行ホスト数の上限（region_limitと同じ形式）
+            del_flg (int): 実行する行の削除フラグ Noneの場合は絞り込まない
+        """
+        if isinstance(listConfigs, ListTable):
+            positions = range(len(listConfigs)) if del_flg is None else listConfigs.mask(del_flg=del_flg).nonzero()[0].tolist()
+            rows = [(position, listConfigs[position]) for position in positions]
+        else:
+            rows = [(position, row) for position, row in enumerate(listConfigs) if del_flg is None or row.del_flg == del_flg]
+        # 実行するホストの行の位置と行（行の並び順）
+        self.__rows: List[Tuple[int, Any]] = rows
+        self.__workers: int = workers
+        self.__region_limit: Union[int, Dict[str, int]] = region_limit
+        self.__remote_host_limit: Union[int, Dict[str, int]] = remote_host_limit
+
+    def __len__(self) -> int:
+        """ホスト数
+
+        Returns:
+            int: 実行するホスト数
+        """
+        return len(self.__rows)
+
+    @property
+    def rows(self) -> List[Any]:
+        """行プロパティ
+
+        Returns:
+            List[Any]: 実行する接続設定情報の行（行の並び順）
+        """
+        return [row for position, row in self.__rows]
+
+    def as_completed(self, task: Callable[[Any], Any]) -> Iterator[HostResult]:
+        """実行（終了順）
+
+        ホストごとの処理を実行し、終了したホストから実行結果を返す
+
+        Args:
+            task (Callable[[Any], Any]): ホストごとの処理（接続設定情報の行を受け取り、返却値を実行結果とする）
+
+        Returns:
+            Iterator[HostResult]: ホストごとの実行結果（終了順）
+        """
+        if self.__workers is None:
+            for position, row in self.__rows:
+                yield HostRunner.__call(task, position, row)
+            return
+        # 地域とSSH接続ホストの組ごとの開始待ちのホスト（組の出現順、組の中は行の並び順）
+        pending: Dict[Tuple[Any, Any], deque] = {}
+        for position, row in self.__rows:
+            pending.setdefault((row.region, row.remote_host), deque()).append((position, row))
+        # 地域ごと、SSH接続ホストごとの実行中のホスト数
+        region_running: Dict[Any, int] = {}
+        remote_host_running: Dict[Any, int] = {}
+        with ThreadPoolExecutor(max_workers=self.__workers or max(len(self.__rows), 1)) as executor:
+            running = {}
+            while pending or running:
+                # 全体、地域、SSH接続ホストの上限に達していない組から、行の並び順に開始する
+                for key in list(pending):
+                    region, remote_host = key
+                    queue = pending[key]
+                    while queue and (not self.__workers or len(running) < self.__workers) \
+                            and region_running.get(region, 0) < HostRunner.__limit(self.__region_limit, region) \
+                            and remote_host_running.get(remote_host, 0) < HostRunner.__limit(self.__remote_host_limit, remote_host):
+                        position, row = queue.popleft()
+                        running[executor.submit(HostRunner.__call, task, position, row)] = key
+                        region_running[region] = region_running.get(region, 0) + 1
+                        remote_host_running[remote_host] = remote_host_running.get(remote_host, 0) + 1
+                    if not queue:
+                        del pending[key]
+                if not running:
+                    raise ValueError('host limit must be at least 1 for every region and remote_host')
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    region, remote_host = running.pop(future)
+                    region_running[region] -= 1
+                    remote_host_running[remote_host] -= 1
+                    yield future.result()
+
+    def run(self, task: Callable[[Any], Any], on_result: Callable[[HostResult], None] = None) -> List[HostResult]:
+        """実行
+
+        Args:
+            task (Callable[[Any], Any]): ホストごとの処理（接続設定情報の行を受け取り、返却値を実行結果とする）
+            on_result (Callable[[HostResult], None]): ホストの処理が終了するたびに呼び出す関数（集計、進捗表示など） Noneの場合は呼び出さない
+
+        Returns:
+            List[HostResult]: ホストごとの実行結果（行の並び順）
+        """
+        results: List[HostResult] = []
+        for hostResult in self.as_completed(task):
+            if on_result is not None:
+                on_result(hostResult)
+            results.append(hostResult)
+        results.sort(key=lambda hostResult: hostResult.position)
+        return results
+
+    def __call(task: Callable[[Any], Any], position: int, row: Any) -> HostResult:
+        """ホスト処理呼び出し
+
+        Args:
+            task (Callable[[Any], Any]): ホストごとの処理
+            position (int): 接続設定情報の行の位置
+            row (Any): 接続設定情報の行
+
+        Returns:
+            HostResult: 実行結果（例外が発生した場合は、返却値をNoneとし例外を記録する）
+        """
+        try:
+            return HostResult(row, position, task(row), None)
+        except Exception as error:
+            return HostResult(row, position, None, error)
+
+    def __limit(limit: Union[int, Dict[str, int]], key: Any) -> float:
+        """上限取得
+
+        Args:
+            limit (Union[int, Dict[str, int]]): 上限（数値、または地域、SSH接続ホストごとの辞書）
+            key (Any): 地域、またはSSH接続ホスト
+
+        Returns:
+            float: 同時実行ホスト数の上限 上限なしの場合は無限大
+        """
+        if isinstance(limit, dict):
+            limit = limit.get(key)
+        return float('inf') if limit is None else limit
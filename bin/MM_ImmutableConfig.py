@@ -0,0 +1,165 @@
+"""変更不可設定情報
+
+初期設定情報、実行コマンド設定情報、シナリオ設定情報、接続設定情報に共通する、初期化後に変更できない設定情報の基底クラス
+
+"""
+from operator import attrgetter
+from typing import Any
+
+
+class ImmutableConfig:
+    """変更不可設定情報
+
+    サブクラスが__slots__に宣言した属性（初期化の引数と同じ並び順）を、初期化後に変更できない属性として保持する
+    等価判定、ハッシュ値、文字列表示、pickle化は宣言した属性の値から行う
+    ハッシュ値は初回の参照時に求めて保持する（設定情報は変更できないため、値が変わることはない）
+
+        class MainConfig(ImmutableConfig):
+            __slots__ = ('__key', '__value')
+
+            def __init__(self, key, value):
+                ImmutableConfig.__init__(self, key, value)
+
+    """
+
+    # ハッシュ値（初回の参照時に設定する）
+    __slots__ = ('__hash',)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """サブクラス生成
+
+        サブクラスが宣言した__slots__から、属性名（名前修飾後の名前）と属性値の取得関数を生成する
+
+        Args:
+            kwargs (Any): クラス生成のキーワード引数
+        """
+        super().__init_subclass__(**kwargs)
+        cls.__fields = tuple(f'_{cls.__name__.lstrip("_")}{name}' if name.startswith('__') else name for name in cls.__slots__)
+        # attrgetterは属性が1つの場合、タプルではなく値を返却する
+        getter = attrgetter(*cls.__fields)
+        cls.__getter = staticmethod(getter if len(cls.__fields) > 1 else lambda config: (getter(config),))
+
+    def __init__(self, *values: Any) -> None:
+        """初期化
+
+        属性は初期化後に変更できないため（__setattr__は常にエラー）、スロットの記述子で設定する
+
+        Args:
+            values (Any): 属性値（__slots__の並び順）
+
+        Raises:
+            TypeError: 属性値の数が__slots__の属性の数と異なる場合に発生
+        """
+        if len(values) != len(self.__fields):
+            raise TypeError(f'{type(self).__name__} takes {len(self.__fields)} values. value:{len(values)}')
+        for name, value in zip(self.__fields, values):
+            object.__setattr__(self, name, value)
+
+    def __str__(self) -> str:
+        """インスタンスの文字列表示
+
+        インスタンス属性の名前と値を表示する
+
+        Returns:
+            str: インスタンス属性の名前と値を表示した文字列
+        """
+        return str(dict(zip(self.__fields, self.__values())))
+
+    def __repr__(self) -> str:
+        """インスタンスの文字列表現
+
+        本来の文字列表現ではなく__str__()と同様の文字列とする
+
+        Returns:
+            str: __str__()が返却する文字列
+        """
+        return self.__str__()
+
+    def __eq__(self, __o: object) -> bool:
+        """等価演算子
+
+        比較対象オブジェクトが自身と等価かどうかを判定する
+        同一クラスかつインスタンス変数がすべて等価の場合等価とする（欠損値同士は等価とする）
+        同一のオブジェクト、ハッシュ値が異なるオブジェクトは、インスタンス変数を比較せずに判定する
+
+        Args:
+            __o (object): 比較対象オブジェクト
+
+        Returns:
+            bool: 比較対象オブジェクトが自身と等価の場合true 等価でない場合false
+        """
+        if not isinstance(__o, self.__class__):
+            return NotImplemented
+        if self is __o:
+            return True
+        if hash(self) != hash(__o):
+            return False
+        return self.__compare_key() == __o.__compare_key()
+
+    def __hash__(self) -> int:
+        """ハッシュ値
+
+        等価なインスタンスは同じハッシュ値とし、辞書のキーや集合の要素として使用できるようにする
+
+        Returns:
+            int: インスタンス属性の値から求めたハッシュ値
+        """
+        try:
+            return self.__hash
+        except AttributeError:
+            hash_value = hash(self.__compare_key())
+            object.__setattr__(self, '_ImmutableConfig__hash', hash_value)
+            return hash_value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """属性設定
+
+        インスタンス属性は変更できないようにする
+
+        Args:
+            name (str): 属性名
+            value (Any): 属性値
+
+        Raises:
+            AttributeError: 常に発生（属性は変更できない）
+        """
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        """属性削除
+
+        Args:
+            name (str): 属性名
+
+        Raises:
+            AttributeError: 常に発生（属性は削除できない）
+        """
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self) -> tuple:
+        """pickle化
+
+        属性は変更できないため、キャッシュからの復元やコピーは初期化の引数で生成し直す（ハッシュ値は保存しない）
+
+        Returns:
+            tuple: クラスと初期化の引数
+        """
+        return (self.__class__, self.__values())
+
+    def __compare_key(self) -> tuple:
+        """比較キー取得
+
+        欠損値（NaN）は自身と等価でなく、ハッシュ値もオブジェクトごとに異なるため、Noneに置き換える
+
+        Returns:
+            tuple: 等価判定とハッシュ値に使用するインスタンス属性の値
+        """
+        return tuple(None if value != value else value for value in self.__values())
+
+    def __values(self) -> tuple:
+        """属性値取得
+
+        Returns:
+            tuple: インスタンス属性の値（__slots__の並び順）
+        """
+        return self.__getter(self)
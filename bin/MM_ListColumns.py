@@ -0,0 +1,59 @@
+"""接続設定情報列情報
+
+接続設定情報テーブルの列を、ListConfigの列情報（get__nf_list()、get__row_nf()など）と同じリストとして提供する
+
+"""
+from typing import Any, Dict, List
+
+from MM_ListTable import ListTable
+
+
+class ListColumns:
+    """接続設定情報列情報
+
+    ローダが保持する接続設定情報テーブルの列を、参照時にリストに復元して保持する
+    ローダの読み込み、再読み込み、キャッシュからの復元ごとに生成し、キャッシュには保存しない
+
+    """
+
+    def __init__(self, table: ListTable):
+        """初期化
+
+        Args:
+            table (ListTable): 接続設定情報テーブル
+        """
+        self.__table: ListTable = table
+        # 列名ごとの列情報リスト（参照時に生成する）
+        self.__column_lists: Dict[str, List[Any]] = {}
+
+    def get_list(self, column: str) -> List[Any]:
+        """列情報リスト取得
+
+        Args:
+            column (str): 列名
+
+        Returns:
+            List[Any]: 接続設定情報テーブルの列の値（接続設定情報テーブルの並び順）
+
+        Raises:
+            KeyError: 列名がLIST_COLUMNS以外の場合に発生
+        """
+        column_list = self.__column_lists.get(column)
+        if column_list is None:
+            column_list = self.__column_lists.setdefault(column, self.__table.column(column))
+        return column_list
+
+    def get_row(self, column: str, row: int) -> Any:
+        """列情報取得
+
+        Args:
+            column (str): 列名
+            row (int): 行番号
+
+        Returns:
+            Any: 接続設定情報テーブルの指定された行の列の値
+
+        Raises:
+            IndexError: 行番号が範囲外の場合に発生
+        """
+        return self.get_list(column)[row]
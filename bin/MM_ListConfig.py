@@ -1,28 +1,20 @@
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
 from typing import List, Dict, Any
+from MM_ImmutableConfig import ImmutableConfig
 
-cNRF_list = []
-cNRF_AMF_list = []
-DEL_FLG_list = []
-DN_list = []
-HOST_list = []
-IP_list = []
-NF_list = []
-NS_list = []
-REGION_list = []
-REMOTE_HOST_list = []
-VER_list = []
-
-class ListConfig:
+# 列情報（get__nf_list()、get__row_nf()など）の参照先とする既定のローダ（bind__loaderで指定する）
+# 列情報は既定のローダのget_column_list()を呼び出すだけのため、複数のローダの列情報は各ローダから直接参照する
+defaultLoader = None
+
+class ListConfig(ImmutableConfig):
     """接続設定情報
 
     NF設備への接続のための設定を保持する
 
     """
 
+    # 属性はインスタンスごとの__dict__ではなくスロットに保持し、初期化後は変更できないものとする（ImmutableConfigの初期化で設定する）
+    __slots__ = ('__nf', '__remote_host', '__cNRF_AMF', '__cNRF', '__host', '__dn', '__ns', '__ip', '__ver', '__region', '__del_flg')
+
     def __init__(self, nf: str, remote_host:str, cNRF_AMF: str, cNRF: str, host:str,
                  dn: str, ns: str, ip: str, ver: int, region: str, del_flg: int) -> None:
         """初期化
@@ -42,51 +34,7 @@ class ListConfig:
 
         """
 
-        global cNRF_list
-        global cNRF_AMF_list
-        global DEL_FLG_list
-        global DN_list
-        global HOST_list
-        global IP_list
-        global NF_list
-        global NS_list
-        global REGION_list
-        global REMOTE_HOST_list
-        global VER_list
-
-        self.__nf: str = nf
-        ListConfig.append__nf(self.__nf)
-
-        self.__remote_host: str = remote_host
-        ListConfig.append__remote_host(self.__remote_host)
-
-        self.__cNRF_AMF: str = cNRF_AMF
-        ListConfig.append__cNRF_AMF(self.__cNRF_AMF)
-
-        self.__cNRF: str = cNRF
-        ListConfig.append__cNRF(self.__cNRF)
-
-        self.__host:str = host
-        ListConfig.append__host(self.__host)
-
-        self.__dn: str = dn
-        ListConfig.append__dn(self.__dn)
-
-        self.__ns: str = ns
-        ListConfig.append__ns(self.__ns)
-
-        self.__ip: str = ip
-        ListConfig.append__ip(self.__ip)
-
-        self.__ver: int = int(ver)
-        ListConfig.append__ver(self.__ver)
-
-        self.__region: str = region
-        ListConfig.append__region(self.__region)
-
-        self.__del_flg: int = int(del_flg)
-        ListConfig.append__del_flg(self.__del_flg)
-
+        ImmutableConfig.__init__(self, nf, remote_host, cNRF_AMF, cNRF, host, dn, ns, ip, int(ver), region, int(del_flg))
 
     @property
     def nf(self) -> str:
@@ -99,14 +47,11 @@ class ListConfig:
         """
         return self.__nf
 
-    def append__nf(val):
-        NF_list.append(val)
-    
     def get__nf_list():
-        return NF_list
+        return ListConfig.__column('nf')
 
     def get__row_nf(row):
-        return NF_list[row]
+        return ListConfig.__column('nf')[row]
 
 
 
@@ -121,14 +66,11 @@ class ListConfig:
         """
         return self.__remote_host
 
-    def append__remote_host(val):
-        REMOTE_HOST_list.append(val)
-    
     def get__remote_host_list():
-        return REMOTE_HOST_list
+        return ListConfig.__column('remote_host')
 
     def get__row_remote_host(row):
-        return REMOTE_HOST_list[row]
+        return ListConfig.__column('remote_host')[row]
 
 
 
@@ -139,14 +81,11 @@ class ListConfig:
         """
         return self.__cNRF_AMF
 
-    def append__cNRF_AMF(val):
-        cNRF_AMF_list.append(val)
-    
     def get__cNRF_AMF_list():
-        return cNRF_AMF_list
+        return ListConfig.__column('cNRF_AMF')
 
     def get__row_cNRF_AMF(row):
-        return cNRF_AMF_list[row]
+        return ListConfig.__column('cNRF_AMF')[row]
 
 
 
@@ -157,14 +96,11 @@ class ListConfig:
         """
         return self.__cNRF
 
-    def append__cNRF(val):
-        cNRF_list.append(val)
-    
     def get__cNRF_list():
-        return cNRF_list
+        return ListConfig.__column('cNRF')
 
     def get__row_cNRF(row):
-        return cNRF_list[row]
+        return ListConfig.__column('cNRF')[row]
 
 
 
@@ -175,14 +111,11 @@ class ListConfig:
         """
         return self.__host
 
-    def append__host(val):
-        HOST_list.append(val)
-    
     def get__host_list():
-        return HOST_list
+        return ListConfig.__column('host')
 
     def get__row_host(row):
-        return HOST_list[row]
+        return ListConfig.__column('host')[row]
 
 
     @property
@@ -196,14 +129,11 @@ class ListConfig:
         """
         return self.__dn
     
-    def append__dn(val):
-        DN_list.append(val)
-    
     def get__dn_list():
-        return DN_list
+        return ListConfig.__column('dn')
 
     def get__row_dn(row):
-        return DN_list[row]
+        return ListConfig.__column('dn')[row]
 
 
     @property
@@ -217,14 +147,11 @@ class ListConfig:
         """
         return self.__ns
 
-    def append__ns(val):
-        NS_list.append(val)
-    
     def get__ns_list():
-        return NS_list
+        return ListConfig.__column('ns')
 
     def get__row_ns(row):
-        return NS_list[row]
+        return ListConfig.__column('ns')[row]
 
 
     @property
@@ -238,14 +165,11 @@ class ListConfig:
         """
         return self.__ip
 
-    def append__ip(val):
-        IP_list.append(val)
-    
     def get__ip_list():
-        return IP_list
+        return ListConfig.__column('ip')
 
     def get__row_ip(row):
-        return IP_list[row]
+        return ListConfig.__column('ip')[row]
 
 
     @property
@@ -259,14 +183,11 @@ class ListConfig:
         """
         return self.__ver
 
-    def append__ver(val):
-        VER_list.append(val)
-    
     def get__ver_list():
-        return VER_list
+        return ListConfig.__column('ver')
 
     def get__row_ver(row):
-        return VER_list[row]
+        return ListConfig.__column('ver')[row]
 
 
     @property
@@ -280,14 +201,11 @@ class ListConfig:
         """
         return self.__region
 
-    def append__region(val):
-        REGION_list.append(val)
-    
     def get__region_list():
-        return REGION_list
+        return ListConfig.__column('region')
 
     def get__row_region(row):
-        return REGION_list[row]
+        return ListConfig.__column('region')[row]
 
 
     @property
@@ -301,49 +219,32 @@ class ListConfig:
         """
         return self.__del_flg
 
-    def append__del_flg(val):
-        DEL_FLG_list.append(val)
-    
     def get__del_flg_list():
-        return DEL_FLG_list
+        return ListConfig.__column('del_flg')
 
     def get__row_del_flg(row):
-        return DEL_FLG_list[row]
+        return ListConfig.__column('del_flg')[row]
 
+    def bind__loader(loader) -> None:
+        """既定ローダ設定
 
-    def __str__(self) -> str:
-        """インスタンスの文字列表示
+        列情報の参照先を、指定されたローダ（ListLoadConfig、MultiLoadConfig）にする
+        ローダの読み込み、キャッシュからの復元では切り替わらないため、参照先は明示的に指定したローダとなる
+        （MM_Dao.load()、MM_Dao.load_all()は読み込んだローダを指定する）
 
-        インスタンス属性の名前と値を表示する
-
-        Returns:
-            str: インスタンス属性の名前と値を表示した文字列
-        """
-        return str(vars(self))
-    
-
-    def __repr__(self) -> str:
-        """インスタンスの文字列表現
-
-        本来の文字列表現ではなく__str__()と同様の文字列とする
-
-        Returns:
-            str: __str__()が返却する文字列
+        Args:
+            loader (Union[ListLoadConfig, MultiLoadConfig]): ローダ（Noneの場合は列情報を空にする）
         """
-        return self.__str__()
-
-    def __eq__(self, __o: object) -> bool:
-        """等価演算子
+        global defaultLoader
+        defaultLoader = loader
 
-        比較対象オブジェクトが自身と等価かどうかを判定する
-        同一クラスかつインスタンス変数がすべて等価の場合等価とする
+    def __column(column: str) -> list:
+        """列情報リスト取得
 
         Args:
-            __o (object): 比較対象オブジェクト
+            column (str): 列名
 
         Returns:
-            bool: 比較対象オブジェクトが自身と等価の場合true 等価でない場合false
+            list: 既定のローダの接続設定情報テーブルの列の値（既定のローダがない場合は空のリスト）
         """
-        if not isinstance(__o, self.__class__):
-            return NotImplemented
-        return self.__dict__ == __o.__dict__
+        return defaultLoader.get_column_list(column) if defaultLoader is not None else []
@@ -0,0 +1,252 @@
+"""接続設定情報索引
+
+接続設定情報テーブルの列に索引を生成し、値による行の検索を列全体の走査なしで行う
+
+"""
+import bisect
+import ipaddress
+import socket
+from typing import List, Dict, Any, Tuple
+
+from MM_ListTable import ListTable, ListTableRow, INT_COLUMNS
+
+
+# 値が行ごとに異なる（1行を検索する）列名
+UNIQUE_COLUMNS = ('cNRF_AMF', 'host', 'cNRF', 'remote_host', 'ip')
+# 値ごとに行をまとめる（複数行を検索する）列名
+GROUP_COLUMNS = ('region', 'ns', 'ver')
+# 索引を生成する列名
+INDEX_COLUMNS = UNIQUE_COLUMNS + GROUP_COLUMNS
+# 数値の索引を生成するIPアドレスの列名
+IP_COLUMN = 'ip'
+
+
+class ListIndex:
+    """接続設定情報索引
+
+    接続設定情報テーブルのINDEX_COLUMNSの列ごとに、値から行番号（同じ値の行が複数ある場合は行番号の配列）を引く辞書を生成する
+    索引は列ごとに符号の配列を1回並び替えて生成し、テーブルを変更した場合（再読み込み時）は生成し直す
+    UNIQUE_COLUMNSの列で同じ値の行が複数ある場合は、get()は先頭の行を返却する
+    欠損値はListTable.compare_value()と同じくNULL_KEYにまとめる
+    IPアドレスの列は、値の一覧を数値（IPバージョンと整数）に変換した順位で行を並び替え、ネットワーク（CIDR）の範囲を二分探索で検索する
+    IPアドレスとして解析できない値は、IPアドレスの検索の対象外とする
+
+    """
+
+    def __init__(self, table: ListTable):
+        """初期化
+
+        Args:
+            table (ListTable): 接続設定情報テーブル
+        """
+        import numpy as np
+        self.__table: ListTable = table
+        # 列名ごとの、値から行番号を引く辞書（値が1行のみの場合は行番号、複数行の場合は行番号の配列（行の並び順））
+        self.__positions: Dict[str, Dict[Any, Any]] = {}
+        for column in INDEX_COLUMNS:
+            array = table.array(column)
+            if not len(array):
+                self.__positions[column] = {}
+                continue
+            # 値（符号）の順に安定ソートし、値が変わる位置で行番号を分割する
+            order = np.argsort(array, kind='stable')
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(array[order])) + 1))
+            codes = array[order[starts]].tolist()
+            if column in INT_COLUMNS:
+                keys = codes
+            else:
+                # 値の一覧は行数と同程度になるため、文字列はそのままキーとし、それ以外（欠損値など）のみcompare_valueを呼び出す
+                category_keys = [value if type(value) is str else ListTable.compare_value(value) for value in table.categories(column)]
+                keys = [category_keys[code] for code in codes]
+            positions: Dict[Any, Any] = dict(zip(keys, order[starts].tolist()))
+            ends = np.append(starts[1:], len(array))
+            for group in np.flatnonzero(ends - starts > 1).tolist():
+                positions[keys[group]] = order[starts[group]:ends[group]]
+            self.__positions[column] = positions
+        # IPアドレスの値の一覧を数値に変換し、重複を除いて昇順に並べる（数値の位置を順位とする）
+        ip_numbers = [ListIndex.ip_number(value) for value in table.categories(IP_COLUMN)]
+        self.__ip_numbers: List[Tuple[int, int]] = sorted({number for number in ip_numbers if number is not None})
+        ranks = {number: rank for rank, number in enumerate(self.__ip_numbers)}
+        # 行ごとの順位（IPアドレスとして解析できない値は末尾の順位）で安定ソートした行番号と、並び替えた順位
+        rank_by_code = np.array([ranks.get(number, len(ranks)) for number in ip_numbers], dtype='intp')
+        row_ranks = rank_by_code[table.array(IP_COLUMN)]
+        self.__ip_order = np.argsort(row_ranks, kind='stable')
+        self.__ip_ranks = row_ranks[self.__ip_order]
+
+    @property
+    def table(self) -> ListTable:
+        """接続設定情報テーブルプロパティ
+
+        Returns:
+            ListTable: 索引を生成した接続設定情報テーブル
+        """
+        return self.__table
+
+    def keys(self, column: str) -> List[Any]:
+        """値一覧取得
+
+        Args:
+            column (str): 索引を生成した列名
+
+        Returns:
+            List[Any]: 列の値の一覧（値の並び順は保証しない）
+
+        Raises:
+            KeyError: 列名がINDEX_COLUMNS以外の場合に発生
+        """
+        return list(self.__positions[column])
+
+    def positions(self, **conditions: Any):
+        """行番号検索
+
+        列名をキーワード、値を条件として、すべての条件に該当する行番号を検索する
+        条件がリスト、タプル、集合の場合は、いずれかの値に該当する行を検索する
+
+            index.positions(region='EAST')
+            index.positions(region='EAST', ver=(1, 2))
+
+        Args:
+            conditions (Any): 索引を生成した列名と値（または値のリスト）
+
+        Returns:
+            numpy.ndarray: すべての条件に該当する行番号（行の並び順）
+
+        Raises:
+            KeyError: 列名がINDEX_COLUMNS以外の場合に発生
+        """
+        import numpy as np
+        result = None
+        for column, condition in conditions.items():
+            positions = self.__positions[column]
+            candidates = list(condition) if isinstance(condition, (list, tuple, set, frozenset)) else [condition]
+            arrays = [np.atleast_1d(positions[key]) for key in {ListTable.compare_value(candidate) for candidate in candidates}
+                      if key in positions]
+            if not arrays:
+                return np.empty(0, dtype='intp')
+            rows = arrays[0] if len(arrays) == 1 else np.sort(np.concatenate(arrays))
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        return np.arange(len(self.__table)) if result is None else result
+
+    def find(self, **conditions: Any) -> ListTable:
+        """行検索
+
+        Args:
+            conditions (Any): 索引を生成した列名と値（または値のリスト） positions()と同じ
+
+        Returns:
+            ListTable: すべての条件に該当する行のテーブル（行の並び順）
+        """
+        return self.__table.select(self.positions(**conditions))
+
+    def get(self, column: str, value: Any) -> ListTableRow:
+        """行取得
+
+        Args:
+            column (str): 索引を生成した列名（主にUNIQUE_COLUMNSの列名）
+            value (Any): 値
+
+        Returns:
+            ListTableRow: 値が一致する先頭の行 ない場合はNone
+
+        Raises:
+            KeyError: 列名がINDEX_COLUMNS以外の場合に発生
+        """
+        rows = self.__positions[column].get(ListTable.compare_value(value))
+        if rows is None:
+            return None
+        return self.__table[rows if isinstance(rows, int) else int(rows[0])]
+
+    def ip_positions(self, network: str):
+        """IPアドレス範囲行番号検索
+
+        IPアドレスの列の値が、ネットワーク（CIDR）の範囲に含まれる行番号を検索する
+        ネットワークアドレス以外のホスト部が指定された場合は、ホスト部を無視する（10.1.2.3/16は10.1.0.0/16）
+
+        Args:
+            network (str): ネットワーク（"10.1.0.0/16"） IPアドレスのみの場合はそのIPアドレス
+
+        Returns:
+            numpy.ndarray: 範囲に含まれる行番号（行の並び順）
+
+        Raises:
+            ValueError: ネットワークとして解析できない場合に発生
+        """
+        import numpy as np
+        ip_network = ipaddress.ip_network(network.strip(), strict=False)
+        # ネットワークの範囲の順位を二分探索し、順位の範囲に含まれる行番号を取り出す
+        start = bisect.bisect_left(self.__ip_numbers, (ip_network.version, int(ip_network.network_address)))
+        end = bisect.bisect_right(self.__ip_numbers, (ip_network.version, int(ip_network.broadcast_address)))
+        return np.sort(self.__ip_order[np.searchsorted(self.__ip_ranks, start):np.searchsorted(self.__ip_ranks, end)])
+
+    def find_network(self, network: str) -> ListTable:
+        """IPアドレス範囲行検索
+
+        Args:
+            network (str): ネットワーク（"10.1.0.0/16"） ip_positions()と同じ
+
+        Returns:
+            ListTable: IPアドレスがネットワークの範囲に含まれる行のテーブル（行の並び順）
+        """
+        return self.__table.select(self.ip_positions(network))
+
+    def get_ip(self, ip: str) -> ListTableRow:
+        """IPアドレス行取得
+
+        IPアドレスを数値として比較するため、表記が異なる同じIPアドレス（前後の空白、IPv6の省略表記など）も一致する
+
+        Args:
+            ip (str): IPアドレス
+
+        Returns:
+            ListTableRow: IPアドレスが一致する先頭の行 ない場合、IPアドレスとして解析できない場合はNone
+        """
+        if ListIndex.ip_number(ip) is None:
+            return None
+        rows = self.ip_positions(ip)
+        return self.__table[int(rows[0])] if len(rows) else None
+
+    def duplicate_ips(self) -> Dict[str, Any]:
+        """重複IPアドレス検出
+
+        数値が同じIPアドレスの行が複数あるIPアドレスを、並び替えた順位の隣接比較で検出する
+        同じcNRFに属する行のように、意図して同じIPアドレスを設定している行も検出する
+
+        Returns:
+            Dict[str, numpy.ndarray]: 正規化したIPアドレスと行番号（行の並び順） IPアドレスの昇順
+        """
+        import numpy as np
+        # 並び替えた順位が変わる位置で行番号を分割し、2行以上の順位（IPアドレスとして解析できない値を除く）を取り出す
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(self.__ip_ranks)) + 1)) if len(self.__ip_ranks) else np.empty(0, dtype='intp')
+        ends = np.append(starts[1:], len(self.__ip_ranks))
+        duplicates: Dict[str, Any] = {}
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            rank = int(self.__ip_ranks[start])
+            if end - start > 1 and rank < len(self.__ip_numbers):
+                version, number = self.__ip_numbers[rank]
+                # 安定ソートのため、同じ順位の行番号は行の並び順
+                duplicates[str(ipaddress.IPv4Address(number) if version == 4 else ipaddress.IPv6Address(number))] = \
+                    self.__ip_order[start:end]
+        return duplicates
+
+    def ip_number(value: Any) -> Tuple[int, int]:
+        """IPアドレス数値変換
+
+        Args:
+            value (Any): IPアドレス（前後の空白は無視する）
+
+        Returns:
+            Tuple[int, int]: IPバージョン（4または6）とIPアドレスの整数値 IPアドレスとして解析できない場合はNone
+        """
+        if type(value) is not str:
+            return None
+        value = value.strip()
+        try:
+            # IPv4は行数分変換するため、ipaddressより高速なinet_ptonで変換する
+            return (4, int.from_bytes(socket.inet_pton(socket.AF_INET, value), 'big'))
+        except OSError:
+            pass
+        try:
+            ip_address = ipaddress.ip_address(value)
+        except ValueError:
+            return None
+        return (ip_address.version, int(ip_address))
@@ -3,68 +3,171 @@
 ホスト設定情報エクセルファイルを読み込み、読み込んだ情報を提供する
 
 """
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
 from MM_ListConfig import ListConfig
+from MM_ListTable import ListTable
+from MM_ListColumns import ListColumns
+from MM_ListIndex import ListIndex
+from MM_Workbook import Workbook
+from MM_SheetPool import SheetPool
+from MM_SheetFingerprint import SheetFingerprint
 from ListRow import ListRow
 
 
-class AsciiFilter:
-    """ASCIIフィルタ
+class ListLoadConfig:
+    """接続設定情報
+
+    シナリオ設定情報ファイルを読み込み、ファイルに設定されたメイン処理設定情報、接続設定情報、サブ処理設定情報を保持する
+    接続設定情報は行ごとのオブジェクトではなく、列ごとの配列で保持する接続設定情報テーブルとして保持する
+    接続設定情報テーブルの読み込み時（再読み込み時を含む）に、cNRF-AMFホスト名や地域などによる検索の索引を生成する
 
-    PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-    文字列以外の場合はそのまま保持する
     """
 
-    def __init__(self, row: pandas.core.series.Series) -> None:
+    def __init__(self, config_file_name: Union[str, Workbook], workers: int = None):
         """初期化
 
-        PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-        文字列以外の場合はそのまま保持する
+        引数で指定されたシナリオ設定情報ファイルを読み込み、インスタンス属性に保持する
+        ファイルパスが指定された場合は、同じファイルを読み込む他のローダとワークブックセッションを共有する
+
+        Args:
+            config_file_name (Union[str, Workbook]): シナリオ設定情報ファイルパス、またはワークブックセッション
+            workers (int): LISTシートを並列に読み込むプロセス数 0の場合はCPU数 Noneの場合は並列に読み込まない
+        """
+        # 設定ファイル読み込み（開いているセッションがあれば共有する）
+        config_file: Workbook = Workbook.open(config_file_name) if isinstance(config_file_name, str) else config_file_name
+        # 再読み込み時に同じセッションを取得するため、ファイルパスと読み込みエンジン、並列数を保持する
+        self.__config_file_name: str = config_file.config_file_name
+        self.__engine: str = config_file.engine
+        self.__workers: int = workers
+        # 再読み込み時に変更されたシートを判定するため、シートのフィンガープリントを保持する（ワークブックセッションで共有する）
+        self.__fingerprint: SheetFingerprint = config_file.fingerprint
+        # 設定ファイルのシート名読み込み（返却値はList型）
+        config_sheet_name: List = config_file.sheet_names
+        # リストシート名リスト初期化
+        list_sheet_list: List = ListLoadConfig.__list_sheets(config_sheet_name)
+        # 読み込んだ設定ファイルと接続設定情報シート名を引数に、接続設定情報ロードを呼び出す
+        self.__sheetConfigs: Dict[str, ListTable] = ListLoadConfig.__load_list_info(config_file, list_sheet_list, workers)
+        self.__listConfigs: ListTable = ListTable.concat(self.__sheetConfigs.values())
+        self.__index: ListIndex = ListIndex(self.__listConfigs)
+        self.__columns: ListColumns = ListColumns(self.__listConfigs)
+
+    @property
+    def listConfigs(self) -> ListTable:
+        """接続設定情報プロパティ
+
+        インスタンス属性の接続設定情報を取得する
+        接続設定情報シートがある限り、読み込む
+        行番号で参照した行はListConfigと同じプロパティを持つ
+
+        Returns:
+            ListTable: 接続設定情報テーブル（LISTシートの並び順）
+        """
+        return self.__listConfigs
+
+    @property
+    def index(self) -> ListIndex:
+        """接続設定情報索引プロパティ
+
+        Returns:
+            ListIndex: 接続設定情報テーブルの索引（cNRF-AMFホスト名、ホスト名、IP、地域などで検索する）
+        """
+        return self.__index
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """保存
+
+        キャッシュに保存するインスタンス属性を返却する（接続設定情報テーブルから生成できる索引、列情報は保存しない）
+
+        Returns:
+            Dict[str, Any]: 保存するインスタンス属性
+        """
+        state = self.__dict__.copy()
+        del state['_ListLoadConfig__index']
+        del state['_ListLoadConfig__columns']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """復元
+
+        キャッシュから復元した接続設定情報テーブルの索引、列情報を生成する
+
+        Args:
+            state (Dict[str, Any]): 復元するインスタンス属性
         """
-        for col_name in row.index:
-            setattr(self, col_name, AsciiFilter.__strip_to_ascii(row[col_name]))
+        self.__dict__.update(state)
+        self.__index = ListIndex(self.__listConfigs)
+        self.__columns = ListColumns(self.__listConfigs)
 
-    def __strip_to_ascii(org: Any) -> Any:
-        """ASCIIコード以外削除
+    def get_column_list(self, column: str) -> List[Any]:
+        """列情報リスト取得
 
-        引数が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除して返却する
-        文字列以外の場合はそのまま返却する
+        Args:
+            column (str): 列名
+
+        Returns:
+            List[Any]: このインスタンスの接続設定情報テーブルの列の値（LISTシートの並び順）
+        """
+        return self.__columns.get_list(column)
+
+    def get_row_value(self, column: str, row: int) -> Any:
+        """列情報取得
 
         Args:
-            org (Any): 元データ
+            column (str): 列名
+            row (int): 行番号
 
         Returns:
-            Any: ASCIIコード以外削除データ（文字列以外の場合は元データ）
+            Any: このインスタンスの接続設定情報テーブルの指定された行の列の値
         """
-        if org and type(org) == str:
-            # No-Break SpaceをSpaceに変換しascii以外の文字コードを除去
-            return org.replace('\u00a0', '\u0020').encode('ascii', 'ignore').decode('utf-8')
-        return org
+        return self.__columns.get_row(column, row)
 
-class ListLoadConfig:
-    """接続設定情報
+    def bind(self) -> None:
+        """列情報参照先設定
 
-    シナリオ設定情報ファイルを読み込み、ファイルに設定されたメイン処理設定情報、接続設定情報、サブ処理設定情報を保持する
+        ListConfigの列情報（get__nf_list()、get__row_nf()など）の参照先を、このインスタンスにする
+        読み込み、キャッシュからの復元では呼び出さないため、参照先は明示的に呼び出したインスタンスとなる
+        再読み込みした場合、列情報は再読み込み後の接続設定情報を示す
+        """
+        ListConfig.bind__loader(self)
 
-    """
+    def reload(self) -> List[str]:
+        """再読み込み
 
-    def __init__(self, config_file_name: str):
-        """初期化
+        シナリオ設定情報ファイルのうち、前回の読み込みから変更または追加されたLISTシートだけを読み込み直す
+        変更されていないLISTシートの接続設定情報はそのまま使用し、削除されたLISTシートの接続設定情報は破棄する
+        索引、列情報は読み込み直した接続設定情報テーブルから生成し直す
 
-        引数で指定されたシナリオ設定情報ファイルを読み込み、インスタンス属性に保持する
+        Returns:
+            List[str]: 読み込み直したLISTシート名リスト
+        """
+        fingerprint = SheetFingerprint(self.__config_file_name, self.__fingerprint)
+        changed_sheets = fingerprint.changed_sheets(self.__fingerprint)
+        config_file = Workbook.open(self.__config_file_name, self.__engine)
+        list_sheet_list = ListLoadConfig.__list_sheets(config_file.sheet_names)
+        reload_sheet_list = [list_sheet_name for list_sheet_name in list_sheet_list
+                             if list_sheet_name in changed_sheets or list_sheet_name not in self.__sheetConfigs]
+        if not reload_sheet_list and list(self.__sheetConfigs) == list_sheet_list:
+            self.__fingerprint = fingerprint
+            return []
+        reloadConfigs = ListLoadConfig.__load_list_info(config_file, reload_sheet_list, self.__workers)
+        self.__sheetConfigs = {list_sheet_name: reloadConfigs.get(list_sheet_name, self.__sheetConfigs.get(list_sheet_name))
+                               for list_sheet_name in list_sheet_list}
+        self.__listConfigs = ListTable.concat(self.__sheetConfigs.values())
+        self.__index = ListIndex(self.__listConfigs)
+        self.__columns = ListColumns(self.__listConfigs)
+        self.__fingerprint = fingerprint
+        return reload_sheet_list
+
+    def __list_sheets(config_sheet_name: List[str]) -> List[str]:
+        """LISTシート名取得
 
         Args:
-            config_file_name (str): シナリオ設定情報ファイルパス
+            config_sheet_name (List[str]): 設定ファイルのシート名リスト
+
+        Returns:
+            List[str]: LISTシート名リスト
         """
-        # 設定ファイル読み込み
-        config_file = pd.ExcelFile(config_file_name, engine='openpyxl')
-        # 設定ファイルのシート名読み込み（返却値はList型）
-        config_sheet_name: List = config_file.sheet_names
         # リストシート名リスト初期化
         list_sheet_list: List = []
         # 設定ファイルのシート名リストから、各シート名を繰り返し取り出す
@@ -73,53 +176,42 @@ class ListLoadConfig:
             if 'LIST' in sheet_name:
                 # 接続設定情報シート名設定
                 list_sheet_list.append(sheet_name)
-        # 読み込んだ設定ファイルと接続設定情報シート名を引数に、接続設定情報ロードを呼び出す
-        self.__listConfigs: Dict[str, ListConfig] = ListLoadConfig.__load_list_info(config_file, list_sheet_list)
+        return list_sheet_list
 
-    @property
-    def listConfigs(self) -> Dict[str, ListConfig]:
-        """接続設定情報プロパティ
+    def __load_list_info(config_file: Workbook, list_sheet_list: List, workers: int = None) -> Dict[str, ListTable]:
+        """接続設定情報ロード
 
-        インスタンス属性の接続設定情報を取得する
-        接続設定情報シートがある限り、読み込む
+        シナリオ設定情報ファイルの「LIST」シートから情報を読み込み、接続設定情報として返却する
+        「LIST」シートがある限り、設定情報を読み込む
+        並列数が指定された場合は、LISTシートをプロセスプールで並列に読み込み、シートの並び順に連結する
+
+        Args:
+            config_file (Workbook): シナリオ設定情報ファイルのワークブックセッション
+            list_sheet_list (List): LISTシート名リスト
+            workers (int): 並列数 0の場合はCPU数 Noneの場合は並列に読み込まない
 
         Returns:
-            Dict[str, ListConfig]: 接続設定情報
+            Dict[str, ListTable]: LISTシートごとの接続設定情報テーブル キーはLISTシート名（シートの並び順）
         """
-        return self.__listConfigs
+        # 引渡されたリストシート名リストに格納されているリストシート名を順に読み込む
+        return dict(zip(list_sheet_list, SheetPool.parse(config_file, list_sheet_list, ListLoadConfig.load_sheet, workers)))
 
-    def __load_list_info(config_file: pd.ExcelFile, list_sheet_list: List) -> Dict[str, ListConfig]:
-        """接続設定情報ロード
+    def load_sheet(config_file: Workbook, list_sheet_name: str) -> ListTable:
+        """LISTシートロード
 
-        シナリオ設定情報ファイルの「LIST」シートから情報を読み込み、接続設定情報として返却する
-        「LIST」シートがある限り、設定情報を読み込む
+        シナリオ設定情報ファイルの指定された「LIST」シートから情報を読み込み、接続設定情報として返却する
 
         Args:
-            config_file (pd.ExcelFile): シナリオ設定情報ファイル（pandasでExcelファイルを表すオブジェクト）
+            config_file (Workbook): シナリオ設定情報ファイルのワークブックセッション
+            list_sheet_name (str): LISTシート名
 
         Returns:
-            Dict[str, ListConfig]: 接続設定情報
+            ListTable: LISTシートの接続設定情報テーブル
         """
-        # 接続設定情報を初期化する
-        listConfigs: List[ListConfig] = []
-        # 引渡されたリストシート名リストに格納されているリストシート名を順に呼び出す
-        for list_sheet_name in list_sheet_list:
-            # リストに格納されている順に取得したリスト名のシナリオ取得
-            list_collect_sheet = config_file.parse(list_sheet_name)
-            # LISTシートの行でループする
-            for row in [AsciiFilter(row) for _, row in list_collect_sheet.iterrows()]:
-                # 各列の1行目をキー、2行目以降を値として格納しているものを変数化
-                list_row_items = row.__dict__.items()
-                # 各行情報リストを初期化
-                list_row_vallist = []
-                for list_row_key, list_row_val in list_row_items:
-                    # 各行の情報を格納
-                    list_row_vallist.append(list_row_val)
-                # LISTシートの行のコマンド実行ホスト名"HOST"がnullでない場合
-                if not pd.isnull(row.cNRF_AMF):
-                    # LISTシートの行の情報から接続設定情報を生成し、接続設定情報リストに追加する
-                    listConfigs.append(ListConfig(*list_row_vallist))
-        return listConfigs
+        # 指定されたリスト名のシナリオ取得
+        list_collect_sheet: List[tuple] = config_file.rows(list_sheet_name)
+        # LISTシートの行のうち、cNRF-AMFホスト名"cNRF_AMF"がnullでない行から接続設定情報テーブルを生成する
+        return ListTable(row for row in list_collect_sheet if not Workbook.is_null(row.cNRF_AMF))
 
     # def get_scenario(self, scenario: str) -> ScenarioConfig:
     #     """シナリオ設定情報取得
@@ -167,6 +259,7 @@ class ListLoadConfig:
 if __name__ == '__main__':
     config_file_name = 'C:\\python\\MM_scenario_config.xlsx'
     config = ListLoadConfig(config_file_name)
+    config.bind()
     # print(len(config.listConfigs))
     cNRF_AMF_list = ListConfig.get__cNRF_AMF_list()
     print(len(cNRF_AMF_list))
@@ -0,0 +1,475 @@
+"""接続設定情報テーブル
+
+LISTシートの接続設定情報を、行ごとのオブジェクトではなく列ごとの配列で保持する
+
+"""
+from typing import List, Dict, Any, Iterable, Sequence, Union
+
+from MM_Workbook import Workbook
+from MM_SymbolTable import SymbolTable
+
+
+# LISTシートの列名（ListConfigの引数と同じ並び順）
+LIST_COLUMNS = ('nf', 'remote_host', 'cNRF_AMF', 'cNRF', 'host', 'dn', 'ns', 'ip', 'ver', 'region', 'del_flg')
+# 整数配列で保持する列名
+INT_COLUMNS = ('ver', 'del_flg')
+# 辞書符号化（値の一覧と、値の一覧の位置を示す符号の配列）で保持する列名
+CODE_COLUMNS = tuple(column for column in LIST_COLUMNS if column not in INT_COLUMNS)
+# 整数列の配列の型
+INT_DTYPE = 'int64'
+# 辞書符号化した列の符号の配列の型
+CODE_DTYPE = 'int32'
+# 辞書符号化時に欠損値（NaN）をまとめるためのキー（NaNは自身と等価でないため、値をそのままキーにできない）
+NULL_KEY = object()
+
+
+class ListTable:
+    """接続設定情報テーブル
+
+    接続設定情報を列ごとのNumPy配列で保持する
+    ver、del_flgは整数配列、文字列の列は値の一覧と符号の配列に辞書符号化して保持し、
+    行はListTableRowとして参照時に生成する
+    地域、バージョン、削除フラグなどによる絞り込みは、列全体に対する配列演算で行う
+    NumPyは接続設定情報を生成する場合のみ使用するため、各処理の中で読み込む
+
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]] = ()):
+        """初期化
+
+        Args:
+            rows (Iterable[Sequence[Any]]): LISTシートの行（LIST_COLUMNSの並び順の値）
+
+        Raises:
+            TypeError: 行の列数がLIST_COLUMNSの列数と異なる場合に発生
+            ValueError: ver、del_flgが整数に変換できない場合に発生
+        """
+        import numpy as np
+        rows = list(rows)
+        for row in rows:
+            if len(row) != len(LIST_COLUMNS):
+                raise TypeError(f'LIST row must have {len(LIST_COLUMNS)} columns. value:{len(row)}')
+        # 行を列に転置し、列ごとに配列を生成する
+        columns = zip(*rows) if rows else [()] * len(LIST_COLUMNS)
+        # 辞書符号化の値の一覧
+        self.__categories: Dict[str, List[Any]] = {}
+        self.__arrays: Dict[str, Any] = {}
+        # 列をまたいで同じ値の文字列（nf、cNRF、hostなどのホスト名）を1つのオブジェクトにまとめるシンボルテーブル
+        symbols: SymbolTable = SymbolTable()
+        for column, values in zip(LIST_COLUMNS, columns):
+            if column in INT_COLUMNS:
+                self.__arrays[column] = np.array([int(value) for value in values], dtype=INT_DTYPE)
+            else:
+                categories: List[Any] = []
+                code_index: Dict[Any, int] = {}
+                # 行数分繰り返すため、出現済みの値と初出の文字列はここで符号化し、それ以外（欠損値など）のみ__encodeを呼び出す
+                get_code = code_index.get
+                codes: List[int] = []
+                for value in values:
+                    code = get_code(value)
+                    if code is None:
+                        if type(value) is str:
+                            code = code_index[value] = len(categories)
+                            categories.append(symbols.intern(value))
+                        else:
+                            code = ListTable.__encode(categories, code_index, value)
+                    codes.append(code)
+                self.__arrays[column] = np.array(codes, dtype=CODE_DTYPE)
+                self.__categories[column] = categories
+
+    def __len__(self) -> int:
+        """行数
+
+        Returns:
+            int: 接続設定情報の行数
+        """
+        return len(self.__arrays[LIST_COLUMNS[0]])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union['ListTableRow', 'ListTable']:
+        """行取得
+
+        Args:
+            index (Union[int, slice]): 行番号（負の値は末尾から）、またはスライス
+
+        Returns:
+            Union[ListTableRow, ListTable]: 行番号の場合は行、スライスの場合は該当する行のテーブル
+
+        Raises:
+            IndexError: 行番号が範囲外の場合に発生
+        """
+        if isinstance(index, slice):
+            return self.select(range(len(self))[index])
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('ListTable index out of range')
+        return ListTableRow(self, index)
+
+    def __iter__(self):
+        """行の繰り返し
+
+        Returns:
+            Iterator[ListTableRow]: 行の並び順に生成した行
+        """
+        return (ListTableRow(self, index) for index in range(len(self)))
+
+    def __eq__(self, __o: object) -> bool:
+        """等価演算子
+
+        同一クラスかつ全行の値が等価の場合等価とする（辞書符号化の値の一覧の並び順は比較せず、欠損値同士は等価とする）
+
+        Args:
+            __o (object): 比較対象オブジェクト
+
+        Returns:
+            bool: 比較対象オブジェクトが自身と等価の場合true 等価でない場合false
+        """
+        if not isinstance(__o, self.__class__):
+            return NotImplemented
+        return len(self) == len(__o) and all([ListTable.compare_value(value) for value in self.column(column)] ==
+                                             [ListTable.compare_value(value) for value in __o.column(column)]
+                                             for column in LIST_COLUMNS)
+
+    def __str__(self) -> str:
+        """インスタンスの文字列表示
+
+        Returns:
+            str: 全行の値を表示した文字列
+        """
+        return str([row.values() for row in self])
+
+    def __repr__(self) -> str:
+        """インスタンスの文字列表現
+
+        本来の文字列表現ではなく__str__()と同様の文字列とする
+
+        Returns:
+            str: __str__()が返却する文字列
+        """
+        return self.__str__()
+
+    @property
+    def nbytes(self) -> int:
+        """配列サイズプロパティ
+
+        Returns:
+            int: 列の配列が使用しているバイト数（辞書符号化の値の一覧は含まない）
+        """
+        return sum(array.nbytes for array in self.__arrays.values())
+
+    def value(self, column: str, index: int) -> Any:
+        """値取得
+
+        Args:
+            column (str): 列名
+            index (int): 行番号
+
+        Returns:
+            Any: 指定された行、列の値
+        """
+        if column in INT_COLUMNS:
+            return int(self.__arrays[column][index])
+        return self.__categories[column][self.__arrays[column][index]]
+
+    def column(self, column: str) -> List[Any]:
+        """列取得
+
+        Args:
+            column (str): 列名
+
+        Returns:
+            List[Any]: 指定された列の値（行の並び順）
+        """
+        if column in INT_COLUMNS:
+            return self.__arrays[column].tolist()
+        categories = self.__categories[column]
+        return [categories[code] for code in self.__arrays[column].tolist()]
+
+    def array(self, column: str):
+        """列配列取得
+
+        Args:
+            column (str): 列名
+
+        Returns:
+            numpy.ndarray: 整数列の場合は値の配列、文字列の列の場合は符号の配列（categoriesの位置）
+        """
+        return self.__arrays[column]
+
+    def categories(self, column: str) -> List[Any]:
+        """値一覧取得
+
+        Args:
+            column (str): 辞書符号化した列名
+
+        Returns:
+            List[Any]: 符号の配列が示す値の一覧（最初に出現した順）
+        """
+        return self.__categories[column]
+
+    def mask(self, **conditions: Any):
+        """絞り込み条件判定
+
+        列名をキーワード、値を条件として、すべての条件に該当する行を判定する
+        条件がリスト、タプル、集合の場合は、いずれかの値に該当する行を判定する
+
+            table.mask(region='EAST', del_flg=0)
+            table.mask(ver=(1, 2))
+
+        Args:
+            conditions (Any): 列名と値（または値のリスト）
+
+        Returns:
+            numpy.ndarray: 行ごとの判定結果（bool配列）
+
+        Raises:
+            KeyError: 列名がLIST_COLUMNS以外の場合に発生
+        """
+        import numpy as np
+        mask = np.ones(len(self), dtype=bool)
+        for column, condition in conditions.items():
+            if column not in LIST_COLUMNS:
+                raise KeyError(column)
+            candidates = list(condition) if isinstance(condition, (list, tuple, set, frozenset)) else [condition]
+            if column in CODE_COLUMNS:
+                # 値を符号に変換し、符号の配列と比較する（値の一覧にない値はどの行にも該当しない）
+                candidates = [code for code, value in enumerate(self.__categories[column])
+                              if any(ListTable.compare_value(value) == ListTable.compare_value(candidate) for candidate in candidates)]
+            if len(candidates) == 1:
+                mask &= self.__arrays[column] == candidates[0]
+            else:
+                mask &= np.isin(self.__arrays[column], candidates)
+        return mask
+
+    def select(self, rows) -> 'ListTable':
+        """行抽出
+
+        Args:
+            rows (Union[numpy.ndarray, Iterable[int]]): 行ごとの判定結果（bool配列）、または行番号
+
+        Returns:
+            ListTable: 指定された行のテーブル（辞書符号化の値の一覧は共有する）
+        """
+        import numpy as np
+        rows = np.asarray(rows)
+        if rows.dtype != bool:
+            rows = rows.astype('intp')
+        table = ListTable.__new__(ListTable)
+        table.__categories = self.__categories
+        table.__arrays = {column: array[rows] for column, array in self.__arrays.items()}
+        return table
+
+    def filter(self, **conditions: Any) -> 'ListTable':
+        """絞り込み
+
+        Args:
+            conditions (Any): 列名と値（または値のリスト） mask()と同じ
+
+        Returns:
+            ListTable: すべての条件に該当する行のテーブル
+        """
+        return self.select(self.mask(**conditions))
+
+    def concat(tables: Iterable['ListTable']) -> 'ListTable':
+        """連結
+
+        辞書符号化の値の一覧を統合し、各テーブルの符号を統合後の値の一覧の符号に変換して連結する
+
+        Args:
+            tables (Iterable[ListTable]): テーブル（連結する並び順）
+
+        Returns:
+            ListTable: 連結したテーブル
+        """
+        import numpy as np
+        tables = list(tables)
+        if len(tables) == 1:
+            return tables[0]
+        table = ListTable()
+        if not tables:
+            return table
+        symbols: SymbolTable = SymbolTable()
+        for column in LIST_COLUMNS:
+            if column in INT_COLUMNS:
+                table.__arrays[column] = np.concatenate([other.__arrays[column] for other in tables])
+                continue
+            categories = table.__categories[column]
+            code_index: Dict[Any, int] = {}
+            arrays = []
+            for other in tables:
+                # 連結元の値の一覧の位置から、統合後の値の一覧の位置を引く変換表
+                remap = np.array([ListTable.__encode(categories, code_index, symbols.intern(value))
+                                  for value in other.__categories[column]], dtype=CODE_DTYPE)
+                arrays.append(remap[other.__arrays[column]] if len(remap) else other.__arrays[column])
+            table.__arrays[column] = np.concatenate(arrays)
+        return table
+
+    def compare_value(value: Any) -> Any:
+        """比較値取得
+
+        辞書符号化のキー、等価判定、ハッシュ値に使用する値を取得する
+        欠損値（NaN）は自身と等価でなく、ハッシュ値もオブジェクトごとに異なるため、NULL_KEYに置き換える
+
+        Args:
+            value (Any): 値
+
+        Returns:
+            Any: 値（欠損値の場合はNULL_KEY）
+        """
+        return NULL_KEY if Workbook.is_null(value) else value
+
+    def __encode(categories: List[Any], code_index: Dict[Any, int], value: Any) -> int:
+        """辞書符号化
+
+        Args:
+            categories (List[Any]): 値の一覧（値がない場合は追加する）
+            code_index (Dict[Any, int]): 値から符号を引く辞書（値がない場合は追加する）
+            value (Any): 値
+
+        Returns:
+            int: 値の符号
+        """
+        code = code_index.get(value)
+        if code is None:
+            # 欠損値はNaNのオブジェクトごとに異なるキーとなるため、NULL_KEYにまとめる
+            key = ListTable.compare_value(value)
+            code = code_index.get(key)
+            if code is None:
+                code = code_index[key] = len(categories)
+                categories.append(value)
+            # 同じオブジェクトの欠損値は次回から辞書の参照だけで符号化する
+            code_index[value] = code
+        return code
+
+
+class ListTableRow:
+    """接続設定情報テーブル行
+
+    接続設定情報テーブルの1行を参照する ListConfigと同じプロパティで値を取得する
+
+    """
+
+    __slots__ = ('__table', '__index')
+
+    def __init__(self, table: ListTable, index: int):
+        """初期化
+
+        Args:
+            table (ListTable): 接続設定情報テーブル
+            index (int): 行番号
+        """
+        self.__table: ListTable = table
+        self.__index: int = index
+
+    @property
+    def nf(self) -> str:
+        """コマンド実行対象ホスト名プロパティ"""
+        return self.__table.value('nf', self.__index)
+
+    @property
+    def remote_host(self) -> str:
+        """SSH接続ホスト名プロパティ"""
+        return self.__table.value('remote_host', self.__index)
+
+    @property
+    def cNRF_AMF(self) -> str:
+        """cNRF-AMFホスト名プロパティ"""
+        return self.__table.value('cNRF_AMF', self.__index)
+
+    @property
+    def cNRF(self) -> str:
+        """cNRFホスト名プロパティ"""
+        return self.__table.value('cNRF', self.__index)
+
+    @property
+    def host(self) -> str:
+        """AMFホスト名プロパティ"""
+        return self.__table.value('host', self.__index)
+
+    @property
+    def dn(self) -> str:
+        """ドメイン名プロパティ"""
+        return self.__table.value('dn', self.__index)
+
+    @property
+    def ns(self) -> str:
+        """ネットワークシステム名プロパティ"""
+        return self.__table.value('ns', self.__index)
+
+    @property
+    def ip(self) -> str:
+        """接続先IPプロパティ"""
+        return self.__table.value('ip', self.__index)
+
+    @property
+    def ver(self) -> int:
+        """バージョンプロパティ"""
+        return self.__table.value('ver', self.__index)
+
+    @property
+    def region(self) -> str:
+        """実行地域プロパティ"""
+        return self.__table.value('region', self.__index)
+
+    @property
+    def del_flg(self) -> int:
+        """削除フラグプロパティ"""
+        return self.__table.value('del_flg', self.__index)
+
+    def values(self) -> Dict[str, Any]:
+        """値取得
+
+        Returns:
+            Dict[str, Any]: 列名と値（LIST_COLUMNSの並び順）
+        """
+        return {column: self.__table.value(column, self.__index) for column in LIST_COLUMNS}
+
+    def __str__(self) -> str:
+        """インスタンスの文字列表示
+
+        Returns:
+            str: 列名と値を表示した文字列
+        """
+        return str(self.values())
+
+    def __repr__(self) -> str:
+        """インスタンスの文字列表現
+
+        本来の文字列表現ではなく__str__()と同様の文字列とする
+
+        Returns:
+            str: __str__()が返却する文字列
+        """
+        return self.__str__()
+
+    def __eq__(self, __o: object) -> bool:
+        """等価演算子
+
+        同一クラスかつ列の値がすべて等価の場合等価とする（欠損値同士は等価とする）
+
+        Args:
+            __o (object): 比較対象オブジェクト
+
+        Returns:
+            bool: 比較対象オブジェクトが自身と等価の場合true 等価でない場合false
+        """
+        if not isinstance(__o, self.__class__):
+            return NotImplemented
+        return self.__compare_key() == __o.__compare_key()
+
+    def __hash__(self) -> int:
+        """ハッシュ値
+
+        Returns:
+            int: 列の値から求めたハッシュ値（等価な行は同じハッシュ値）
+        """
+        return hash(self.__compare_key())
+
+    def __compare_key(self) -> tuple:
+        """比較キー取得
+
+        Returns:
+            tuple: 列の値（LIST_COLUMNSの並び順、欠損値はNULL_KEY）
+        """
+        return tuple(ListTable.compare_value(self.__table.value(column, self.__index)) for column in LIST_COLUMNS)
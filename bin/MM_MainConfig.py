@@ -1,19 +1,19 @@
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
 from typing import List, Dict, Any
+from MM_ImmutableConfig import ImmutableConfig
 
 key_list = []
 value_list = []
 
-class MainConfig:
+class MainConfig(ImmutableConfig):
     """初期設定情報
 
     シナリオファイル設定情報の初期設定値を保持する
 
     """
 
+    # 属性はインスタンスごとの__dict__ではなくスロットに保持し、初期化後は変更できないものとする（ImmutableConfigの初期化で設定する）
+    __slots__ = ('__key', '__value')
+
     def __init__(self, key: str, value) -> None:
         """初期化
 
@@ -22,8 +22,7 @@ class MainConfig:
             value: 初期設定値 初期値項目名に設定する値  数字であればint型、英数字と英字であればstr型で格納
 
         """
-        self.__key: str = key
-        self.__value = value
+        ImmutableConfig.__init__(self, key, value)
 
 
     @property
@@ -47,39 +46,3 @@ class MainConfig:
             str: インスタンス属性の初期設定値
         """
         return self.__value
-
-    def __str__(self) -> str:
-        """インスタンスの文字列表示
-
-        インスタンス属性の名前と値を表示する
-
-        Returns:
-            str: インスタンス属性の名前と値を表示した文字列
-        """
-        return str(vars(self))
-
-    def __repr__(self) -> str:
-        """インスタンスの文字列表現
-
-        本来の文字列表現ではなく__str__()と同様の文字列とする
-
-        Returns:
-            str: __str__()が返却する文字列
-        """
-        return self.__str__()
-
-    def __eq__(self, __o: object) -> bool:
-        """等価演算子
-
-        比較対象オブジェクトが自身と等価かどうかを判定する
-        同一クラスかつインスタンス変数がすべて等価の場合等価とする
-
-        Args:
-            __o (object): 比較対象オブジェクト
-
-        Returns:
-            bool: 比較対象オブジェクトが自身と等価の場合true 等価でない場合false
-        """
-        if not isinstance(__o, self.__class__):
-            return NotImplemented
-        return self.__dict__ == __o.__dict__
\ No newline at end of file
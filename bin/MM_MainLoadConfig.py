@@ -3,106 +3,172 @@
 ホスト設定情報エクセルファイルを読み込み、読み込んだ情報を提供する
 
 """
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union, Tuple
 
 from MM_MainConfig import MainConfig
+from MainRow import MainRow
+from MM_Workbook import Workbook
+from MM_SheetFingerprint import SheetFingerprint
 
 
-class AsciiFilter:
-    """ASCIIフィルタ
+class MainLoadConfig:
+    """メイン設定情報
+
+    シナリオ設定情報ファイルを読み込み、ファイルに設定されたメイン処理設定情報を保持する
 
-    PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-    文字列以外の場合はそのまま保持する
     """
 
-    def __init__(self, row: pandas.core.series.Series) -> None:
+    def __init__(self, config_file_name: Union[str, Workbook]):
         """初期化
 
-        PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-        文字列以外の場合はそのまま保持する
+        引数で指定されたシナリオ設定情報ファイルを読み込み、インスタンス属性に保持する
+        ファイルパスが指定された場合は、同じファイルを読み込む他のローダとワークブックセッションを共有する
+
+        Args:
+            config_file_name (Union[str, Workbook]): シナリオ設定情報ファイルパス、またはワークブックセッション
+        """
+        # 設定ファイル読み込み（開いているセッションがあれば共有する）
+        config_file: Workbook = Workbook.open(config_file_name) if isinstance(config_file_name, str) else config_file_name
+        # 再読み込み時に同じセッションを取得するため、ファイルパスと読み込みエンジンを保持する
+        self.__config_file_name: str = config_file.config_file_name
+        self.__engine: str = config_file.engine
+        # 再読み込み時に変更されたシートを判定するため、シートのフィンガープリントを保持する（ワークブックセッションで共有する）
+        self.__fingerprint: SheetFingerprint = config_file.fingerprint
+        # 設定ファイルのシート名読み込み（返却値はList型）
+        config_sheet_name: List = config_file.sheet_names
+        # メインシート名設定
+        self.__main_sheet_name: str = MainLoadConfig.__main_sheet(config_sheet_name)
+        # 読み込んだ設定ファイルとメインシート名を引数に、メイン設定情報ロードを呼び出す
+        self.__mainConfigs: Dict[str, MainConfig] = MainLoadConfig.__load_main_info(config_file, self.__main_sheet_name)
+        # MainRowの列情報リスト（初期値項目名、初期設定値）はインスタンスで保持する
+        self.__key_list, self.__value_list = MainLoadConfig.__column_lists(self.__mainConfigs)
+
+    @property
+    def mainConfigs(self) -> Dict[str, MainConfig]:
+        """メイン設定情報プロパティ
+
+        インスタンス属性の初期設定情報を取得する
+
+        Returns:
+            Dict[str, MainConfig]: 初期設定情報
         """
-        for col_name in row.index:
-            setattr(self, col_name, AsciiFilter.__strip_to_ascii(row[col_name]))
+        return self.__mainConfigs
 
-    def __strip_to_ascii(org: Any) -> Any:
-        """ASCIIコード以外削除
+    def get_key_list(self) -> List[str]:
+        """初期値項目名リスト取得
 
-        引数が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除して返却する
-        文字列以外の場合はそのまま返却する
+        Returns:
+            List[str]: 初期値項目名リスト（MAINシートの全行、初期設定情報の並び順）
+        """
+        return self.__key_list
+
+    def get_row_mainkey(self, row: int) -> str:
+        """初期値項目名取得
 
         Args:
-            org (Any): 元データ
+            row (int): 行番号
 
         Returns:
-            Any: ASCIIコード以外削除データ（文字列以外の場合は元データ）
+            str: 指定された行の初期値項目名
         """
-        if org and type(org) == str:
-            # No-Break SpaceをSpaceに変換しascii以外の文字コードを除去
-            return org.replace('\u00a0', '\u0020').encode('ascii', 'ignore').decode('utf-8')
-        return org
+        return self.__key_list[row]
 
-class MainLoadConfig:
-    """メイン設定情報
+    def get_value_list(self) -> List[Any]:
+        """初期設定値リスト取得
 
-    シナリオ設定情報ファイルを読み込み、ファイルに設定されたメイン処理設定情報を保持する
+        Returns:
+            List[Any]: 初期設定値リスト（MAINシートの全行、初期設定情報の並び順）
+        """
+        return self.__value_list
 
-    """
+    def get_row_mainvalue(self, row: int) -> Any:
+        """初期設定値取得
 
-    def __init__(self, config_file_name: str):
-        """初期化
+        Args:
+            row (int): 行番号
 
-        引数で指定されたシナリオ設定情報ファイルを読み込み、インスタンス属性に保持する
+        Returns:
+            Any: 指定された行の初期設定値
+        """
+        return self.__value_list[row]
+
+    def bind(self) -> None:
+        """列情報参照先設定
+
+        MainRowの列情報（get_key_list()、get_row_mainkey()など）の参照先を、このインスタンスにする
+        読み込み、キャッシュからの復元では呼び出さないため、参照先は明示的に呼び出したインスタンスとなる
+        再読み込みした場合、列情報は再読み込み後のメイン設定情報を示す
+        """
+        MainRow.bind_config(self)
+
+    def reload(self) -> List[str]:
+        """再読み込み
+
+        シナリオ設定情報ファイルの「MAIN」シートが前回の読み込みから変更されている場合だけ、メイン設定情報を読み込み直す
+
+        Returns:
+            List[str]: 読み込み直したシート名リスト（変更されていない場合は空）
+        """
+        fingerprint = SheetFingerprint(self.__config_file_name, self.__fingerprint)
+        changed_sheets = fingerprint.changed_sheets(self.__fingerprint)
+        main_sheet_name = MainLoadConfig.__main_sheet(list(fingerprint.sheets))
+        self.__fingerprint = fingerprint
+        if main_sheet_name == self.__main_sheet_name and main_sheet_name not in changed_sheets:
+            return []
+        config_file = Workbook.open(self.__config_file_name, self.__engine)
+        self.__main_sheet_name = main_sheet_name
+        self.__mainConfigs = MainLoadConfig.__load_main_info(config_file, main_sheet_name)
+        self.__key_list, self.__value_list = MainLoadConfig.__column_lists(self.__mainConfigs)
+        return [main_sheet_name]
+
+    def __main_sheet(config_sheet_name: List[str]) -> str:
+        """メインシート名取得
 
         Args:
-            config_file_name (str): シナリオ設定情報ファイルパス
+            config_sheet_name (List[str]): 設定ファイルのシート名リスト
+
+        Returns:
+            str: メインシート名（「MAIN」を含むシートが複数ある場合は最後のシート）
         """
-        # 設定ファイル読み込み
-        config_file = pd.ExcelFile(config_file_name, engine='openpyxl')
-        # 設定ファイルのシート名読み込み（返却値はList型）
-        config_sheet_name: List = config_file.sheet_names
+        main_sheet_name: str = None
         # 設定ファイルのシート名リストから、各シート名を繰り返し取り出す
         for sheet_name in config_sheet_name:
             # シート名が「MAIN」である場合
             if 'MAIN' in sheet_name:
                 # メインシート名設定
-                main_sheet_name: str = sheet_name
-        # 読み込んだ設定ファイルとメインシート名を引数に、メイン設定情報ロードを呼び出す
-        self.__mainConfigs: Dict[str, MainConfig] = MainLoadConfig.__load_main_info(config_file, main_sheet_name)
+                main_sheet_name = sheet_name
+        return main_sheet_name
 
-    @property
-    def mainConfigs(self) -> Dict[str, MainConfig]:
-        """メイン設定情報プロパティ
+    def __column_lists(mainConfigs: List[MainConfig]) -> Tuple[List[str], List[Any]]:
+        """列情報リスト生成
 
-        インスタンス属性の初期設定情報を取得する
+        Args:
+            mainConfigs (List[MainConfig]): 初期設定情報
 
         Returns:
-            Dict[str, MainConfig]: 初期設定情報
+            Tuple[List[str], List[Any]]: 初期値項目名リスト、初期設定値リスト（初期設定情報の並び順）
         """
-        return self.__mainConfigs
+        return [mainConfig.key for mainConfig in mainConfigs], [mainConfig.value for mainConfig in mainConfigs]
 
-    def __load_main_info(config_file: pd.ExcelFile, main_sheet_name: str) -> Dict[str, MainConfig]:
+    def __load_main_info(config_file: Workbook, main_sheet_name: str) -> Dict[str, MainConfig]:
         """メイン設定情報ロード
 
         シナリオ設定情報ファイルの「MAIN」シートから情報を読み込み、メイン設定情報として返却する
 
         Args:
-            config_file (pd.ExcelFile): シナリオ設定情報ファイル（pandasでExcelファイルを表すオブジェクト）
+            config_file (Workbook): シナリオ設定情報ファイルのワークブックセッション
 
         Returns:
             Dict[str, MainConfig]: 初期設定情報
         """
         # シナリオ設定情報ファイルから「DEFAULT_OPTION」シートの情報を読み込む
-        main_sheet = config_file.parse(main_sheet_name)
+        main_sheet: List[tuple] = config_file.rows(main_sheet_name)
         # 接続設定情報リストを初期化する
         mainConfigs_list: List[MainConfig] = []
         # DEFAULT_OPTIONシートの行でループする
-        for row in [AsciiFilter(row) for _, row in main_sheet.iterrows()]:
+        for row in main_sheet:
             # DEFAULT_OPTIONシートの行の初期設定項目名"KEY"がnullでない場合
-            if not pd.isnull(row.KEY):
+            if not Workbook.is_null(row.KEY):
                 # DEFAULT_OPTIONシートの行の情報から初期設定情報リストを生成し、初期設定項目名"KEY"をキーに初期設定情報リストに追加する
                 mainConfigs_list.append(MainConfig(row.KEY, row.VALUE))
 
@@ -0,0 +1,385 @@
+"""複数ワークブック設定情報
+
+拠点ごとのシナリオ設定情報ファイルをまとめて読み込み、メイン処理設定情報、サブ設定情報、接続設定情報を一つに統合して提供する
+
+"""
+import os
+import glob
+import pickle
+import warnings
+from collections import namedtuple
+from typing import List, Dict, Any, Union, Tuple, Iterable
+
+from MM_MainLoadConfig import MainLoadConfig
+from MM_SubLoadConfig import SubLoadConfig
+from MM_ListLoadConfig import ListLoadConfig
+from MM_CommandConfig import CommandConfig
+from MM_ScenarioConfig import ScenarioConfig
+from MM_ScenarioIndex import ScenarioIndex
+from MM_ScenarioGraph import ScenarioGraph, ORDERED_TASK_PREFIXES
+from MM_ListConfig import ListConfig
+from MM_ListTable import ListTable
+from MM_ListColumns import ListColumns
+from MM_ListIndex import ListIndex
+from MM_Workbook import Workbook, ENGINE_PANDAS
+from MM_SheetPool import SheetPool
+from MM_ScenarioSource import ScenarioSource
+
+
+# ディレクトリを指定した場合に読み込むファイルの拡張子（Excel）
+WORKBOOK_SUFFIXES = ('.xlsx', '.xlsm')
+# ディレクトリを指定した場合に、シナリオ設定情報の形式であれば読み込むファイルの拡張子（JSON Lines、SQLite）
+SOURCE_SUFFIXES = ('.jsonl', '.ndjson', '.sqlite', '.sqlite3', '.db')
+# 重複の種類 シナリオ名
+CONFLICT_SCENARIO = 'scenario'
+# 重複の種類 cNRF-AMFホスト名
+CONFLICT_CNRF_AMF = 'cNRF_AMF'
+
+# ワークブックごとの設定情報（読み込みに失敗した場合は各設定情報がNoneで、errorにエラー内容を保持する）
+WorkbookConfig = namedtuple('WorkbookConfig', ['config_file_name', 'mainConfig', 'subConfig', 'listConfig', 'error'])
+# 重複（種類、シナリオ名またはcNRF-AMFホスト名、定義しているワークブックのファイルパス（ファイルの並び順））
+Conflict = namedtuple('Conflict', ['kind', 'name', 'workbooks'])
+
+
+class MultiLoadConfig:
+    """複数ワークブック設定情報
+
+    ディレクトリまたはglobパタンで指定された複数のシナリオ設定情報ファイルをプロセスプールで並列に読み込み、
+    サブ設定情報と接続設定情報をファイルの並び順に統合して保持する
+    統合した設定情報ごとに読み込んだファイル（出所）を記録し、複数のファイルで定義されたシナリオ名とcNRF-AMFホスト名を重複として検出する
+    読み込みに失敗したファイルがある場合は、全ファイルの読み込み後に失敗したファイルとエラー内容をまとめた例外を発生させる
+    （ignore_errorsを指定した場合は警告を出し、失敗したファイルを除いて統合する）
+    同じファイル内での重複は、単一ファイルの読み込みと同じく重複として扱わない
+    ListConfigの列情報は、統合した接続設定情報テーブルを参照する
+
+    """
+
+    def __init__(self, config_files: Union[str, List[str]], workers: int = 0, engine: str = ENGINE_PANDAS,
+                 ignore_errors: bool = False):
+        """初期化
+
+        Args:
+            config_files (Union[str, List[str]]): シナリオ設定情報ファイルを格納したディレクトリ、globパタン、またはファイルパスのリスト
+            workers (int): ワークブックを並列に読み込むプロセス数 0の場合はCPU数 Noneの場合は並列に読み込まない
+            engine (str): xlsxの読み込みエンジン（Excel以外の形式はファイル形式から決定する）
+            ignore_errors (bool): 読み込みに失敗したファイルを除いて統合する場合true（警告を出し、errorsに記録する）
+
+        Raises:
+            ValueError: ignore_errorsがfalseで、読み込みに失敗したファイルがある場合に発生
+        """
+        config_file_names: List[str] = MultiLoadConfig.workbook_files(config_files)
+        self.__workbooks: List[WorkbookConfig] = MultiLoadConfig.__load_workbooks(config_file_names, workers, engine)
+        if self.errors:
+            message = 'failed to load workbooks. ' + ' / '.join(f'{config_file_name}: {error}'
+                                                                  for config_file_name, error in self.errors.items())
+            if not ignore_errors:
+                raise ValueError(message)
+            warnings.warn(message, RuntimeWarning, stacklevel=2)
+        self.__subConfigs: List[ScenarioConfig] = []
+        # 統合した接続設定情報ごとの読み込んだファイル（接続設定情報と同じ並び順）
+        self.__list_sources: List[str] = []
+        # 重複の種類ごとに、名前から定義しているファイルのリストを引く辞書
+        self.__sources: Dict[str, Dict[str, List[str]]] = {CONFLICT_SCENARIO: {}, CONFLICT_CNRF_AMF: {}}
+        listTables: List[ListTable] = []
+        for workbook in self.__workbooks:
+            if workbook.error is not None:
+                continue
+            for scenarioConfig in workbook.subConfig.subConfigs:
+                self.__subConfigs.append(scenarioConfig)
+                MultiLoadConfig.__add_source(self.__sources[CONFLICT_SCENARIO], scenarioConfig.scenario, workbook.config_file_name)
+            listTables.append(workbook.listConfig.listConfigs)
+            self.__list_sources.extend([workbook.config_file_name] * len(workbook.listConfig.listConfigs))
+            for cNRF_AMF in workbook.listConfig.listConfigs.column('cNRF_AMF'):
+                MultiLoadConfig.__add_source(self.__sources[CONFLICT_CNRF_AMF], cNRF_AMF, workbook.config_file_name)
+        self.__listConfigs: ListTable = ListTable.concat(listTables)
+        self.__index: ScenarioIndex = ScenarioIndex(self.__subConfigs)
+        self.__listIndex: ListIndex = ListIndex(self.__listConfigs)
+        self.__columns: ListColumns = ListColumns(self.__listConfigs)
+        self.__conflicts: List[Conflict] = [Conflict(kind, name, tuple(workbooks))
+                                            for kind, sources in self.__sources.items()
+                                            for name, workbooks in sources.items() if len(workbooks) > 1]
+
+    @property
+    def workbooks(self) -> List[WorkbookConfig]:
+        """ワークブック設定情報プロパティ
+
+        Returns:
+            List[WorkbookConfig]: ワークブックごとの設定情報（ファイルの並び順）
+        """
+        return self.__workbooks
+
+    @property
+    def subConfigs(self) -> List[ScenarioConfig]:
+        """サブ設定情報プロパティ
+
+        Returns:
+            List[ScenarioConfig]: 全ワークブックのサブ設定情報（ファイルの並び順、ファイル内はサブシートの並び順）
+        """
+        return self.__subConfigs
+
+    @property
+    def listConfigs(self) -> ListTable:
+        """接続設定情報プロパティ
+
+        Returns:
+            ListTable: 全ワークブックの接続設定情報テーブル（ファイルの並び順、ファイル内はLISTシートの並び順）
+        """
+        return self.__listConfigs
+
+    @property
+    def listIndex(self) -> ListIndex:
+        """接続設定情報索引プロパティ
+
+        Returns:
+            ListIndex: 統合した接続設定情報テーブルの索引
+        """
+        return self.__listIndex
+
+    @property
+    def list_sources(self) -> List[str]:
+        """接続設定情報出所プロパティ
+
+        Returns:
+            List[str]: 接続設定情報ごとの読み込んだファイルパス（listConfigsと同じ並び順）
+        """
+        return self.__list_sources
+
+    @property
+    def conflicts(self) -> List[Conflict]:
+        """重複プロパティ
+
+        Returns:
+            List[Conflict]: 複数回定義されたシナリオ名とcNRF-AMFホスト名（シナリオ名、cNRF-AMFホスト名の順、それぞれ出現順）
+        """
+        return self.__conflicts
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        """読み込みエラープロパティ
+
+        Returns:
+            Dict[str, str]: 読み込みに失敗したファイルパスとエラー内容（ファイルの並び順）
+        """
+        return {workbook.config_file_name: workbook.error for workbook in self.__workbooks if workbook.error is not None}
+
+    def get_column_list(self, column: str) -> List[Any]:
+        """列情報リスト取得
+
+        Args:
+            column (str): 列名
+
+        Returns:
+            List[Any]: 統合した接続設定情報テーブルの列の値（listConfigsと同じ並び順）
+        """
+        return self.__columns.get_list(column)
+
+    def get_row_value(self, column: str, row: int) -> Any:
+        """列情報取得
+
+        Args:
+            column (str): 列名
+            row (int): 行番号
+
+        Returns:
+            Any: 統合した接続設定情報テーブルの指定された行の列の値
+        """
+        return self.__columns.get_row(column, row)
+
+    def bind(self) -> None:
+        """列情報参照先設定
+
+        ListConfigの列情報（get__nf_list()、get__row_nf()など）の参照先を、このインスタンスにする
+        読み込みでは呼び出さないため、参照先は明示的に呼び出したインスタンスとなる
+        """
+        ListConfig.bind__loader(self)
+
+    def get_workbook(self, config_file_name: str) -> WorkbookConfig:
+        """ワークブック設定情報取得
+
+        Args:
+            config_file_name (str): シナリオ設定情報ファイルパス
+
+        Returns:
+            WorkbookConfig: 指定されたファイルの設定情報 ない場合はNone
+        """
+        for workbook in self.__workbooks:
+            if workbook.config_file_name == config_file_name:
+                return workbook
+        return None
+
+    def get_scenario(self, scenario: str) -> ScenarioConfig:
+        """シナリオ設定情報取得
+
+        シナリオ名が重複している場合は、先に読み込んだファイルのシナリオ設定情報を返却する
+
+        Args:
+            scenario (str): シナリオ名
+
+        Returns:
+            ScenarioConfig: 指定されたシナリオ名のシナリオ設定情報 ない場合はNone
+        """
+        return self.__index.get_scenario(scenario)
+
+    def get_item(self, scenario: str, item: str) -> CommandConfig:
+        """コマンド概要項目情報取得
+
+        Args:
+            scenario (str): シナリオ名
+            item (str): コマンド概要項目
+
+        Returns:
+            CommandConfig: 指定されたシナリオ名とコマンド概要項目の実行コマンド設定情報 ない場合はNone
+        """
+        return self.__index.get_item(scenario, item)
+
+    def get_commands(self, scenario: str) -> Tuple[CommandConfig, ...]:
+        """実行順コマンド情報取得
+
+        Args:
+            scenario (str): シナリオ名
+
+        Returns:
+            Tuple[CommandConfig, ...]: 指定されたシナリオ名の実行コマンド設定情報（コマンド採番順） ない場合は空のタプル
+        """
+        return self.__index.get_commands(scenario)
+
+    def get_graph(self, scenario: str, ordered_tasks: Iterable[str] = ORDERED_TASK_PREFIXES) -> ScenarioGraph:
+        """シナリオ依存グラフ取得
+
+        Args:
+            scenario (str): シナリオ名
+            ordered_tasks (Iterable[str]): 前後のコマンドとの順序を保つタスク名の接頭辞
+
+        Returns:
+            ScenarioGraph: 指定されたシナリオ名の実行コマンドの依存グラフ ない場合はNone
+        """
+        if self.get_scenario(scenario) is None:
+            return None
+        return ScenarioGraph(self.__index.get_commands(scenario), ordered_tasks)
+
+    def sources(self, kind: str, name: str) -> List[str]:
+        """出所取得
+
+        Args:
+            kind (str): 種類（scenario/cNRF_AMF）
+            name (str): シナリオ名またはcNRF-AMFホスト名
+
+        Returns:
+            List[str]: 指定された名前を定義しているファイルパスのリスト（ファイルの並び順） ない場合は空のリスト
+        """
+        return list(self.__sources[kind].get(name, []))
+
+    def __add_source(sources: Dict[str, List[str]], name: str, config_file_name: str) -> None:
+        """出所登録
+
+        Args:
+            sources (Dict[str, List[str]]): 名前から定義しているファイルのリストを引く辞書
+            name (str): シナリオ名またはcNRF-AMFホスト名
+            config_file_name (str): 定義しているファイルパス
+        """
+        config_file_names = sources.setdefault(name, [])
+        # ファイルの並び順に登録するため、同じファイル内の重複は末尾と比較するだけでよい
+        if not config_file_names or config_file_names[-1] != config_file_name:
+            config_file_names.append(config_file_name)
+
+    def workbook_files(config_files: Union[str, List[str]]) -> List[str]:
+        """ファイルパス展開
+
+        Args:
+            config_files (Union[str, List[str]]): ディレクトリ、globパタン、ファイルパス、またはそれらのリスト
+
+        Returns:
+            List[str]: シナリオ設定情報ファイルパスのリスト（ディレクトリ、globパタンはファイル名の順、重複は除く）
+                       ファイルパスを直接指定した場合は、形式を判定せずに含める
+        """
+        if isinstance(config_files, str):
+            config_files = [config_files]
+        config_file_names: List[str] = []
+        for config_file in config_files:
+            if os.path.isdir(config_file) and not ScenarioSource.is_source(config_file):
+                # CSV/TSVディレクトリでない場合は、格納されたワークブックを読み込む（Excelの一時ファイルは除く）
+                # JSON Lines、SQLiteのファイルは、シナリオ設定情報の形式のもののみ読み込む（無関係のファイルは読み込まない）
+                matches = [file_name for file_name in (os.path.join(config_file, file_name) for file_name in sorted(os.listdir(config_file)))
+                           if MultiLoadConfig.__is_workbook(file_name)]
+            elif glob.has_magic(config_file):
+                matches = [file_name for file_name in sorted(glob.glob(config_file)) if MultiLoadConfig.__is_workbook(file_name)]
+            else:
+                matches = [config_file]
+            for file_name in matches:
+                if file_name not in config_file_names:
+                    config_file_names.append(file_name)
+        return config_file_names
+
+    def __is_workbook(file_name: str) -> bool:
+        """ワークブック判定（ディレクトリ、globパタンの展開用）
+
+        Args:
+            file_name (str): ファイルパス
+
+        Returns:
+            bool: Excelファイル（一時ファイルを除く）、またはシナリオ設定情報の形式のJSON Lines、SQLiteファイル、CSV/TSVディレクトリの場合true
+        """
+        if os.path.basename(file_name).startswith('~$'):
+            return False
+        if os.path.isdir(file_name):
+            return ScenarioSource.is_source(file_name)
+        if file_name.lower().endswith(WORKBOOK_SUFFIXES):
+            return True
+        return file_name.lower().endswith(SOURCE_SUFFIXES) and ScenarioSource.is_source(file_name)
+
+    def load_workbook(config_file_name: str, engine: str = ENGINE_PANDAS) -> WorkbookConfig:
+        """ワークブック読み込み
+
+        指定されたファイルのメイン処理設定情報、全サブシートのサブ設定情報、接続設定情報を読み込む
+        読み込みに失敗した場合は例外を発生させず、エラー内容を保持したワークブック設定情報を返却する（全ファイルの読み込み後にまとめて通知する）
+
+        Args:
+            config_file_name (str): シナリオ設定情報ファイルパス
+            engine (str): xlsxの読み込みエンジン
+
+        Returns:
+            WorkbookConfig: ワークブック設定情報
+        """
+        try:
+            config_file = Workbook.open(config_file_name, engine)
+            subConfig = SubLoadConfig(config_file)
+            subConfig.load_sheets()
+            workbook = WorkbookConfig(config_file_name, MainLoadConfig(config_file), subConfig, ListLoadConfig(config_file), None)
+        except Exception as e:
+            workbook = WorkbookConfig(config_file_name, None, None, None, f'{type(e).__name__}: {e}')
+        return workbook
+
+    def load_task(task: Tuple[str, str]) -> bytes:
+        """ワークブック読み込みタスク（子プロセス用）
+
+        子プロセスで読み込んだ結果は、親プロセスでファイルの並び順に復元するためpickle形式で返却する
+
+        Args:
+            task (Tuple[str, str]): シナリオ設定情報ファイルパスと読み込みエンジン
+
+        Returns:
+            bytes: ワークブック設定情報（pickle形式）
+        """
+        return pickle.dumps(MultiLoadConfig.load_workbook(*task), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __load_workbooks(config_file_names: List[str], workers: int, engine: str) -> List[WorkbookConfig]:
+        """ワークブック並列読み込み
+
+        Args:
+            config_file_names (List[str]): シナリオ設定情報ファイルパスのリスト
+            workers (int): 並列数 0の場合はCPU数 Noneの場合は並列に読み込まない
+            engine (str): xlsxの読み込みエンジン
+
+        Returns:
+            List[WorkbookConfig]: ワークブックごとの設定情報（ファイルの並び順）
+        """
+        tasks = [(config_file_name, engine) for config_file_name in config_file_names]
+        workers = SheetPool.workers(workers, len(tasks))
+        if workers <= 1:
+            return [MultiLoadConfig.load_workbook(*task) for task in tasks]
+        # プロセスプールは並列に読み込む場合のみ使用するため、ここで読み込む
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=Workbook.detach_all) as executor:
+            results = list(executor.map(MultiLoadConfig.load_task, tasks))
+        # executor.mapは完了順ではなくファイルの並び順に返却する
+        return [pickle.loads(result) for result in results]
@@ -0,0 +1,333 @@
+"""シナリオ依存グラフ
+
+シナリオの実行コマンド設定情報を、実行条件項目（WHEN）とコマンド情報の参照から依存グラフにし、
+依存関係のない実行コマンドを並列に実行する
+
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Callable, Iterable, Tuple
+
+from MM_CommandConfig import CommandConfig
+from MM_WhenExpression import WhenExpression
+from MM_CommandTemplate import CommandTemplate
+
+# コマンド情報の他のコマンドの結果の参照（get_item(1_CMD_SHOW.raw)など）
+RESULT_REFERENCE_PATTERN = re.compile(r'\b(\w+)\.\w+')
+# 結果を参照するコマンド名（採番_タスク名）
+TASK_REFERENCE_PATTERN = re.compile(r'(\d+)_(\w+)\Z')
+# 解析できない実行条件項目の参照（文字列リテラル以外の識別子をすべて参照とみなす）
+FALLBACK_REFERENCE_PATTERN = re.compile(r'"[^"]*"|\b(\w+(?:\.\w+)*)')
+# 前後のコマンドとの順序を保つタスク名の接頭辞の既定値（MM_Dao.scenarioOrderedTasksで変更する）
+# 設定変更は更新する対象を変数（VAR）に宣言しないため、前のコマンドがすべて終了してから実行し、後のコマンドは設定変更の終了を待つ
+ORDERED_TASK_PREFIXES = ('CMD_CONFIG',)
+
+
+class ScenarioGraph:
+    """シナリオ依存グラフ
+
+    シナリオの実行コマンド設定情報（コマンド採番順）から、コマンド間の依存関係を求める
+    次の場合に、後のコマンドは前のコマンドの終了を待つ（依存関係は前のコマンドにのみ張るため、循環しない）
+      ・実行条件項目、コマンド情報が前のコマンドの結果を参照する（"k_タスク名"はk番目のタスクのコマンド、
+        該当するタスクがない場合は同じコマンド概要項目のコマンド）
+      ・実行条件項目の参照、コマンド情報の{{変数名}}が前のコマンドの更新する変数（VAR）を参照する
+      ・前のコマンドと同じ変数を更新する
+      ・いずれかが順序を保つタスク名の接頭辞（既定はORDERED_TASK_PREFIXES）で始まるタスク（設定変更など）
+    参照は実行条件式（WhenExpression）、コマンドテンプレート（CommandTemplate）が解析した名前とし、
+    コマンド情報の{{}}で囲まない単語（gsh、list_dns_serverなど）は変数の参照とみなさない
+    依存関係のないコマンドは並列に実行し、シナリオの実行時間を最長経路（クリティカルパス）程度にする
+
+    """
+
+    def __init__(self, commandConfigs: Iterable[CommandConfig], ordered_tasks: Iterable[str] = ORDERED_TASK_PREFIXES):
+        """初期化
+
+        Args:
+            commandConfigs (Iterable[CommandConfig]): シナリオの実行コマンド設定情報（コマンド採番順）
+            ordered_tasks (Iterable[str]): 前後のコマンドとの順序を保つタスク名の接頭辞 空の場合は参照と変数の更新のみで依存関係を求める
+        """
+        ordered_tasks = tuple(ordered_tasks)
+        self.__commands: Tuple[CommandConfig, ...] = tuple(commandConfigs)
+        # コマンド概要項目、タスク名ごとの出現順のコマンド位置
+        items: Dict[str, int] = {}
+        tasks: Dict[str, List[int]] = {}
+        for position, commandConfig in enumerate(self.__commands):
+            items.setdefault(commandConfig.item, position)
+            tasks.setdefault(commandConfig.task, []).append(position)
+        # コマンドごとの待ち合わせるコマンド位置（昇順）
+        self.__dependencies: List[Tuple[int, ...]] = []
+        # 変数ごとの最後に更新したコマンド位置
+        writers: Dict[str, int] = {}
+        # 最後の順序を保つタスクのコマンド位置
+        barrier: int = None
+        for position, commandConfig in enumerate(self.__commands):
+            dependencies = set()
+            results, variables = ScenarioGraph.__references(commandConfig)
+            for name in results:
+                dependency = ScenarioGraph.__resolve(name, items, tasks)
+                if dependency is not None and dependency < position:
+                    dependencies.add(dependency)
+            for name in variables:
+                if name in writers:
+                    dependencies.add(writers[name])
+            var = commandConfig.var
+            if isinstance(var, str):
+                if var in writers:
+                    dependencies.add(writers[var])
+                writers[var] = position
+            if ScenarioGraph.__is_ordered(commandConfig, ordered_tasks):
+                # 順序を保つタスクは、前のすべてのコマンドを待つ
+                dependencies.update(range(barrier if barrier is not None else 0, position))
+                barrier = position
+            elif barrier is not None:
+                dependencies.add(barrier)
+            self.__dependencies.append(tuple(sorted(dependencies)))
+        # コマンドごとの、終了を待っている後のコマンド位置（依存関係の逆引き）
+        self.__dependents: List[List[int]] = [[] for _ in self.__commands]
+        for position, dependencies in enumerate(self.__dependencies):
+            for dependency in dependencies:
+                self.__dependents[dependency].append(position)
+
+    def __len__(self) -> int:
+        """コマンド数
+
+        Returns:
+            int: シナリオの実行コマンド数
+        """
+        return len(self.__commands)
+
+    @property
+    def commands(self) -> Tuple[CommandConfig, ...]:
+        """実行コマンド設定情報プロパティ
+
+        Returns:
+            Tuple[CommandConfig, ...]: シナリオの実行コマンド設定情報（コマンド採番順）
+        """
+        return self.__commands
+
+    def dependencies(self, item: str) -> Tuple[str, ...]:
+        """依存コマンド取得
+
+        Args:
+            item (str): コマンド概要項目
+
+        Returns:
+            Tuple[str, ...]: 指定されたコマンドが終了を待つコマンドのコマンド概要項目（コマンド採番順）
+
+        Raises:
+            KeyError: コマンド概要項目がシナリオにない場合に発生
+        """
+        for position, commandConfig in enumerate(self.__commands):
+            if commandConfig.item == item:
+                return tuple(self.__commands[dependency].item for dependency in self.__dependencies[position])
+        raise KeyError(item)
+
+    def levels(self) -> List[List[CommandConfig]]:
+        """実行段階取得
+
+        Returns:
+            List[List[CommandConfig]]: 同時に実行できるコマンドの段階（各段階はコマンド採番順）
+        """
+        depths: List[int] = []
+        for dependencies in self.__dependencies:
+            depths.append(max((depths[dependency] + 1 for dependency in dependencies), default=0))
+        levels: List[List[CommandConfig]] = [[] for _ in range(max(depths, default=-1) + 1)]
+        for commandConfig, depth in zip(self.__commands, depths):
+            levels[depth].append(commandConfig)
+        return levels
+
+    def critical_path(self, durations: Dict[str, float] = None) -> List[str]:
+        """最長経路取得
+
+        Args:
+            durations (Dict[str, float]): コマンド概要項目ごとの実行時間 指定がないコマンドは1とする
+
+        Returns:
+            List[str]: 実行時間の合計が最長となる依存関係の経路のコマンド概要項目（実行順）
+        """
+        durations = durations or {}
+        finishes: List[float] = []
+        previous: List[int] = []
+        for commandConfig, dependencies in zip(self.__commands, self.__dependencies):
+            start, before = max(((finishes[dependency], dependency) for dependency in dependencies), default=(0, None))
+            finishes.append(start + durations.get(commandConfig.item, 1))
+            previous.append(before)
+        path: List[str] = []
+        position = max(range(len(finishes)), key=finishes.__getitem__, default=None)
+        while position is not None:
+            path.append(self.__commands[position].item)
+            position = previous[position]
+        return path[::-1]
+
+    def run(self, execute: Callable[[CommandConfig, Dict[str, Any]], Any], workers: int = 0) -> Dict[str, Any]:
+        """実行
+
+        待ち合わせるコマンドがすべて終了したコマンドから、スレッドプールで実行する
+        実行関数には、実行するコマンドと、待ち合わせたコマンドの結果（キーはコマンド概要項目）を渡す（実行条件項目の判定は実行関数で行う）
+        待ち合わせたコマンドの結果は実行関数ごとに複製した辞書のため、実行関数の中で他のコマンドの終了により変わることはない
+        実行関数が例外を発生させた場合は、新しいコマンドを開始せず、実行中のコマンドの終了後に例外を発生させる
+
+        Args:
+            execute (Callable[[CommandConfig, Dict[str, Any]], Any]): 実行関数（返却値をコマンドの結果とする）
+            workers (int): 同時に実行するコマンド数の上限 0の場合は上限なし Noneの場合は並列に実行せず、コマンド採番順に実行する
+
+        Returns:
+            Dict[str, Any]: コマンド概要項目ごとの結果（コマンド採番順）
+        """
+        results: Dict[str, Any] = {}
+        if workers is None:
+            for position, commandConfig in enumerate(self.__commands):
+                results[commandConfig.item] = execute(commandConfig, self.__inputs(position, results))
+            return results
+        finished: Dict[int, Any] = {}
+        waiting: List[int] = [len(dependencies) for dependencies in self.__dependencies]
+        ready: List[int] = [position for position, count in enumerate(waiting) if count == 0]
+        error: BaseException = None
+        with ThreadPoolExecutor(max_workers=workers or max(len(self.__commands), 1)) as executor:
+            running = {}
+            while ready or running:
+                if error is None:
+                    for position in ready:
+                        running[executor.submit(execute, self.__commands[position], self.__inputs(position, results))] = position
+                ready = []
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                        continue
+                    finished[position] = results[self.__commands[position].item] = future.result()
+                    for dependent in self.__dependents[position]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            ready.append(dependent)
+        if error is not None:
+            raise error
+        # 結果は終了順に追加されるため、コマンド採番順に並べ直す
+        return {self.__commands[position].item: finished[position] for position in sorted(finished)}
+
+    def __inputs(self, position: int, results: Dict[str, Any]) -> Dict[str, Any]:
+        """実行関数入力取得
+
+        Args:
+            position (int): 実行するコマンド位置
+            results (Dict[str, Any]): 終了したコマンドの結果
+
+        Returns:
+            Dict[str, Any]: 待ち合わせたコマンドの結果の複製（キーはコマンド概要項目、コマンド採番順）
+        """
+        commands = self.__commands
+        return {commands[dependency].item: results[commands[dependency].item] for dependency in self.__dependencies[position]}
+
+    def __resolve(name: str, items: Dict[str, int], tasks: Dict[str, List[int]]) -> int:
+        """結果参照解決
+
+        Args:
+            name (str): 結果を参照するコマンド名（"k_タスク名"またはコマンド概要項目）
+            items (Dict[str, int]): コマンド概要項目ごとのコマンド位置
+            tasks (Dict[str, List[int]]): タスク名ごとの出現順のコマンド位置
+
+        Returns:
+            int: 参照するコマンド位置 シナリオ内のコマンドでない場合はNone
+        """
+        match = TASK_REFERENCE_PATTERN.match(name)
+        if match is not None:
+            positions = tasks.get(match.group(2), [])
+            number = int(match.group(1))
+            if 1 <= number <= len(positions):
+                return positions[number - 1]
+        return items.get(name)
+
+    def __references(commandConfig: CommandConfig) -> Tuple[set, set]:
+        """参照取得
+
+        実行条件項目は実行条件式の参照名、コマンド情報は他のコマンドの結果の参照と{{変数名}}を参照とする
+        実行条件項目の構文が不正な場合（実行時にエラーとなる）は、文字列リテラル以外の識別子をすべて参照とする
+
+        Args:
+            commandConfig (CommandConfig): 実行コマンド設定情報
+
+        Returns:
+            Tuple[set, set]: 結果を参照するコマンド名と、参照する変数名（参照名と、その最初の"."より前）
+        """
+        results = set()
+        names: List[str] = []
+        when = commandConfig.when
+        if isinstance(when, str):
+            try:
+                names.extend(WhenExpression.compile(when).references)
+            except ValueError:
+                names.extend(name for name in FALLBACK_REFERENCE_PATTERN.findall(when) if name)
+        command = commandConfig.command
+        if isinstance(command, str):
+            results.update(RESULT_REFERENCE_PATTERN.findall(command))
+            names.extend(CommandTemplate.compile(command).names)
+        variables = set(names)
+        for name in names:
+            head, separator, _ = name.partition('.')
+            if separator:
+                results.add(head)
+                variables.add(head)
+        return results, variables
+
+    def __is_ordered(commandConfig: CommandConfig, ordered_tasks: Tuple[str, ...]) -> bool:
+        """順序保持判定
+
+        Args:
+            commandConfig (CommandConfig): 実行コマンド設定情報
+            ordered_tasks (Tuple[str, ...]): 前後のコマンドとの順序を保つタスク名の接頭辞
+
+        Returns:
+            bool: タスク名が順序を保つタスク名の接頭辞で始まる場合true 始まらない場合false
+        """
+        return bool(ordered_tasks) and isinstance(commandConfig.task, str) and commandConfig.task.startswith(ordered_tasks)
+
+
+if __name__ == '__main__':
+    import sys
+    import threading
+    import time
+    from MM_SubLoadConfig import SubLoadConfig
+
+    # サンプルのシナリオ設定情報ファイルで、依存関係、実行段階、最長経路、並列実行、例外の伝播を確認する
+    subLoadConfig = SubLoadConfig(sys.argv[1] if len(sys.argv) > 1 else 'MM_scenario_config_one.xlsx')
+    graph = subLoadConfig.get_graph('amf_dns_show')
+    assert [[commandConfig.item for commandConfig in level] for level in graph.levels()] == [
+        ['1_CMD_SHOW', '3_CMD_SHOW'], ['2_CMD_SHOW_CHECK', '4_CMD_SHOW_CHECK'], ['5_HANTEI_UP'], ['6_HANTEI_DOWN']]
+    assert graph.dependencies('2_CMD_SHOW_CHECK') == ('1_CMD_SHOW',)
+    assert graph.critical_path({'1_CMD_SHOW': 5}) == ['1_CMD_SHOW', '2_CMD_SHOW_CHECK', '5_HANTEI_UP', '6_HANTEI_DOWN']
+    # 設定変更のシナリオは、すべてのコマンドを順に実行する
+    assert [len(level) for level in subLoadConfig.get_graph('amf_dns_del').levels()] == [1] * 6
+
+    started: List[str] = []
+    started_lock = threading.Lock()
+
+    def execute(commandConfig: CommandConfig, inputs: Dict[str, Any]) -> str:
+        # 待ち合わせたコマンドの結果だけを受け取り、実行中に変わらないことを確認する
+        before = dict(inputs)
+        with started_lock:
+            started.append(commandConfig.item)
+        time.sleep(0.05)
+        assert tuple(inputs) == graph.dependencies(commandConfig.item) and inputs == before
+        if commandConfig.item == fail_item:
+            raise RuntimeError(commandConfig.item)
+        return commandConfig.item.upper()
+
+    for workers in (0, 1, None):
+        fail_item = None
+        started.clear()
+        start = time.perf_counter()
+        results = graph.run(execute, workers)
+        assert list(results) == [commandConfig.item for commandConfig in graph.commands]
+        assert all(result == item.upper() for item, result in results.items())
+        print(f'workers={workers}: {time.perf_counter() - start:.2f}s')
+    # 例外が発生したコマンドに依存するコマンドは開始しない
+    fail_item = '2_CMD_SHOW_CHECK'
+    started.clear()
+    try:
+        graph.run(execute)
+        raise AssertionError('exception not propagated')
+    except RuntimeError as error:
+        assert str(error) == fail_item
+    assert '5_HANTEI_UP' not in started and '6_HANTEI_DOWN' not in started
+    print('ok')
@@ -0,0 +1,154 @@
+"""シナリオ索引
+
+サブ設定情報からシナリオ名、コマンド概要項目、コマンド採番の索引を生成し、定数時間で検索する
+
+"""
+import heapq
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+from MM_CommandConfig import CommandConfig
+from MM_ScenarioConfig import ScenarioConfig
+from MM_Workbook import Workbook
+
+
+class ScenarioIndex:
+    """シナリオ索引
+
+    SUBシートは行ごとにシナリオ名を記載できるため、同じシナリオ名のシナリオ設定情報が複数存在する
+    索引は同じシナリオ名のすべてのシナリオ設定情報の実行コマンド設定情報をまとめて扱い、
+    シナリオ名、コマンド概要項目、コマンド採番が重複する場合はサブ設定情報の並び順で先に出現したものを使用する
+
+    """
+
+    def __init__(self, subConfigs: Iterable[ScenarioConfig] = ()):
+        """初期化
+
+        Args:
+            subConfigs (Iterable[ScenarioConfig]): サブ設定情報（サブシートの並び順）
+        """
+        # シナリオ名から最初のシナリオ設定情報を引く辞書
+        self.__scenarios: Dict[str, ScenarioConfig] = {}
+        # シナリオ名とコマンド概要項目から実行コマンド設定情報を引く辞書
+        self.__items: Dict[Tuple[str, Any], CommandConfig] = {}
+        # シナリオ名とコマンド採番から実行コマンド設定情報を引く辞書
+        self.__nos: Dict[Tuple[str, Any], CommandConfig] = {}
+        # シナリオ名ごとの実行コマンド設定情報（サブ設定情報の並び順）
+        commandConfigs: Dict[str, List[CommandConfig]] = {}
+        for scenarioConfig in subConfigs:
+            scenario = scenarioConfig.scenario
+            self.__scenarios.setdefault(scenario, scenarioConfig)
+            scenario_commandConfigs = commandConfigs.setdefault(scenario, [])
+            for commandConfig in scenarioConfig.commandConfigs:
+                scenario_commandConfigs.append(commandConfig)
+                self.__items.setdefault((scenario, commandConfig.item), commandConfig)
+                if not Workbook.is_null(commandConfig.no):
+                    self.__nos.setdefault((scenario, commandConfig.no), commandConfig)
+        # シナリオ名ごとのコマンド採番順の実行コマンド設定情報（採番が同じ場合、採番がない場合はサブ設定情報の並び順）
+        self.__orders: Dict[str, Tuple[CommandConfig, ...]] = {
+            scenario: tuple(sorted(scenario_commandConfigs, key=lambda commandConfig: ScenarioIndex.__no_key(commandConfig.no)))
+            for scenario, scenario_commandConfigs in commandConfigs.items()}
+
+    def __len__(self) -> int:
+        """シナリオ数
+
+        Returns:
+            int: 索引に登録されたシナリオ名の数
+        """
+        return len(self.__scenarios)
+
+    def __iter__(self) -> Iterator[str]:
+        """シナリオ名繰り返し
+
+        Returns:
+            Iterator[str]: 索引に登録されたシナリオ名（サブ設定情報で最初に出現した順）
+        """
+        return iter(self.__scenarios)
+
+    def __contains__(self, scenario: str) -> bool:
+        """シナリオ名登録判定
+
+        Args:
+            scenario (str): シナリオ名
+
+        Returns:
+            bool: シナリオ名が索引に登録されている場合true 登録されていない場合false
+        """
+        return scenario in self.__scenarios
+
+    def get_scenario(self, scenario: str) -> ScenarioConfig:
+        """シナリオ設定情報検索
+
+        Args:
+            scenario (str): シナリオ名
+
+        Returns:
+            ScenarioConfig: シナリオ名が一致する最初のシナリオ設定情報 ない場合はNone
+        """
+        return self.__scenarios.get(scenario)
+
+    def get_item(self, scenario: str, item: str) -> CommandConfig:
+        """コマンド概要項目検索
+
+        Args:
+            scenario (str): シナリオ名
+            item (str): コマンド概要項目
+
+        Returns:
+            CommandConfig: シナリオ名とコマンド概要項目が一致する実行コマンド設定情報 ない場合はNone
+        """
+        return self.__items.get((scenario, item))
+
+    def get_no(self, scenario: str, no: Any) -> CommandConfig:
+        """コマンド採番検索
+
+        Args:
+            scenario (str): シナリオ名
+            no (Any): コマンド採番
+
+        Returns:
+            CommandConfig: シナリオ名とコマンド採番が一致する実行コマンド設定情報 ない場合はNone
+        """
+        return self.__nos.get((scenario, no))
+
+    def get_commands(self, scenario: str) -> Tuple[CommandConfig, ...]:
+        """実行順コマンド取得
+
+        Args:
+            scenario (str): シナリオ名
+
+        Returns:
+            Tuple[CommandConfig, ...]: シナリオの実行コマンド設定情報（コマンド採番順） ない場合は空のタプル
+        """
+        return self.__orders.get(scenario, ())
+
+    def merge_commands(orders: Iterable[Tuple[CommandConfig, ...]]) -> Tuple[CommandConfig, ...]:
+        """実行順コマンド統合
+
+        複数の索引のget_commands()の結果を、1つの索引にまとめた場合と同じコマンド採番順に統合する
+        （採番が同じ場合、採番がない場合は先に指定された索引の実行コマンド設定情報を先にする）
+
+        Args:
+            orders (Iterable[Tuple[CommandConfig, ...]]): 索引ごとの実行コマンド設定情報（コマンド採番順、サブ設定情報の並び順）
+
+        Returns:
+            Tuple[CommandConfig, ...]: 統合した実行コマンド設定情報（コマンド採番順）
+        """
+        orders = [order for order in orders if order]
+        if len(orders) <= 1:
+            return orders[0] if orders else ()
+        return tuple(heapq.merge(*orders, key=lambda commandConfig: ScenarioIndex.__no_key(commandConfig.no)))
+
+    def __no_key(no: Any) -> Tuple[int, Any]:
+        """コマンド採番の並び替えキー
+
+        Args:
+            no (Any): コマンド採番
+
+        Returns:
+            Tuple[int, Any]: 数値の採番、文字列の採番、採番なしの順に並べるキー
+        """
+        if Workbook.is_null(no):
+            return (2, 0)
+        if isinstance(no, (int, float)) and not isinstance(no, bool):
+            return (0, no)
+        return (1, str(no))
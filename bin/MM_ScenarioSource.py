@@ -0,0 +1,607 @@
+"""シナリオ設定情報ソース
+
+Excel以外の形式（CSV/TSVディレクトリ、JSON Lines、SQLite）で保存したシナリオ設定情報を、xlsxと同じシート単位で提供する
+xlsxのシナリオ設定情報ファイルを、これらの形式に変換する機能も提供する
+
+    python MM_ScenarioSource.py MM_scenario_config.xlsx MM_scenario_config.sqlite --format sqlite
+
+各形式のシート構成はxlsxと同じ（MAIN/SUBxxx/LISTxxxの各シートの1行目が列名、2行目以降が値）とする
+・csv/tsv：ディレクトリ内の「シート名.csv」または「シート名.tsv」（UTF-8）をシートとする
+  シートの並び順は「_sheets.txt」（1行に1シート名）に従い、記載のないシートはシート名の順とする
+  セル値はExcelと同様に、数値として解釈できる値は数値、TRUE/FALSEは真偽値とし、先頭が「'」の値は「'」を除いた文字列とする
+・jsonl：1行が {"sheet": シート名, "row": [セル値, ...]} の1行分で、シートごとの最初の行を列名とする
+  シートの並び順は、シートが最初に現れた順とする
+・sqlite：1シートを1テーブル（テーブル名がシート名、列名が1行目）とし、行はrowidの順とする
+  シートの並び順は、テーブルを作成した順とする 文字列のセル値のうちTRUE/FALSEは真偽値とし、先頭の「'」は除く
+xlsxから変換した場合、日付・時刻のセル値はISO形式の文字列となる
+
+"""
+import abc
+import os
+import re
+import csv
+import json
+import hashlib
+import pathlib
+import argparse
+import datetime
+import threading
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+
+# 読み込みエンジン csv：CSV/TSVファイルを格納したディレクトリ
+ENGINE_CSV = 'csv'
+# 読み込みエンジン jsonl：JSON Linesファイル
+ENGINE_JSONL = 'jsonl'
+# 読み込みエンジン sqlite：SQLiteデータベースファイル
+ENGINE_SQLITE = 'sqlite'
+# Excel以外の読み込みエンジン
+SOURCE_ENGINES = (ENGINE_CSV, ENGINE_JSONL, ENGINE_SQLITE)
+# 変換先の形式（tsvはcsvエンジンで読み込む）
+FORMATS = ('csv', 'tsv', 'jsonl', 'sqlite')
+# 拡張子ごとの読み込みエンジン
+ENGINE_SUFFIXES = {
+    '.jsonl': ENGINE_JSONL,
+    '.ndjson': ENGINE_JSONL,
+    '.sqlite': ENGINE_SQLITE,
+    '.sqlite3': ENGINE_SQLITE,
+    '.db': ENGINE_SQLITE,
+}
+# CSV/TSVファイルの拡張子と区切り文字
+CSV_DELIMITERS = {'.csv': ',', '.tsv': '\t'}
+# CSV/TSVディレクトリのシート並び順ファイル
+SHEET_INDEX_FILE = '_sheets.txt'
+# SQLiteデータベースファイルの先頭
+SQLITE_HEADER = b'SQLite format 3\x00'
+# 変換時にエラー値のセルへ書き込む値（読み込み時は欠損値となる）
+ERROR_VALUE = '#N/A'
+# 文字列として扱うセル値の接頭辞（Excelと同じ）
+TEXT_PREFIX = "'"
+# 真偽値として扱うセル値
+BOOL_TEXTS = {'TRUE': True, 'FALSE': False}
+# 数値として扱うセル値のパタン（整数と実数）
+INT_PATTERN = re.compile(r'[-+]?\d+\Z')
+FLOAT_PATTERN = re.compile(r'[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?\Z')
+
+
+class ScenarioSource(abc.ABC):
+    """シナリオ設定情報ソース
+
+    Excel以外の形式のシナリオ設定情報を開き、シート名と、シートごとのセル値の並び（1行目は列名）を提供する
+    セル値は、ワークブックセッションでxlsxのセル値と同じ規則で列名と値に変換する
+    sheet_names、rows、fingerprintsは形式ごとに派生クラスで実装する（実装がない場合はインスタンスを生成できない）
+
+    """
+
+    @property
+    @abc.abstractmethod
+    def sheet_names(self) -> List[str]:
+        """シート名プロパティ
+
+        Returns:
+            List[str]: シート名リスト（シートの並び順）
+        """
+
+    @abc.abstractmethod
+    def rows(self, sheet_name: str) -> Iterable[tuple]:
+        """シート行読み込み
+
+        Args:
+            sheet_name (str): シート名
+
+        Returns:
+            Iterable[tuple]: 行ごとのセル値のタプル（1行目は列名）
+        """
+
+    @abc.abstractmethod
+    def fingerprints(self) -> Dict[str, str]:
+        """シートフィンガープリント取得
+
+        Returns:
+            Dict[str, str]: シートごとの内容のハッシュ値（キーはシート名、シートの並び順）
+        """
+
+    def close(self) -> None:
+        """クローズ
+
+        開いているファイルを閉じる
+        """
+        pass
+
+    def engine(config_file_name: str) -> Optional[str]:
+        """読み込みエンジン判定
+
+        シナリオ設定情報のパスから、Excel以外の形式の読み込みエンジンを判定する
+
+        Args:
+            config_file_name (str): シナリオ設定情報のパス
+
+        Returns:
+            Optional[str]: 読み込みエンジン（csv/jsonl/sqlite） Excel形式の場合はNone
+        """
+        if os.path.isdir(config_file_name):
+            return ENGINE_CSV
+        return ENGINE_SUFFIXES.get(os.path.splitext(config_file_name)[1].lower())
+
+    def is_source(config_file_name: str) -> bool:
+        """シナリオ設定情報ソース判定
+
+        Excel以外の形式のファイルが、シナリオ設定情報の形式で保存されたものかどうかを、ファイルの先頭の内容で判定する
+          ・jsonl：最初の行が {"sheet": シート名, "row": [セル値, ...]} の形式
+          ・sqlite：SQLiteデータベースファイルで、シート名に「MAIN」を含むテーブルがある
+          ・csv：ディレクトリに「_sheets.txt」、またはシート名に「MAIN」を含むCSV/TSVファイルがある
+
+        Args:
+            config_file_name (str): シナリオ設定情報のパス
+
+        Returns:
+            bool: シナリオ設定情報の形式の場合true それ以外（Excel形式を含む）の場合false
+        """
+        engine = ScenarioSource.engine(config_file_name)
+        try:
+            if engine == ENGINE_CSV:
+                return any(file_name == SHEET_INDEX_FILE or ('MAIN' in os.path.splitext(file_name)[0]
+                                                             and os.path.splitext(file_name)[1].lower() in CSV_DELIMITERS)
+                           for file_name in os.listdir(config_file_name))
+            if engine == ENGINE_JSONL:
+                with open(config_file_name, 'rb') as config_file:
+                    for line in config_file:
+                        if line.strip():
+                            record = json.loads(line)
+                            return isinstance(record, dict) and 'sheet' in record and isinstance(record.get('row'), list)
+                return False
+            if engine == ENGINE_SQLITE:
+                with open(config_file_name, 'rb') as config_file:
+                    if config_file.read(len(SQLITE_HEADER)) != SQLITE_HEADER:
+                        return False
+                source = SqliteSource(config_file_name)
+                try:
+                    return any('MAIN' in sheet_name for sheet_name in source.sheet_names)
+                finally:
+                    source.close()
+        except (OSError, ValueError, UnicodeDecodeError):
+            return False
+        except Exception as e:
+            # SQLiteのエラー（sqlite3.DatabaseError）は、sqlite3を読み込まずに判定するためクラス名で判定する
+            if type(e).__module__ == 'sqlite3':
+                return False
+            raise
+        return False
+
+    def open(config_file_name: str, engine: str) -> 'ScenarioSource':
+        """シナリオ設定情報ソース取得
+
+        Args:
+            config_file_name (str): シナリオ設定情報のパス
+            engine (str): 読み込みエンジン（csv/jsonl/sqlite）
+
+        Returns:
+            ScenarioSource: シナリオ設定情報ソース
+
+        Raises:
+            ValueError: engineがcsv、jsonl、sqlite以外の場合に発生
+        """
+        if engine == ENGINE_CSV:
+            return CsvSource(config_file_name)
+        if engine == ENGINE_JSONL:
+            return JsonLinesSource(config_file_name)
+        if engine == ENGINE_SQLITE:
+            return SqliteSource(config_file_name)
+        raise ValueError(f"engine must be {{'csv'|'jsonl'|'sqlite'}}. value:{engine}")
+
+    def files(config_file_name: str) -> List[str]:
+        """構成ファイル取得
+
+        シナリオ設定情報を構成するファイルを返却する（更新判定とキャッシュキーの生成に使用する）
+
+        Args:
+            config_file_name (str): シナリオ設定情報のパス
+
+        Returns:
+            List[str]: 構成ファイルパスのリスト ディレクトリの場合は格納されたファイル（ファイル名の順）
+        """
+        if not os.path.isdir(config_file_name):
+            return [config_file_name]
+        return [os.path.join(config_file_name, file_name) for file_name in sorted(os.listdir(config_file_name))
+                if os.path.isfile(os.path.join(config_file_name, file_name))]
+
+    def convert(config_file_name: str, output_name: str, output_format: str) -> List[str]:
+        """xlsx変換
+
+        xlsxのシナリオ設定情報ファイルの全シートを、指定された形式で出力する
+        出力先が既に存在する場合、csv/tsvは同じシート名のファイルを、jsonl/sqliteはファイルを置き換える
+
+        Args:
+            config_file_name (str): xlsxのシナリオ設定情報ファイルパス
+            output_name (str): 出力先のパス（csv/tsvはディレクトリ）
+            output_format (str): 出力形式（csv/tsv/jsonl/sqlite）
+
+        Returns:
+            List[str]: 出力したシート名リスト
+
+        Raises:
+            ValueError: output_formatがcsv、tsv、jsonl、sqlite以外の場合に発生
+        """
+        if output_format not in FORMATS:
+            raise ValueError(f"output_format must be {{'csv'|'tsv'|'jsonl'|'sqlite'}}. value:{output_format}")
+        from MM_XlsxReader import XlsxReader
+        reader = XlsxReader(config_file_name)
+        try:
+            sheets = {sheet_name: ScenarioSource.__export_rows(reader.rows(sheet_name)) for sheet_name in reader.sheet_names}
+        finally:
+            reader.close()
+        if output_format in ('csv', 'tsv'):
+            CsvSource.write(output_name, sheets, '.' + output_format)
+        elif output_format == 'jsonl':
+            JsonLinesSource.write(output_name, sheets)
+        else:
+            SqliteSource.write(output_name, sheets)
+        return list(sheets)
+
+    def encode_text(value: Any, numbers: bool) -> Any:
+        """セル値符号化
+
+        型を保持できない形式（CSV/TSV、SQLiteの真偽値）に書き込むセル値を、読み込み時に元の型に戻せる値に変換する
+
+        Args:
+            value (Any): セル値
+            numbers (bool): 数値も文字列として書き込む場合true（CSV/TSV）
+
+        Returns:
+            Any: 真偽値はTRUE/FALSE、真偽値または数値と解釈される文字列は先頭に「'」を付けた値（その他はそのまま）
+        """
+        value_type = type(value)
+        if value_type == bool:
+            return 'TRUE' if value else 'FALSE'
+        if value_type == str and (value.startswith(TEXT_PREFIX) or value.upper() in BOOL_TEXTS
+                                  or (numbers and FLOAT_PATTERN.match(value))):
+            return TEXT_PREFIX + value
+        return value
+
+    def decode_text(value: Any, numbers: bool) -> Any:
+        """セル値復号
+
+        Args:
+            value (Any): 読み込んだセル値
+            numbers (bool): 数値として解釈できる文字列を数値とする場合true（CSV/TSV）
+
+        Returns:
+            Any: encode_textで変換する前のセル値（空文字列はNone）
+        """
+        if type(value) != str:
+            return value
+        if not value:
+            return None
+        if value.startswith(TEXT_PREFIX):
+            return value[1:]
+        boolean = BOOL_TEXTS.get(value.upper())
+        if boolean is not None:
+            return boolean
+        if numbers:
+            if INT_PATTERN.match(value):
+                return int(value)
+            if FLOAT_PATTERN.match(value):
+                return float(value)
+        return value
+
+    def __export_rows(raw_rows: Iterable[tuple]) -> List[List[Any]]:
+        """出力行変換
+
+        Args:
+            raw_rows (Iterable[tuple]): xlsxのシートのセル値の並び
+
+        Returns:
+            List[List[Any]]: 各形式で表現できる値に変換した行のリスト（末尾の空セル、空行は除く）
+        """
+        rows: List[List[Any]] = []
+        last_row_with_data = -1
+        for raw_row in raw_rows:
+            row = [ScenarioSource.__export_value(value) for value in raw_row]
+            while row and row[-1] in (None, ''):
+                row.pop()
+            if row:
+                last_row_with_data = len(rows)
+            rows.append(row)
+        return rows[:last_row_with_data + 1]
+
+    def __export_value(value: Any) -> Any:
+        """出力値変換
+
+        Args:
+            value (Any): xlsxのセル値
+
+        Returns:
+            Any: 整数値の実数は整数、エラー値は「#N/A」、日時は文字列とした値
+        """
+        value_type = type(value)
+        if value_type == float:
+            if value != value:
+                return ERROR_VALUE
+            if value.is_integer():
+                return int(value)
+        elif value_type in (datetime.datetime, datetime.date, datetime.time):
+            return value.isoformat()
+        elif value_type == datetime.timedelta:
+            return str(value)
+        return value
+
+
+class CsvSource(ScenarioSource):
+    """CSV/TSVディレクトリ
+
+    ディレクトリ内のCSV/TSVファイルをシートとして読み込む
+    セル値は数値、真偽値、文字列（先頭の「'」は除く）のいずれかとし、空のセルはNoneとなる
+
+    """
+
+    def __init__(self, config_file_name: str):
+        """初期化
+
+        Args:
+            config_file_name (str): CSV/TSVファイルを格納したディレクトリ
+        """
+        self.__config_file_name: str = config_file_name
+        sheet_files: Dict[str, str] = {}
+        for file_name in sorted(os.listdir(config_file_name)):
+            sheet_name, suffix = os.path.splitext(file_name)
+            if suffix.lower() in CSV_DELIMITERS:
+                sheet_files.setdefault(sheet_name, file_name)
+        # シート並び順ファイルに記載されたシートを先に並べる
+        sheet_order: List[str] = []
+        index_file_name = os.path.join(config_file_name, SHEET_INDEX_FILE)
+        if os.path.isfile(index_file_name):
+            with open(index_file_name, encoding='utf-8-sig') as index_file:
+                sheet_order = [line.rstrip('\r\n') for line in index_file if line.rstrip('\r\n') in sheet_files]
+        self.__sheet_files: Dict[str, str] = {sheet_name: sheet_files[sheet_name] for sheet_name in sheet_order}
+        for sheet_name, file_name in sheet_files.items():
+            self.__sheet_files.setdefault(sheet_name, file_name)
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """シート名プロパティ
+
+        Returns:
+            List[str]: シート名リスト（シートの並び順）
+        """
+        return list(self.__sheet_files)
+
+    def rows(self, sheet_name: str) -> Iterator[tuple]:
+        """シート行読み込み
+
+        Args:
+            sheet_name (str): シート名
+
+        Returns:
+            Iterator[tuple]: 行ごとのセル値のタプル（1行目は列名）
+        """
+        file_name = self.__sheet_files[sheet_name]
+        delimiter = CSV_DELIMITERS[os.path.splitext(file_name)[1].lower()]
+        with open(os.path.join(self.__config_file_name, file_name), encoding='utf-8-sig', newline='') as sheet_file:
+            for row in csv.reader(sheet_file, delimiter=delimiter):
+                yield tuple(ScenarioSource.decode_text(value, True) for value in row)
+
+    def fingerprints(self) -> Dict[str, str]:
+        """シートフィンガープリント取得
+
+        Returns:
+            Dict[str, str]: シートごとのファイル内容のハッシュ値（キーはシート名、シートの並び順）
+        """
+        fingerprints: Dict[str, str] = {}
+        for sheet_name, file_name in self.__sheet_files.items():
+            with open(os.path.join(self.__config_file_name, file_name), 'rb') as sheet_file:
+                fingerprints[sheet_name] = f'{file_name}-{hashlib.sha1(sheet_file.read()).hexdigest()}'
+        return fingerprints
+
+    def write(output_name: str, sheets: Dict[str, List[List[Any]]], suffix: str = '.csv') -> None:
+        """CSV/TSV出力
+
+        Args:
+            output_name (str): 出力先ディレクトリ 存在しない場合は作成する
+            sheets (Dict[str, List[List[Any]]]): シートごとの行のリスト（キーはシート名、シートの並び順）
+            suffix (str): 拡張子（.csvまたは.tsv）
+        """
+        os.makedirs(output_name, exist_ok=True)
+        for sheet_name, rows in sheets.items():
+            with open(os.path.join(output_name, sheet_name + suffix), 'w', encoding='utf-8', newline='') as sheet_file:
+                writer = csv.writer(sheet_file, delimiter=CSV_DELIMITERS[suffix], lineterminator='\n')
+                writer.writerows([['' if value is None else ScenarioSource.encode_text(value, True) for value in row]
+                                  for row in rows])
+        with open(os.path.join(output_name, SHEET_INDEX_FILE), 'w', encoding='utf-8', newline='\n') as index_file:
+            index_file.writelines(sheet_name + '\n' for sheet_name in sheets)
+
+
+class JsonLinesSource(ScenarioSource):
+    """JSON Linesファイル
+
+    1行に1シートの1行分を記録したJSON Linesファイルを読み込む セル値はJSONの型（null、真偽値、数値、文字列）となる
+
+    """
+
+    def __init__(self, config_file_name: str):
+        """初期化
+
+        ファイル全体を読み込み、シートごとの行に振り分ける
+
+        Args:
+            config_file_name (str): JSON Linesファイルパス
+        """
+        self.__sheets: Dict[str, List[tuple]] = {}
+        self.__hashes: Dict[str, Any] = {}
+        with open(config_file_name, 'rb') as config_file:
+            for line in config_file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                sheet_name = record['sheet']
+                if sheet_name not in self.__sheets:
+                    self.__sheets[sheet_name] = []
+                    self.__hashes[sheet_name] = hashlib.sha1()
+                self.__sheets[sheet_name].append(tuple(record['row']))
+                self.__hashes[sheet_name].update(line.strip())
+                self.__hashes[sheet_name].update(b'\n')
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """シート名プロパティ
+
+        Returns:
+            List[str]: シート名リスト（シートの並び順）
+        """
+        return list(self.__sheets)
+
+    def rows(self, sheet_name: str) -> List[tuple]:
+        """シート行読み込み
+
+        Args:
+            sheet_name (str): シート名
+
+        Returns:
+            List[tuple]: 行ごとのセル値のタプル（1行目は列名）
+        """
+        return self.__sheets[sheet_name]
+
+    def fingerprints(self) -> Dict[str, str]:
+        """シートフィンガープリント取得
+
+        Returns:
+            Dict[str, str]: シートごとの行のハッシュ値（キーはシート名、シートの並び順）
+        """
+        return {sheet_name: sheet_hash.hexdigest() for sheet_name, sheet_hash in self.__hashes.items()}
+
+    def write(output_name: str, sheets: Dict[str, List[List[Any]]]) -> None:
+        """JSON Lines出力
+
+        Args:
+            output_name (str): 出力先ファイルパス
+            sheets (Dict[str, List[List[Any]]]): シートごとの行のリスト（キーはシート名、シートの並び順）
+        """
+        with open(output_name, 'w', encoding='utf-8', newline='\n') as output_file:
+            for sheet_name, rows in sheets.items():
+                # 空のシートもシートの並び順に含めるため、空の行を1行出力する
+                for row in rows or [[]]:
+                    output_file.write(json.dumps({'sheet': sheet_name, 'row': row}, ensure_ascii=False) + '\n')
+
+
+class SqliteSource(ScenarioSource):
+    """SQLiteデータベースファイル
+
+    1シートを1テーブルとして読み込む 列名は1行目、セル値はSQLiteの型（NULL、整数、実数、文字列）となる
+    真偽値は文字列（TRUE/FALSE）として保存し、読み込み時に真偽値に変換する
+
+    """
+
+    def __init__(self, config_file_name: str):
+        """初期化
+
+        Args:
+            config_file_name (str): SQLiteデータベースファイルパス
+        """
+        import sqlite3
+        uri = pathlib.Path(os.path.abspath(config_file_name)).as_uri() + '?mode=ro'
+        # ワークブックセッションは複数スレッドで共有するため、接続の使用は排他ロックで直列化する
+        self.__connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self.__lock = threading.Lock()
+        with self.__lock:
+            self.__sheet_names: List[str] = [name for (name,) in self.__connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid")]
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """シート名プロパティ
+
+        Returns:
+            List[str]: シート名リスト（テーブルを作成した順）
+        """
+        return self.__sheet_names
+
+    def rows(self, sheet_name: str) -> List[tuple]:
+        """シート行読み込み
+
+        Args:
+            sheet_name (str): シート名
+
+        Returns:
+            List[tuple]: 行ごとのセル値のタプル（1行目は列名）
+        """
+        with self.__lock:
+            cursor = self.__connection.execute(f'SELECT * FROM {SqliteSource.__quote(sheet_name)} ORDER BY rowid')
+            rows = cursor.fetchall()
+        return [tuple(column[0] for column in cursor.description)] + [
+            tuple(ScenarioSource.decode_text(value, False) for value in row) for row in rows]
+
+    def fingerprints(self) -> Dict[str, str]:
+        """シートフィンガープリント取得
+
+        Returns:
+            Dict[str, str]: シートごとの列名と行のハッシュ値（キーはシート名、テーブルを作成した順）
+        """
+        fingerprints: Dict[str, str] = {}
+        for sheet_name in self.__sheet_names:
+            sheet_hash = hashlib.sha1()
+            for row in self.rows(sheet_name):
+                sheet_hash.update(repr(row).encode('utf-8'))
+            fingerprints[sheet_name] = sheet_hash.hexdigest()
+        return fingerprints
+
+    def close(self) -> None:
+        """クローズ
+
+        データベースの接続を閉じる
+        """
+        self.__connection.close()
+
+    def write(output_name: str, sheets: Dict[str, List[List[Any]]]) -> None:
+        """SQLite出力
+
+        1行目を列名としてシートごとにテーブルを作成する 既存のファイルは置き換える
+
+        Args:
+            output_name (str): 出力先ファイルパス
+            sheets (Dict[str, List[List[Any]]]): シートごとの行のリスト（キーはシート名、シートの並び順）
+        """
+        import sqlite3
+        from MM_Workbook import Workbook
+        if os.path.exists(output_name):
+            os.remove(output_name)
+        connection = sqlite3.connect(output_name)
+        try:
+            for sheet_name, rows in sheets.items():
+                # 列のないテーブルは作成できないため、空のシートは列名が空の1列のテーブルとする
+                rows = rows or [['']]
+                width = max(len(row) for row in rows)
+                # 列名はxlsxの読み込みと同じ規則（空の列名は「Unnamed: 列番号」、重複は「列名.連番」）で一意にする
+                header = ['' if value is None else value for value in rows[0]] + [''] * (width - len(rows[0]))
+                columns = [str(column) for column in Workbook.dedup_columns(header)]
+                connection.execute(f'CREATE TABLE {SqliteSource.__quote(sheet_name)} '
+                                   f'({", ".join(SqliteSource.__quote(column) for column in columns)})')
+                connection.executemany(
+                    f'INSERT INTO {SqliteSource.__quote(sheet_name)} VALUES ({", ".join("?" * width)})',
+                    [[ScenarioSource.encode_text(value, False) for value in row] + [None] * (width - len(row))
+                     for row in rows[1:]])
+            connection.commit()
+        finally:
+            connection.close()
+
+    def __quote(name: str) -> str:
+        """識別子引用
+
+        Args:
+            name (str): テーブル名または列名
+
+        Returns:
+            str: 二重引用符で囲んだ識別子
+        """
+        return '"' + name.replace('"', '""') + '"'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='xlsxのシナリオ設定情報ファイルをCSV/TSV、JSON Lines、SQLiteに変換する')
+    parser.add_argument('config_file_name', help='xlsxのシナリオ設定情報ファイル')
+    parser.add_argument('output_name', help='出力先（csv/tsvはディレクトリ）')
+    parser.add_argument('--format', choices=FORMATS, default=None, help='出力形式（省略時は出力先の拡張子から判定し、拡張子がない場合はcsv）')
+    args = parser.parse_args()
+
+    output_format = args.format or {ENGINE_JSONL: 'jsonl', ENGINE_SQLITE: 'sqlite'}.get(
+        ENGINE_SUFFIXES.get(os.path.splitext(args.output_name)[1].lower()), 'csv')
+    sheet_names = ScenarioSource.convert(args.config_file_name, args.output_name, output_format)
+    print(f'{args.output_name}: {len(sheet_names)} sheets ({output_format})')
@@ -0,0 +1,170 @@
+"""シートフィンガープリント
+
+シナリオ設定情報ファイル（xlsx）内の各シートのXMLパートから、シートの内容が変わったかどうかを判定する値を求める
+
+"""
+import re
+import hashlib
+import zipfile
+from typing import List, Dict
+
+from MM_XlsxReader import XlsxReader
+from MM_ScenarioSource import ScenarioSource
+
+
+# 共有文字列（sharedStrings.xmlの<si>要素）のパタン
+SHARED_STRING_PATTERN = re.compile(rb'<(?:\w+:)?si>(.*?)</(?:\w+:)?si>|<(?:\w+:)?si\s*/>', re.S)
+# 共有文字列を参照するセル（t="s"の<c>要素の<v>要素）のパタン
+SHARED_STRING_CELL_PATTERN = re.compile(rb'<(?:\w+:)?c\b[^>]*?\st="s"[^>]*>\s*<(?:\w+:)?v>(\d+)</')
+
+
+class SheetFingerprint:
+    """シートフィンガープリント
+
+    シートごとに、XMLパートのCRCとサイズ（zipの格納情報）と、シートが参照する共有文字列のハッシュ値を保持する
+    共有文字列は全シートで共有されるため、共有文字列だけが変わった場合もシートが参照する文字列が変わっていなければ同じ値となる
+    書式情報（styles.xml）が変わった場合は、数値や日付の書式により読み込む値が変わるため、すべてのシートが変わったものとする
+    前回のフィンガープリントを指定した場合、XMLパート、共有文字列、書式情報が変わっていないシートはXMLパートを展開しない
+    Excel以外の形式（CSV/TSVディレクトリ、JSON Lines、SQLite）の場合は、シートごとの内容のハッシュ値を保持する
+
+    """
+
+    def __init__(self, config_file_name: str, previous: 'SheetFingerprint' = None):
+        """初期化
+
+        引数で指定されたシナリオ設定情報ファイルの各シートのフィンガープリントを求め、インスタンス属性に保持する
+
+        Args:
+            config_file_name (str): シナリオ設定情報ファイルパス
+            previous (SheetFingerprint): 前回のフィンガープリント（変わっていないシートの再計算を省略する）
+        """
+        engine = ScenarioSource.engine(config_file_name)
+        if engine is not None:
+            source = ScenarioSource.open(config_file_name, engine)
+            try:
+                self.__shared_strings_id: str = ''
+                self.__styles_id: str = ''
+                self.__part_ids: Dict[str, str] = {}
+                self.__sheets: Dict[str, str] = source.fingerprints()
+            finally:
+                source.close()
+            return
+        with zipfile.ZipFile(config_file_name) as book:
+            _, sheet_parts, part_names = XlsxReader.parts(book)
+            shared_strings_part = part_names.get('sharedStrings')
+            # 共有文字列パートの格納情報（共有文字列が変わったかどうかの判定に使用）
+            self.__shared_strings_id: str = SheetFingerprint.__part_id(book, shared_strings_part)
+            # 書式情報パートの格納情報（数値、日付の書式が変わったかどうかの判定に使用）
+            self.__styles_id: str = SheetFingerprint.__part_id(book, part_names.get('styles'))
+            self.__part_ids: Dict[str, str] = {}
+            self.__sheets: Dict[str, str] = {}
+            shared_strings: List[bytes] = None
+            for sheet_name, sheet_part in sheet_parts:
+                part_id = SheetFingerprint.__part_id(book, sheet_part)
+                self.__part_ids[sheet_name] = part_id
+                # XMLパート、共有文字列、書式情報が変わっていない場合は前回の値を使用する
+                if (previous is not None and previous.__shared_strings_id == self.__shared_strings_id
+                        and previous.__styles_id == self.__styles_id
+                        and previous.__part_ids.get(sheet_name) == part_id):
+                    self.__sheets[sheet_name] = previous.__sheets[sheet_name]
+                    continue
+                if shared_strings is None:
+                    shared_strings = SheetFingerprint.__shared_strings(book, shared_strings_part)
+                strings_hash = SheetFingerprint.__strings_hash(book.read(sheet_part), shared_strings)
+                self.__sheets[sheet_name] = f'{part_id}-{strings_hash}-{self.__styles_id}'
+
+    @property
+    def sheets(self) -> Dict[str, str]:
+        """シートフィンガープリントプロパティ
+
+        インスタンス属性のシートごとのフィンガープリントを取得する
+
+        Returns:
+            Dict[str, str]: シートごとのフィンガープリント（キーはシート名、ファイル内の並び順）
+        """
+        return self.__sheets
+
+    @property
+    def shared_strings_id(self) -> str:
+        """共有文字列パート格納情報プロパティ
+
+        Returns:
+            str: 共有文字列パートのCRCとサイズ 共有文字列がない場合は空文字列
+        """
+        return self.__shared_strings_id
+
+    def changed_sheets(self, previous: 'SheetFingerprint') -> List[str]:
+        """変更シート取得
+
+        前回のフィンガープリントから内容が変わったシートと、追加されたシートのシート名を返却する
+
+        Args:
+            previous (SheetFingerprint): 前回のフィンガープリント Noneの場合はすべてのシートを返却する
+
+        Returns:
+            List[str]: 変更または追加されたシート名リスト（ファイル内の並び順）
+        """
+        if previous is None:
+            return list(self.__sheets)
+        return [sheet_name for sheet_name, fingerprint in self.__sheets.items()
+                if previous.__sheets.get(sheet_name) != fingerprint]
+
+    def removed_sheets(self, previous: 'SheetFingerprint') -> List[str]:
+        """削除シート取得
+
+        Args:
+            previous (SheetFingerprint): 前回のフィンガープリント
+
+        Returns:
+            List[str]: 前回にあり、今回ないシート名リスト
+        """
+        if previous is None:
+            return []
+        return [sheet_name for sheet_name in previous.__sheets if sheet_name not in self.__sheets]
+
+    def __part_id(book: zipfile.ZipFile, part: str) -> str:
+        """パート格納情報取得
+
+        Args:
+            book (zipfile.ZipFile): シナリオ設定情報ファイル
+            part (str): パート名
+
+        Returns:
+            str: パートのCRCとサイズ パートがない場合は空文字列
+        """
+        if part is None or part not in book.NameToInfo:
+            return ''
+        info = book.getinfo(part)
+        return f'{info.CRC:08x}-{info.file_size}'
+
+    def __shared_strings(book: zipfile.ZipFile, shared_strings_part: str) -> List[bytes]:
+        """共有文字列読み込み
+
+        Args:
+            book (zipfile.ZipFile): シナリオ設定情報ファイル
+            shared_strings_part (str): 共有文字列パート名
+
+        Returns:
+            List[bytes]: 共有文字列の<si>要素の内容（XMLのまま）のリスト
+        """
+        if shared_strings_part is None or shared_strings_part not in book.NameToInfo:
+            return []
+        return SHARED_STRING_PATTERN.findall(book.read(shared_strings_part))
+
+    def __strings_hash(sheet_xml: bytes, shared_strings: List[bytes]) -> str:
+        """参照共有文字列ハッシュ値計算
+
+        Args:
+            sheet_xml (bytes): シートのXMLパート
+            shared_strings (List[bytes]): 共有文字列
+
+        Returns:
+            str: シートが参照する共有文字列を、セルの並び順に連結したハッシュ値
+        """
+        strings_hash = hashlib.sha1()
+        string_count = len(shared_strings)
+        for index in SHARED_STRING_CELL_PATTERN.findall(sheet_xml):
+            index = int(index)
+            strings_hash.update(shared_strings[index] if index < string_count else b'')
+            strings_hash.update(b'\0')
+        return strings_hash.hexdigest()
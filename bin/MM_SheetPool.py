@@ -0,0 +1,73 @@
+"""シートの並列読み込み
+
+シナリオ設定情報ファイルの独立したシート（SUB/LIST）を、プロセスプールで並列に読み込む
+
+"""
+import os
+from typing import List, Any, Callable, Tuple
+
+from MM_Workbook import Workbook
+
+
+class SheetPool:
+    """シート並列読み込み
+
+    シートごとの読み込み関数をプロセスプールで実行し、読み込み結果をシート名の並び順で返却する
+    子プロセスはシナリオ設定情報ファイルをそれぞれ開き、同じ子プロセスで読み込む後続のシートでは開いたセッションを共有する
+    読み込み関数はプロセス間で受け渡すため、クラスの公開メソッドなどモジュールから参照できる関数とすること
+
+    """
+
+    def parse(config_file: Workbook, sheet_names: List[str],
+              parse_sheet: Callable[[Workbook, str], Any], workers: int = None) -> List[Any]:
+        """シート並列読み込み
+
+        指定されたシートをそれぞれ読み込み関数で読み込み、結果をシート名の並び順で返却する
+        並列数が1以下、または読み込むシートが1つ以下の場合は、このプロセスで順に読み込む
+
+        Args:
+            config_file (Workbook): シナリオ設定情報ファイルのワークブックセッション
+            sheet_names (List[str]): 読み込むシート名リスト
+            parse_sheet (Callable[[Workbook, str], Any]): 読み込み関数（ワークブックセッションとシート名を受け取る）
+            workers (int): 並列数 0の場合はCPU数 Noneの場合は1
+
+        Returns:
+            List[Any]: シートごとの読み込み結果（シート名の並び順）
+        """
+        workers = SheetPool.workers(workers, len(sheet_names))
+        if workers <= 1:
+            return [parse_sheet(config_file, sheet_name) for sheet_name in sheet_names]
+        # プロセスプールは並列に読み込む場合のみ使用するため、ここで読み込む
+        from concurrent.futures import ProcessPoolExecutor
+        tasks = [(parse_sheet, config_file.config_file_name, config_file.engine, sheet_name) for sheet_name in sheet_names]
+        with ProcessPoolExecutor(max_workers=workers, initializer=Workbook.detach_all) as executor:
+            # mapは投入した順に結果を返却するため、シートの並び順が保たれる
+            return list(executor.map(SheetPool.parse_task, tasks))
+
+    def workers(workers: int, sheet_count: int) -> int:
+        """並列数決定
+
+        Args:
+            workers (int): 指定された並列数 0の場合はCPU数 Noneの場合は1
+            sheet_count (int): 読み込むシート数
+
+        Returns:
+            int: 使用する並列数（シート数を上限とする）
+        """
+        if workers is None:
+            return 1
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, sheet_count))
+
+    def parse_task(task: Tuple[Callable[[Workbook, str], Any], str, str, str]) -> Any:
+        """シート読み込み（子プロセス）
+
+        Args:
+            task (Tuple[Callable[[Workbook, str], Any], str, str, str]): 読み込み関数、シナリオ設定情報ファイルパス、読み込みエンジン、シート名
+
+        Returns:
+            Any: シートの読み込み結果
+        """
+        parse_sheet, config_file_name, engine, sheet_name = task
+        return parse_sheet(Workbook.open(config_file_name, engine), sheet_name)
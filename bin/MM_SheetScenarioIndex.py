@@ -0,0 +1,143 @@
+"""サブシート別シナリオ索引
+
+読み込み済みのサブシートごとのシナリオ索引を、サブシートの並び順に検索する
+
+"""
+import bisect
+from typing import List, Dict, Any, Tuple
+
+from MM_CommandConfig import CommandConfig
+from MM_ScenarioConfig import ScenarioConfig
+from MM_ScenarioIndex import ScenarioIndex
+
+
+class SheetScenarioIndex:
+    """サブシート別シナリオ索引
+
+    サブシートを参照時に読み込む場合に、読み込み済みの全サブシートの索引を生成し直さずに、
+    読み込んだサブシートの索引だけを追加する
+    シナリオ名ごとに定義しているサブシートをサブシートの並び順で保持し、
+    全サブシートをまとめた索引（ScenarioIndex）と同じ結果を返却する
+    索引の追加は新しいインスタンスを返却し、検索中のスレッドが参照しているインスタンスは変更しない
+
+    """
+
+    def __init__(self, sub_sheet_list: List[str] = (), sheetIndexes: Dict[str, ScenarioIndex] = None):
+        """初期化
+
+        Args:
+            sub_sheet_list (List[str]): サブシート名リスト（サブシートの並び順）
+            sheetIndexes (Dict[str, ScenarioIndex]): 読み込み済みのサブシートごとの索引 キーはサブシート名
+        """
+        # サブシート名から並び順を引く辞書
+        self.__positions: Dict[str, int] = {sub_sheet_name: position for position, sub_sheet_name in enumerate(sub_sheet_list)}
+        # シナリオ名から、そのシナリオを定義している読み込み済みのサブシートの並び順と索引の組を引く辞書（サブシートの並び順）
+        self.__scenarios: Dict[str, Tuple[Tuple[int, ScenarioIndex], ...]] = {}
+        for sub_sheet_name, sheetIndex in (sheetIndexes or {}).items():
+            if sub_sheet_name in self.__positions:
+                self.__add(sub_sheet_name, sheetIndex)
+
+    def __len__(self) -> int:
+        """シナリオ数
+
+        Returns:
+            int: 索引に登録されたシナリオ名の数
+        """
+        return len(self.__scenarios)
+
+    def __contains__(self, scenario: str) -> bool:
+        """シナリオ名登録判定
+
+        Args:
+            scenario (str): シナリオ名
+
+        Returns:
+            bool: シナリオ名が索引に登録されている場合true 登録されていない場合false
+        """
+        return scenario in self.__scenarios
+
+    def add(self, sub_sheet_name: str, sheetIndex: ScenarioIndex) -> 'SheetScenarioIndex':
+        """サブシート索引追加
+
+        Args:
+            sub_sheet_name (str): サブシート名（初期化時のサブシート名リストにあるもの）
+            sheetIndex (ScenarioIndex): サブシートの索引
+
+        Returns:
+            SheetScenarioIndex: 索引を追加した新しいインスタンス（このインスタンスは変更しない）
+        """
+        index = SheetScenarioIndex.__new__(SheetScenarioIndex)
+        index.__positions = self.__positions
+        index.__scenarios = self.__scenarios.copy()
+        index.__add(sub_sheet_name, sheetIndex)
+        return index
+
+    def __add(self, sub_sheet_name: str, sheetIndex: ScenarioIndex) -> None:
+        """サブシート索引登録
+
+        サブシートに定義されたシナリオ名ごとに、サブシートの並び順の位置に索引を挿入する
+
+        Args:
+            sub_sheet_name (str): サブシート名
+            sheetIndex (ScenarioIndex): サブシートの索引
+        """
+        position = self.__positions[sub_sheet_name]
+        for scenario in sheetIndex:
+            entries = list(self.__scenarios.get(scenario, ()))
+            entries.insert(bisect.bisect_left([entry[0] for entry in entries], position), (position, sheetIndex))
+            self.__scenarios[scenario] = tuple(entries)
+
+    def get_scenario(self, scenario: str) -> ScenarioConfig:
+        """シナリオ設定情報検索
+
+        Args:
+            scenario (str): シナリオ名
+
+        Returns:
+            ScenarioConfig: シナリオ名が一致する最初のシナリオ設定情報（サブシートの並び順） ない場合はNone
+        """
+        entries = self.__scenarios.get(scenario)
+        return entries[0][1].get_scenario(scenario) if entries else None
+
+    def get_item(self, scenario: str, item: str) -> CommandConfig:
+        """コマンド概要項目検索
+
+        Args:
+            scenario (str): シナリオ名
+            item (str): コマンド概要項目
+
+        Returns:
+            CommandConfig: シナリオ名とコマンド概要項目が一致する最初の実行コマンド設定情報 ない場合はNone
+        """
+        for _, index in self.__scenarios.get(scenario, ()):
+            commandConfig = index.get_item(scenario, item)
+            if commandConfig is not None:
+                return commandConfig
+        return None
+
+    def get_no(self, scenario: str, no: Any) -> CommandConfig:
+        """コマンド採番検索
+
+        Args:
+            scenario (str): シナリオ名
+            no (Any): コマンド採番
+
+        Returns:
+            CommandConfig: シナリオ名とコマンド採番が一致する最初の実行コマンド設定情報 ない場合はNone
+        """
+        for _, index in self.__scenarios.get(scenario, ()):
+            commandConfig = index.get_no(scenario, no)
+            if commandConfig is not None:
+                return commandConfig
+        return None
+
+    def get_commands(self, scenario: str) -> Tuple[CommandConfig, ...]:
+        """実行順コマンド取得
+
+        Args:
+            scenario (str): シナリオ名
+
+        Returns:
+            Tuple[CommandConfig, ...]: 全サブシートの実行コマンド設定情報（コマンド採番順） ない場合は空のタプル
+        """
+        return ScenarioIndex.merge_commands(index.get_commands(scenario) for _, index in self.__scenarios.get(scenario, ()))
@@ -4,67 +4,172 @@
 
 """
 import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
-from typing import List, Dict, Any
+import threading
+from functools import partial
+from typing import List, Dict, Any, Union, Tuple, Iterable
 
 from MM_CommandConfig import CommandConfig
 from MM_ScenarioConfig import ScenarioConfig
+from MM_Workbook import Workbook
+from MM_SheetPool import SheetPool
+from MM_SheetFingerprint import SheetFingerprint
+from MM_SymbolTable import SymbolTable
+from MM_ScenarioIndex import ScenarioIndex
+from MM_SheetScenarioIndex import SheetScenarioIndex
+from MM_ScenarioGraph import ScenarioGraph, ORDERED_TASK_PREFIXES
 
 
-class AsciiFilter:
-    """ASCIIフィルタ
+# サブシート名のパタン（loop_dnsコマンドの"COMMAND"列「SUB001.amf_dns_show({{Group_AMF}})」からSUB001を抽出する）
+SUB_SHEET_PATTERN = re.compile(r'[A-Z]{3}[0-9]{3}')
+# サブシート名とシナリオ名のパタン（「SUB001.amf_dns_show(」からSUB001とamf_dns_showを抽出する）
+SUB_SCENARIO_PATTERN = re.compile(r'([A-Z]{3}[0-9]{3})\.([^(\s]+)')
+
+
+class SubLoadConfig:
+    """設定情報
+
+    シナリオ設定情報ファイルを読み込み、ファイルに設定されたメイン処理設定情報、接続設定情報、サブ処理設定情報を保持する
+    サブシートは初期化時には読み込まず、コマンドやシナリオ名で初めて参照された時に読み込んで保持する
 
-    PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-    文字列以外の場合はそのまま保持する
     """
 
-    def __init__(self, row: pandas.core.series.Series) -> None:
+    def __init__(self, config_file_name: Union[str, Workbook], workers: int = None):
         """初期化
 
-        PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-        文字列以外の場合はそのまま保持する
+        引数で指定されたシナリオ設定情報ファイルのサブシート名をインスタンス属性に保持する
+        ファイルパスが指定された場合は、同じファイルを読み込む他のローダとワークブックセッションを共有する
+
+        Args:
+            config_file_name (Union[str, Workbook]): シナリオ設定情報ファイルパス、またはワークブックセッション
+            workers (int): 複数のサブシートをまとめて読み込む場合の並列プロセス数 0の場合はCPU数 Noneの場合は並列に読み込まない
         """
-        for col_name in row.index:
-            setattr(self, col_name, AsciiFilter.__strip_to_ascii(row[col_name]))
+        # 設定ファイル読み込み（開いているセッションがあれば共有する）
+        config_file: Workbook = Workbook.open(config_file_name) if isinstance(config_file_name, str) else config_file_name
+        # サブシートをまとめて読み込む場合の並列数
+        self.__workers: int = workers
+        # サブシート読み込み時に同じセッションを取得するため、ファイルパスと読み込みエンジンを保持する
+        self.__config_file_name: str = config_file.config_file_name
+        self.__engine: str = config_file.engine
+        # 再読み込み時に変更されたシートを判定するため、シートのフィンガープリントを保持する（ワークブックセッションで共有する）
+        self.__fingerprint: SheetFingerprint = config_file.fingerprint
+        # 設定ファイルのシート名読み込み（返却値はList型）
+        config_sheet_name: List = config_file.sheet_names
+        # サブシート名リスト
+        self.__sub_sheet_list: List[str] = SubLoadConfig.__sub_sheets(config_sheet_name)
+        # 読み込み済みのサブ設定情報（キーはサブシート名）
+        self.__sheetConfigs: Dict[str, List[ScenarioConfig]] = {}
+        # 読み込み済みのサブシートごとの索引と、それをサブシートの並び順に検索する索引（サブシート読み込み時に追加する）
+        self.__sheetIndexes: Dict[str, ScenarioIndex] = {}
+        self.__index: SheetScenarioIndex = SheetScenarioIndex(self.__sub_sheet_list)
+        # 読み込んだサブシートで繰り返し出現する文字列を1つのオブジェクトにまとめるシンボルテーブル（サブシート読み込み時に使用する）
+        self.__symbols: SymbolTable = SymbolTable()
+        # サブシート読み込みの排他ロック
+        self.__lock = threading.Lock()
 
-    def __strip_to_ascii(org: Any) -> Any:
-        """ASCIIコード以外削除
+    @property
+    def subConfigs(self) -> List[ScenarioConfig]:
+        """サブ設定情報プロパティ
 
-        引数が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除して返却する
-        文字列以外の場合はそのまま返却する
+        インスタンス属性のサブ設定情報を取得する
+        未読み込みのサブシートがある場合は、すべて読み込む
 
-        Args:
-            org (Any): 元データ
+        Returns:
+            List[ScenarioConfig]: サブ設定情報（サブシートの並び順）
+        """
+        self.load_sheets()
+        subConfigs: List[ScenarioConfig] = []
+        for sub_sheet_name in self.__sub_sheet_list:
+            subConfigs.extend(self.__sheetConfigs[sub_sheet_name])
+        return subConfigs
+
+    @property
+    def sub_sheet_list(self) -> List[str]:
+        """サブシート名プロパティ
+
+        インスタンス属性のサブシート名リストを取得する
 
         Returns:
-            Any: ASCIIコード以外削除データ（文字列以外の場合は元データ）
+            List[str]: サブシート名リスト（読み込み済みかどうかに関わらずすべて）
         """
-        if org and type(org) == str:
-            # No-Break SpaceをSpaceに変換しascii以外の文字コードを除去
-            return org.replace('\u00a0', '\u0020').encode('ascii', 'ignore').decode('utf-8')
-        return org
+        return self.__sub_sheet_list
 
-class SubLoadConfig:
-    """設定情報
+    @property
+    def loaded_sheet_list(self) -> List[str]:
+        """読み込み済みサブシート名プロパティ
 
-    シナリオ設定情報ファイルを読み込み、ファイルに設定されたメイン処理設定情報、接続設定情報、サブ処理設定情報を保持する
+        インスタンス属性の読み込み済みサブシート名リストを取得する
 
-    """
+        Returns:
+            List[str]: 読み込み済みサブシート名リスト
+        """
+        return [sub_sheet_name for sub_sheet_name in self.__sub_sheet_list if sub_sheet_name in self.__sheetConfigs]
 
-    def __init__(self, config_file_name: str):
-        """初期化
+    def __getstate__(self) -> Dict[str, Any]:
+        """保存
+
+        キャッシュに保存するインスタンス属性を返却する（排他ロック、シンボルテーブルと、サブ設定情報から生成できる索引は保存しない）
 
-        引数で指定されたシナリオ設定情報ファイルを読み込み、インスタンス属性に保持する
+        Returns:
+            Dict[str, Any]: 保存するインスタンス属性
+        """
+        state = self.__dict__.copy()
+        del state['_SubLoadConfig__lock']
+        del state['_SubLoadConfig__symbols']
+        del state['_SubLoadConfig__sheetIndexes']
+        del state['_SubLoadConfig__index']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """復元
+
+        キャッシュから復元したインスタンス属性に、排他ロック、シンボルテーブルと読み込み済みサブシートの索引を追加する
+        未読み込みのサブシートは、参照された時にシナリオ設定情報ファイルから読み込む
 
         Args:
-            config_file_name (str): シナリオ設定情報ファイルパス
+            state (Dict[str, Any]): 復元するインスタンス属性
+        """
+        self.__dict__.update(state)
+        self.__symbols = SymbolTable()
+        self.__lock = threading.Lock()
+        self.__sheetIndexes = {sub_sheet_name: ScenarioIndex(sheetConfigs) for sub_sheet_name, sheetConfigs in self.__sheetConfigs.items()}
+        self.__index = SheetScenarioIndex(self.__sub_sheet_list, self.__sheetIndexes)
+
+    def reload(self) -> List[str]:
+        """再読み込み
+
+        前回の読み込みから変更または削除されたサブシートの設定情報を破棄する
+        破棄したサブシートは、次に参照された時にシナリオ設定情報ファイルから読み込み直す
+        シンボルテーブルは破棄したサブシートの文字列を保持し続けないよう、生成し直す
+
+        Returns:
+            List[str]: 設定情報を破棄したサブシート名リスト
+        """
+        with self.__lock:
+            fingerprint = SheetFingerprint(self.__config_file_name, self.__fingerprint)
+            changed_sheets = fingerprint.changed_sheets(self.__fingerprint)
+            sub_sheet_list = SubLoadConfig.__sub_sheets(list(fingerprint.sheets))
+            discard_sheet_list = [sub_sheet_name for sub_sheet_name in self.__sheetConfigs
+                                  if sub_sheet_name in changed_sheets or sub_sheet_name not in sub_sheet_list]
+            for sub_sheet_name in discard_sheet_list:
+                del self.__sheetConfigs[sub_sheet_name]
+                del self.__sheetIndexes[sub_sheet_name]
+            self.__sub_sheet_list = sub_sheet_list
+            self.__fingerprint = fingerprint
+            if discard_sheet_list:
+                self.__symbols = SymbolTable()
+            # サブシートの並び順が変わる場合があるため、読み込み済みのサブシートの索引から生成し直す（サブシートの索引は再生成しない）
+            self.__index = SheetScenarioIndex(sub_sheet_list, self.__sheetIndexes)
+        return discard_sheet_list
+
+    def __sub_sheets(config_sheet_name: List[str]) -> List[str]:
+        """サブシート名取得
+
+        Args:
+            config_sheet_name (List[str]): 設定ファイルのシート名リスト
+
+        Returns:
+            List[str]: サブシート名リスト
         """
-        # 設定ファイル読み込み
-        config_file = pd.ExcelFile(config_file_name, engine='openpyxl')
-        # 設定ファイルのシート名読み込み（返却値はList型）
-        config_sheet_name: List = config_file.sheet_names
         # サブシート名リスト初期化
         sub_sheet_list: List = []
         # 設定ファイルのシート名リストから、各シート名を繰り返し取り出す
@@ -73,133 +178,309 @@ class SubLoadConfig:
             if 'SUB' in sheet_name:
                 # サブシート名リストに格納
                 sub_sheet_list.append(sheet_name)
-        # 読み込んだ設定ファイルとサブシート名リストを引数に、サブ設定情報ロードを呼び出す
-        self.__subConfigs: Dict[str, ScenarioConfig] = SubLoadConfig.__load_sub_process_info(config_file, sub_sheet_list)
+        return sub_sheet_list
 
-    @property
-    def subConfigs(self) -> Dict[str, ScenarioConfig]:
-        """サブ設定情報プロパティ
+    def get_sheet(self, sub_sheet_name: str) -> List[ScenarioConfig]:
+        """サブシート設定情報取得
 
-        インスタンス属性のサブ設定情報を取得する
-        サブ設定情報シートがある限り、読み込む
+        指定されたサブシートのサブ設定情報を返却する
+        初めて参照された場合はシナリオ設定情報ファイルから読み込み、以降は読み込んだ設定情報を返却する
+
+        Args:
+            sub_sheet_name (str): サブシート名
+
+        Returns:
+            List[ScenarioConfig]: サブシートのサブ設定情報 サブシートが存在しない場合はNone
+        """
+        if sub_sheet_name not in self.__sub_sheet_list:
+            return None
+        sheetConfigs = self.__sheetConfigs.get(sub_sheet_name)
+        if sheetConfigs is not None:
+            return sheetConfigs
+        with self.__lock:
+            # 他のスレッドが読み込み済みの場合はそれを返却する
+            sheetConfigs = self.__sheetConfigs.get(sub_sheet_name)
+            if sheetConfigs is None:
+                config_file = Workbook.open(self.__config_file_name, self.__engine)
+                sheetConfigs = SubLoadConfig.load_sheet(config_file, sub_sheet_name, self.__symbols)
+                self.__add_sheet(sub_sheet_name, sheetConfigs)
+        return sheetConfigs
+
+    def load_sheets(self, sub_sheet_list: List[str] = None) -> None:
+        """サブシート一括読み込み
+
+        指定されたサブシートのうち未読み込みのものを読み込んで保持する
+        並列数が指定されている場合は、プロセスプールで並列に読み込む
+        （子プロセスで読み込んだサブシートの文字列は、このインスタンスのシンボルテーブルではなくサブシートごとにまとめる）
+
+        Args:
+            sub_sheet_list (List[str]): 読み込むサブシート名リスト Noneの場合はすべてのサブシート
+        """
+        if sub_sheet_list is None:
+            sub_sheet_list = self.__sub_sheet_list
+        with self.__lock:
+            unloaded_sheet_list = [sub_sheet_name for sub_sheet_name in sub_sheet_list
+                                   if sub_sheet_name in self.__sub_sheet_list and sub_sheet_name not in self.__sheetConfigs]
+            if not unloaded_sheet_list:
+                return
+            config_file = Workbook.open(self.__config_file_name, self.__engine)
+            # このプロセスで読み込む場合は、シンボルテーブルを共有する
+            load_sheet = (partial(SubLoadConfig.load_sheet, symbols=self.__symbols)
+                          if SheetPool.workers(self.__workers, len(unloaded_sheet_list)) <= 1 else SubLoadConfig.load_sheet)
+            sheetConfigs_list = SheetPool.parse(config_file, unloaded_sheet_list, load_sheet, self.__workers)
+            for sub_sheet_name, sheetConfigs in zip(unloaded_sheet_list, sheetConfigs_list):
+                self.__add_sheet(sub_sheet_name, sheetConfigs)
+
+    def __add_sheet(self, sub_sheet_name: str, sheetConfigs: List[ScenarioConfig]) -> None:
+        """読み込み済みサブシート追加
+
+        読み込んだサブシートのサブ設定情報と、サブシートの索引を保持する（排他ロック取得中に呼び出す）
+        読み込み済みの全サブシートの索引は生成し直さず、読み込んだサブシートの索引だけを追加する
+        検索中のスレッドが参照している索引は変更せず、追加した新しい索引に置き換える
+        get_sheet()は排他ロックを取得せずに読み込み済みかを判定するため、サブ設定情報は索引を置き換えた後に保持する
+
+        Args:
+            sub_sheet_name (str): サブシート名
+            sheetConfigs (List[ScenarioConfig]): サブシートのサブ設定情報
+        """
+        sheetIndex = ScenarioIndex(sheetConfigs)
+        self.__sheetIndexes[sub_sheet_name] = sheetIndex
+        self.__index = self.__index.add(sub_sheet_name, sheetIndex)
+        self.__sheetConfigs[sub_sheet_name] = sheetConfigs
+
+    def load_sheet(config_file: Workbook, sub_sheet_name: str, symbols: SymbolTable = None) -> List[ScenarioConfig]:
+        """サブシートロード
+
+        シナリオ設定情報ファイルの指定された「SUB」シートから情報を読み込み、サブ設定情報として返却する
+
+        Args:
+            config_file (Workbook): シナリオ設定情報ファイルのワークブックセッション
+            sub_sheet_name (str): サブシート名
+            symbols (SymbolTable): 文字列をまとめるシンボルテーブル Noneの場合はサブシートごとに生成する
+
+        Returns:
+            List[ScenarioConfig]: サブシートのサブ設定情報
+        """
+        return SubLoadConfig.__load_sub_process_info(config_file, [sub_sheet_name], symbols)
+
+    def get_sheet_by_command(self, command: str) -> List[ScenarioConfig]:
+        """コマンド参照サブシート設定情報取得
+
+        loop_dnsコマンドの"COMMAND"列（例：SUB001.amf_dns_show({{Group_AMF}})）から参照するサブシート名を抽出し、
+        そのサブシートのサブ設定情報を返却する（未読み込みの場合は読み込む）
+
+        Args:
+            command (str): コマンド
+
+        Returns:
+            List[ScenarioConfig]: 参照するサブシートのサブ設定情報 サブシートを参照していない場合はNone
+        """
+        sub_sheet_name = SubLoadConfig.referenced_sheet(command)
+        if sub_sheet_name is None:
+            return None
+        return self.get_sheet(sub_sheet_name)
+
+    def get_scenario_by_command(self, command: str) -> ScenarioConfig:
+        """コマンド参照シナリオ設定情報取得
+
+        loop_dnsコマンドの"COMMAND"列（例：SUB001.amf_dns_show({{Group_AMF}})）から参照するサブシート名とシナリオ名を抽出し、
+        そのシナリオ設定情報を返却する（サブシートが未読み込みの場合は読み込む）
+
+        Args:
+            command (str): コマンド
 
         Returns:
-            Dict[str, ScenarioConfig]: サブ設定情報
+            ScenarioConfig: 参照するシナリオ設定情報 参照先がない場合はNone
         """
-        return self.__subConfigs
+        match = SUB_SCENARIO_PATTERN.search(command) if type(command) == str else None
+        if match is None:
+            return None
+        if self.get_sheet(match.group(1)) is None:
+            return None
+        return self.__sheetIndexes[match.group(1)].get_scenario(match.group(2))
+
+    def referenced_sheet(command: Any) -> str:
+        """参照サブシート名抽出
 
+        コマンドに含まれるサブシート名（英大文字3文字と数字3文字）を抽出する
+
+        Args:
+            command (Any): コマンド（"COMMAND"列の値）
+
+        Returns:
+            str: サブシート名 コマンドが文字列でない場合、サブシート名を含まない場合はNone
+        """
+        if type(command) != str:
+            return None
+        match = SUB_SHEET_PATTERN.search(command)
+        return match.group(0) if match else None
 
-    def __load_sub_process_info(config_file: pd.DataFrame, sub_sheet_list: List) -> Dict[str, ScenarioConfig]:
+    def __load_sub_process_info(config_file: Workbook, sub_sheet_list: List, symbols: SymbolTable = None) -> List[ScenarioConfig]:
         """サブ設定情報ロード
 
         シナリオ設定情報ファイルの「SUB」シートから情報を読み込み、サブ設定情報として返却する
-        「SUB」シートがある限り、設定情報を読み込む
+        引数で指定された「SUB」シートの設定情報を読み込む
 
         Args:
-            config_file (pd.ExcelFile): ホスト設定情報ファイル（pandasでExcelファイルを表すクラスのオブジェクト）
+            config_file (Workbook): シナリオ設定情報ファイルのワークブックセッション
+            sub_sheet_list (List): 読み込むサブシート名リスト
+            symbols (SymbolTable): 文字列をまとめるシンボルテーブル Noneの場合は読み込みごとに生成する
 
         Returns:
-            subConfigs: Dict[str, ScenarioConfig]: サブ設定情報 キーはシナリオ名
+            subConfigs: List[ScenarioConfig]: サブ設定情報
         """
-        # シナリオ設定情報リストを初期化する
-        subConfigs: List[ScenarioConfig] = []
+        # シナリオ名と実行コマンド設定情報リストの組を初期化する（シナリオ設定情報は変更できないため、全行を読み込んでから生成する）
+        scenarios: List[Tuple[str, List[CommandConfig]]] = []
         # コマンド設定情報リストを初期化する
         commandConfigs: List[CommandConfig] = []
+        # 繰り返し出現する文字列（"MM"、"any"、"TRUE_FALSE"など）を1つのオブジェクトにまとめるシンボルテーブル（ローダで共有する）
+        if symbols is None:
+            symbols = SymbolTable()
         # 引渡されたサブシート名リストに格納されているサブシート名を順に呼び出す
         for sub_sheet_name in sub_sheet_list:
             # リストに格納されている順に取得したサブシート名のシナリオ設定ファイルを取得
-            sub_collect_sheet = config_file.parse(sub_sheet_name)
+            sub_collect_sheet: List[tuple] = config_file.rows(sub_sheet_name)
             # SUBシートの行でループする
-            for row in [AsciiFilter(row) for _, row in sub_collect_sheet.iterrows()]:
+            for row in sub_collect_sheet:
                 # 各列の1行目をキー、2行目以降を値として格納しているものを変数化
-                sub_cmd_items = row.__dict__.items()
+                sub_cmd_items = zip(row._fields, row)
                 # cmd情報リストを初期化
                 sub_cmd_list = []
                 for sub_cmd_key, sub_cmd_val in sub_cmd_items:
                     # CommandConfigにSCENARIO列情報はいらないため、除外
                     if not sub_cmd_key == 'SCENARIO':
                         # cmd情報リストにSCENARIO列情報以外を格納
-                        sub_cmd_list.append(sub_cmd_val)
+                        sub_cmd_list.append(symbols.intern(sub_cmd_val))
                 # SUBシートの行のシナリオ名がnullでない場合
-                if not pd.isnull(row.SCENARIO):
+                if not Workbook.is_null(row.SCENARIO):
                     # コマンド設定情報を初期化する
                     commandConfigs: List[CommandConfig] = []
-                    # シナリオ設定情報をSUB001シートの行の情報と実行コマンド設定情報辞書で生成し、シナリオ設定情報辞書にシナリオ名"SCENARIO"をキーとして追加する
-                    subConfigs.append(ScenarioConfig(row.SCENARIO, commandConfigs))
+                    # シナリオ名"SCENARIO"と、以降の行で追加する実行コマンド設定情報リストの組を追加する
+                    scenarios.append((symbols.intern(row.SCENARIO), commandConfigs))
 
                 # SUBシートの行の実行コマンド概要がnullでない場合
-                if not pd.isnull(row.ITEM):
+                if not Workbook.is_null(row.ITEM):
                     # 実行コマンド設定情報をSUBシートの行の情報で生成し、実行コマンド設定情報辞書に実行コマンド項目名"ITEM"をキーとして追加する
                     commandConfigs.append(CommandConfig(*sub_cmd_list))
-        # 収集設定情報辞書を返却する
-        return subConfigs
-
+        # シナリオ名と実行コマンド設定情報からシナリオ設定情報を生成し、サブ設定情報として返却する
+        return [ScenarioConfig(scenario, commandConfigs) for scenario, commandConfigs in scenarios]
 
     def get_scenario(self, scenario: str) -> ScenarioConfig:
         """シナリオ設定情報取得
 
-        指定されたシナリオ名に関連する設定情報を、保持しているシナリオ設定情報から取得する
+        指定されたシナリオ名に関連する設定情報を、読み込み済みサブシートの索引から取得する
+        読み込み済みのサブシートにない場合は、未読み込みのサブシートを見つかるまで順に読み込む
 
         Args:
             scenario(str): シナリオ名
 
         Returns:
-            ScenarioConfig: 指定されたシナリオ名に関連するシナリオ設定情報
+            ScenarioConfig: 指定されたシナリオ名に関連するシナリオ設定情報 ない場合はNone
         """
-        return self.__subConfigs.get(scenario)
+        scenarioConfig = self.__index.get_scenario(scenario)
+        if scenarioConfig is not None:
+            return scenarioConfig
+        # 他のスレッドの読み込み、再読み込みと同時に参照しないよう、索引と未読み込みのサブシート名リストは排他ロックを取得して複製する
+        # （最初の検索から排他ロックを取得するまでに他のスレッドが読み込んだサブシートは、複製した索引で検索する）
+        with self.__lock:
+            index = self.__index
+            unloaded_sheet_list = [sub_sheet_name for sub_sheet_name in self.__sub_sheet_list if sub_sheet_name not in self.__sheetConfigs]
+        scenarioConfig = index.get_scenario(scenario)
+        if scenarioConfig is not None:
+            return scenarioConfig
+        for sub_sheet_name in unloaded_sheet_list:
+            self.get_sheet(sub_sheet_name)
+            scenarioConfig = self.__index.get_scenario(scenario)
+            if scenarioConfig is not None:
+                return scenarioConfig
+        return None
 
 
     def get_item(self, scenario: str, item: str) -> CommandConfig:
         """コマンド概要項目情報取得
 
-        指定されたシナリオ名とコマンド概要項目に関連する設定情報を、保持している実行コマンド設定情報から取得する
+        指定されたシナリオ名とコマンド概要項目に関連する設定情報を、索引から取得する
+        同じシナリオ名の行が複数のシナリオ設定情報に分かれている場合も、すべての実行コマンド設定情報から検索する
 
         Args:
             scenario(str): シナリオ名
             item(str): コマンド概要項目
 
         Returns:
-            CommandConfig: 指定されたコマンド概要項目に関連する実行コマンド設定情報
+            CommandConfig: 指定されたコマンド概要項目に関連する実行コマンド設定情報 ない場合はNone
         """
-        scenarioConf = self.__subConfigs.get(scenario)
-        return scenarioConf._ScenarioConfig__commandConfigs.get(item)
+        if self.get_scenario(scenario) is None:
+            return None
+        return self.__index.get_item(scenario, item)
 
 
-    def get_node(self, scenario: str, item: str) -> CommandConfig:
-        """実行環境名取得
+    def get_item_by_no(self, scenario: str, no: Any) -> CommandConfig:
+        """コマンド採番項目情報取得
 
-        指定されたシナリオ名とコマンド概要項目に関連する実行環境情報を、保持している実行コマンド設定情報から取得する
+        指定されたシナリオ名とコマンド採番に関連する設定情報を、索引から取得する
 
         Args:
             scenario(str): シナリオ名
-            item(str): コマンド概要項目
+            no(Any): コマンド採番
 
         Returns:
-            CommandConfig: 指定されたコマンド概要項目に関連する実行環境情報
+            CommandConfig: 指定されたコマンド採番に関連する実行コマンド設定情報 ない場合はNone
         """
-        scenarioConf = self.__subConfigs.get(scenario)
-        itemConf = scenarioConf._ScenarioConfig__commandConfigs.get(item)
-        return itemConf._CommandConfig__node
+        if self.get_scenario(scenario) is None:
+            return None
+        return self.__index.get_no(scenario, no)
 
 
-    def get_no(self, scenario: str, item: str) -> CommandConfig:
-        """コマンド採番取得
+    def get_commands(self, scenario: str) -> Tuple[CommandConfig, ...]:
+        """実行順コマンド情報取得
 
-        指定されたシナリオ名とコマンド概要項目に関連するコマンド採番を、保持している実行コマンド設定情報から取得する
+        指定されたシナリオ名の実行コマンド設定情報を、コマンド採番順に取得する
+
+        Args:
+            scenario(str): シナリオ名
+
+        Returns:
+            Tuple[CommandConfig, ...]: 実行コマンド設定情報（コマンド採番順） シナリオがない場合は空のタプル
+        """
+        if self.get_scenario(scenario) is None:
+            return ()
+        return self.__index.get_commands(scenario)
+
+
+    def get_graph(self, scenario: str, ordered_tasks: Iterable[str] = ORDERED_TASK_PREFIXES) -> ScenarioGraph:
+        """シナリオ依存グラフ取得
+
+        指定されたシナリオ名の実行コマンド設定情報（コマンド採番順）から、コマンド間の依存グラフを生成する
+
+        Args:
+            scenario(str): シナリオ名
+            ordered_tasks(Iterable[str]): 前後のコマンドとの順序を保つタスク名の接頭辞
+
+        Returns:
+            ScenarioGraph: シナリオ依存グラフ シナリオがない場合はNone
+        """
+        if self.get_scenario(scenario) is None:
+            return None
+        return ScenarioGraph(self.__index.get_commands(scenario), ordered_tasks)
+
+
+    def get_node(self, scenario: str, item: str) -> str:
+        """実行環境名取得
+
+        指定されたシナリオ名とコマンド概要項目に関連する実行環境情報を、保持している実行コマンド設定情報から取得する
 
         Args:
             scenario(str): シナリオ名
             item(str): コマンド概要項目
 
         Returns:
-            CommandConfig: 指定されたコマンド概要項目に関連するコマンド採番
+            str: 指定されたコマンド概要項目に関連する実行環境情報 ない場合はNone
         """
-        scenarioConf = self.__subConfigs.get(scenario)
-        itemConf = scenarioConf._ScenarioConfig__commandConfigs.get(item)
-        return itemConf._CommandConfig__no
+        itemConf = self.get_item(scenario, item)
+        return itemConf.node if itemConf is not None else None
 
 
-    def get_no(self, scenario: str, item: str) -> CommandConfig:
+    def get_no(self, scenario: str, item: str) -> Any:
         """コマンド採番取得
 
         指定されたシナリオ名とコマンド概要項目に関連するコマンド採番を、保持している実行コマンド設定情報から取得する
@@ -209,14 +490,13 @@ class SubLoadConfig:
             item(str): コマンド概要項目
 
         Returns:
-            CommandConfig: 指定されたコマンド概要項目に関連するコマンド採番
+            Any: 指定されたコマンド概要項目に関連するコマンド採番 ない場合はNone
         """
-        scenarioConf = self.__subConfigs.get(scenario)
-        itemConf = scenarioConf._ScenarioConfig__commandConfigs.get(item)
-        return itemConf._CommandConfig__no
+        itemConf = self.get_item(scenario, item)
+        return itemConf.no if itemConf is not None else None
 
 
-    def get_command(self, scenario: str, item: str) -> CommandConfig:
+    def get_command(self, scenario: str, item: str) -> str:
         """コマンド情報取得
 
         指定されたシナリオ名とコマンド概要項目に関連するコマンド情報を、保持している実行コマンド設定情報から取得する
@@ -226,11 +506,10 @@ class SubLoadConfig:
             item(str): コマンド概要項目
 
         Returns:
-            CommandConfig: 指定されたコマンド概要項目に関連するコマンド情報
+            str: 指定されたコマンド概要項目に関連するコマンド情報 ない場合はNone
         """
-        scenarioConf = self.__subConfigs.get(scenario)
-        itemConf = scenarioConf._ScenarioConfig__commandConfigs.get(item)
-        return itemConf._CommandConfig__command
+        itemConf = self.get_item(scenario, item)
+        return itemConf.command if itemConf is not None else None
 
 
     # def get_ConnectConfig_by_nf_host(self, nf_host: str) -> ConnectConfig:
@@ -0,0 +1,44 @@
+"""シンボルテーブル
+
+設定情報の読み込みごとに、繰り返し出現する文字列を1つのオブジェクトにまとめる
+
+"""
+from typing import Dict, Any
+
+
+class SymbolTable:
+    """シンボルテーブル
+
+    ローダ（または接続設定情報テーブルの生成）ごとに生成し、同じ値の文字列を最初に出現したオブジェクトにまとめる（インターン）
+    "MM"、"any"、"TRUE_FALSE"、地域名などは数千回出現するため、まとめることで読み込み後のメモリが減り、
+    実行時の比較も同一オブジェクトの比較（文字列の内容を比較しない）となる
+    sys.internと異なり、ローダの再読み込みなどで不要になればテーブルごと破棄できる
+
+    """
+
+    def __init__(self):
+        """初期化
+        """
+        # 文字列から最初に出現した同じ値の文字列を引く辞書
+        self.__symbols: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        """シンボル数
+
+        Returns:
+            int: まとめた文字列の数
+        """
+        return len(self.__symbols)
+
+    def intern(self, value: Any) -> Any:
+        """インターン
+
+        Args:
+            value (Any): 値
+
+        Returns:
+            Any: 文字列の場合は同じ値で最初に出現したオブジェクト、文字列以外（数値、欠損値など）はそのまま
+        """
+        if type(value) is not str:
+            return value
+        return self.__symbols.setdefault(value, value)
@@ -0,0 +1,284 @@
+"""コマンド送信
+
+接続設定情報のSSH接続ホスト（remote_host）ごとにセッションを保持し、コマンドを非同期（asyncio）で送信する
+
+"""
+import abc
+import asyncio
+import time
+from collections import namedtuple
+from typing import Dict, Any, Tuple
+
+# コマンドの実行結果（SSH接続ホスト、コマンド実行対象ホスト、コマンド、出力、結果（OK/NG）、所要時間（秒））
+CommandResult = namedtuple('CommandResult', ['remote_host', 'nf', 'command', 'output', 'status', 'elapsed'])
+# 実行結果の結果
+STATUS_OK = 'OK'
+STATUS_NG = 'NG'
+# 行単位のコマンド送信の、コマンド実行対象ホストとコマンドの区切り
+FIELD_SEPARATOR = '\t'
+# 行単位のコマンド送信の文字コード
+ENCODING = 'utf-8'
+# コマンドの応答を待つ時間の既定値（秒）
+COMMAND_TIMEOUT = 60.0
+
+
+class Session(abc.ABC):
+    """セッション
+
+    1つのSSH接続ホストとの接続 コマンドは1つずつ送信する（同時に送信しない）
+    トランスポートごとに派生クラスでrun()を実装する（実装がない場合はインスタンスを生成できない）
+
+    """
+
+    @abc.abstractmethod
+    async def run(self, nf: str, command: str) -> CommandResult:
+        """コマンド実行
+
+        Args:
+            nf (str): コマンド実行対象ホスト名
+            command (str): コマンド
+
+        Returns:
+            CommandResult: 実行結果
+        """
+
+    async def close(self) -> None:
+        """切断
+        """
+
+
+class Transport(abc.ABC):
+    """トランスポート
+
+    SSH接続ホストへのセッションを開く方式 派生クラスでopen()を実装する（実装がない場合はインスタンスを生成できない）
+
+    """
+
+    @abc.abstractmethod
+    async def open(self, remote_host: str, ip: str) -> Session:
+        """セッション接続
+
+        Args:
+            remote_host (str): SSH接続ホスト名
+            ip (str): 接続先IP
+
+        Returns:
+            Session: 接続したセッション
+        """
+
+
+class StreamSession(Session):
+    """行単位のコマンド送信セッション
+
+    asyncioのストリームで、"コマンド実行対象ホスト<TAB>コマンド"の1行を送信し、
+    "結果 出力のバイト数"の1行と出力を受信する
+
+    """
+
+    def __init__(self, remote_host: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 command_timeout: float = COMMAND_TIMEOUT):
+        """初期化
+
+        Args:
+            remote_host (str): SSH接続ホスト名
+            reader (asyncio.StreamReader): 受信ストリーム
+            writer (asyncio.StreamWriter): 送信ストリーム
+            command_timeout (float): コマンドの応答（結果と出力）を待つ時間（秒） Noneの場合は待ち続ける
+        """
+        self.__remote_host: str = remote_host
+        self.__reader: asyncio.StreamReader = reader
+        self.__writer: asyncio.StreamWriter = writer
+        self.__command_timeout: float = command_timeout
+
+    async def run(self, nf: str, command: str) -> CommandResult:
+        """コマンド実行
+
+        Args:
+            nf (str): コマンド実行対象ホスト名
+            command (str): コマンド（改行は空白に置き換えて送信する）
+
+        Returns:
+            CommandResult: 実行結果
+
+        Raises:
+            ConnectionError: 応答の受信前に切断された場合に発生
+            asyncio.IncompleteReadError: 出力の受信中に切断された場合に発生
+            asyncio.TimeoutError: 応答を待つ時間を過ぎた場合に発生
+            ValueError: 応答の結果の行が不正な場合に発生
+        """
+        start = time.perf_counter()
+        line = f'{nf}{FIELD_SEPARATOR}{" ".join(command.splitlines())}\n'
+        self.__writer.write(line.encode(ENCODING))
+        await self.__writer.drain()
+        status, output = await asyncio.wait_for(self.__receive(), self.__command_timeout)
+        return CommandResult(self.__remote_host, nf, command, output, status, time.perf_counter() - start)
+
+    async def __receive(self) -> Tuple[str, str]:
+        """応答受信
+
+        Returns:
+            Tuple[str, str]: 結果と出力
+
+        Raises:
+            ConnectionError: 応答の受信前に切断された場合に発生
+            asyncio.IncompleteReadError: 出力の受信中に切断された場合に発生
+            ValueError: 応答の結果の行が不正な場合に発生
+        """
+        header = await self.__reader.readline()
+        if not header:
+            raise ConnectionError(f'session closed. remote_host:{self.__remote_host}')
+        fields = header.decode(ENCODING).split()
+        if len(fields) != 2 or not fields[1].isdigit():
+            raise ValueError(f'invalid response header. remote_host:{self.__remote_host} value:{header!r}')
+        status, size = fields
+        output = (await self.__reader.readexactly(int(size))).decode(ENCODING)
+        return status, output
+
+    async def close(self) -> None:
+        """切断
+        """
+        self.__writer.close()
+        try:
+            await self.__writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class StreamTransport(Transport):
+    """行単位のコマンド送信トランスポート
+
+    接続先IPの指定ポートにTCPで接続する（擬似NFサーバ、行単位のコマンド中継サーバ用）
+
+    """
+
+    def __init__(self, port: int, host: str = None, timeout: float = 10.0, command_timeout: float = COMMAND_TIMEOUT):
+        """初期化
+
+        Args:
+            port (int): 接続先ポート
+            host (str): 接続先 Noneの場合は接続設定情報の接続先IP
+            timeout (float): 接続のタイムアウト（秒）
+            command_timeout (float): コマンドの応答を待つ時間（秒） Noneの場合は待ち続ける
+        """
+        self.__port: int = port
+        self.__host: str = host
+        self.__timeout: float = timeout
+        self.__command_timeout: float = command_timeout
+
+    async def open(self, remote_host: str, ip: str) -> Session:
+        """セッション接続
+
+        Args:
+            remote_host (str): SSH接続ホスト名
+            ip (str): 接続先IP
+
+        Returns:
+            Session: 接続したセッション
+
+        Raises:
+            asyncio.TimeoutError: タイムアウトまでに接続できない場合に発生
+        """
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.__host or ip, self.__port), self.__timeout)
+        return StreamSession(remote_host, reader, writer, self.__command_timeout)
+
+
+class SessionPool:
+    """セッションプール
+
+    SSH接続ホストごとに1つのセッションを開き、そのホストへのコマンドはすべて同じセッションで送信する
+    同じSSH接続ホストへのコマンドは順に送信し、異なるSSH接続ホストへのコマンドは並行して送信する
+    セッションは最初のコマンドの送信時に開き、close()で切断する
+
+        async with SessionPool(transport) as pool:
+            result = await pool.run(row.remote_host, row.ip, row.nf, command)
+
+    """
+
+    def __init__(self, transport: Transport):
+        """初期化
+
+        Args:
+            transport (Transport): トランスポート
+        """
+        self.__transport: Transport = transport
+        # SSH接続ホストごとのセッションと、コマンド送信の排他ロック
+        self.__sessions: Dict[str, Session] = {}
+        self.__locks: Dict[str, asyncio.Lock] = {}
+        # 開いたセッション数（再利用の確認用）
+        self.__opened: int = 0
+
+    async def __aenter__(self) -> 'SessionPool':
+        """非同期コンテキスト開始
+
+        Returns:
+            SessionPool: 自身
+        """
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """非同期コンテキスト終了（全セッションを切断する）
+        """
+        await self.close()
+
+    @property
+    def opened(self) -> int:
+        """セッション接続数プロパティ
+
+        Returns:
+            int: これまでに開いたセッション数
+        """
+        return self.__opened
+
+    async def run(self, remote_host: str, ip: str, nf: str, command: str) -> CommandResult:
+        """コマンド実行
+
+        コマンドが正常に終了しなかった場合（例外、取り消しを含む）は、応答を読み残した可能性があるため、
+        セッションを破棄して切断し、次のコマンドで開き直す
+        結果がNGの場合も、接続先が入力待ちなど想定外の状態で残っている可能性があるため、同様にセッションを開き直す
+
+        Args:
+            remote_host (str): SSH接続ホスト名
+            ip (str): 接続先IP（セッションを開く場合に使用する）
+            nf (str): コマンド実行対象ホスト名
+            command (str): コマンド
+
+        Returns:
+            CommandResult: 実行結果
+
+        Raises:
+            ConnectionError, asyncio.IncompleteReadError: 送信中に切断された場合に発生
+            asyncio.TimeoutError: 応答を待つ時間を過ぎた場合に発生
+        """
+        lock = self.__locks.setdefault(remote_host, asyncio.Lock())
+        async with lock:
+            session = self.__sessions.get(remote_host)
+            if session is None:
+                session = self.__sessions[remote_host] = await self.__transport.open(remote_host, ip)
+                self.__opened += 1
+            try:
+                result = await session.run(nf, command)
+            except BaseException:
+                # 前のコマンドの出力を次のコマンドの出力として受信しないよう、読み残しのあるセッションは使用しない
+                await self.__discard(remote_host, session)
+                raise
+            if result.status != STATUS_OK:
+                await self.__discard(remote_host, session)
+            return result
+
+    async def __discard(self, remote_host: str, session: Session) -> None:
+        """セッション破棄
+
+        Args:
+            remote_host (str): SSH接続ホスト名
+            session (Session): 破棄して切断するセッション
+        """
+        if self.__sessions.get(remote_host) is session:
+            del self.__sessions[remote_host]
+        await asyncio.shield(session.close())
+
+    async def close(self) -> None:
+        """全セッション切断
+        """
+        sessions = list(self.__sessions.values())
+        self.__sessions.clear()
+        await asyncio.gather(*(session.close() for session in sessions))
@@ -0,0 +1,433 @@
+"""実行条件式
+
+実行条件項目（WHEN）の文字列を1回だけ解析して評価関数にし、同じ文字列の評価関数を共有する
+
+"""
+import re
+from typing import List, Dict, Any, Callable, Mapping, Tuple
+
+from MM_HostPattern import HostPattern, REGEX_SPECIAL_CHARS
+from MM_BoundedCache import BoundedCache
+from MM_Workbook import Workbook, TRUE_VALUES
+
+# 字句（文字列リテラル、数値、演算子、参照名）
+TOKEN_PATTERN = re.compile(r'\s*(?:(?P<string>"[^"]*")|(?P<number>[-+]?\d+(?:\.\d+)?(?![\w.]))|'
+                           r'(?P<operator>\|\||&&|==|!=|=~|!~|!|\(|\))|(?P<name>\w[\w.]*)|'
+                           r'\{\{\s*(?P<placeholder>\w[\w.]*)\s*\}\})')
+# 行頭の文字列接頭辞（Excelで"="や"'"で始まる行を文字列として入力した場合に残る「'」）
+TEXT_PREFIX_PATTERN = re.compile(r"^([ \t]*)'", re.M)
+# 条件なしとして扱う実行条件項目（空欄と同じく常に真）
+NO_CONDITION_TEXTS = frozenset({'-'})
+# 常に真となる実行条件項目
+TRUE_KEYWORDS = frozenset({'true', 'True', 'TRUE', 'any', 'ANY'})
+# 常に偽となる実行条件項目
+FALSE_KEYWORDS = frozenset({'false', 'False', 'FALSE'})
+# 比較演算子
+COMPARE_OPERATORS = frozenset({'==', '!=', '=~', '!~'})
+# 評価関数の型（参照名から値を引く辞書を受け取り、判定結果を返す）
+Evaluator = Callable[[Mapping[str, Any]], bool]
+# 保持する実行条件式数の上限（超えた場合は最後に使用された日時が古いものから破棄する）
+EXPRESSION_CACHE_MAX_ENTRIES = 1024
+
+# 生成済みの実行条件式（キーは実行条件項目）
+expressions: BoundedCache = BoundedCache(EXPRESSION_CACHE_MAX_ENTRIES)
+
+
+class WhenExpression:
+    """実行条件式
+
+    実行条件項目を字句に分け、再帰下降で解析して、評価関数（クロージャ）の木にする（evalは使用しない）
+    次の構文を扱う 演算子の優先順位は ! 、比較、&&、|| の順
+      ・true、any（常に真）、false（常に偽）、空欄、"-"（条件なし、常に真）
+      ・参照 == 値、参照 != 値（値が正規表現の特殊文字を含む文字列の場合は、全体が一致するかの正規表現照合）
+      ・参照 =~ "正規表現"、参照 !~ "正規表現"（常に正規表現照合）
+      ・条件 && 条件、条件 || 条件、!条件、(条件)
+      ・参照のみ（値がtrue、またはTRUE_VALUESの文字列の場合に真）
+    参照（1_CMD_SHOW.status、heisoku_mode_check.handover、{{heisoku_status}}など）は、評価時に渡す辞書から値を引く
+    {{変数名}}は変数名の参照として扱い、各行の先頭の「'」（Excelの文字列接頭辞）は無視する
+    参照名全体がキーにない場合は、最初の"."より前をキーとした値から、残りの名前の要素、属性を順に引く
+    || で並んだ同じ参照の == 比較（handover == "tam.*" || handover == "osc.*"）は、1つのホスト名パタンにまとめて照合する
+
+    """
+
+    def __init__(self, source: str):
+        """初期化
+
+        Args:
+            source (str): 実行条件項目（欠損値の場合は常に真）
+
+        Raises:
+            ValueError: 実行条件項目の構文が不正な場合に発生
+        """
+        self.__source: str = source
+        # 参照名（出現順、重複なし）
+        self.__references: Dict[str, None] = {}
+        if not isinstance(source, str) or Workbook.is_null(source) or source.strip() in NO_CONDITION_TEXTS or not source.strip():
+            self.__evaluator: Evaluator = WhenExpression.__constant(True)
+            return
+        self.__tokens: List[Tuple[str, Any]] = WhenExpression.__tokenize(source)
+        self.__position: int = 0
+        self.__evaluator = self.__parse_or()
+        if self.__position < len(self.__tokens):
+            raise ValueError(f'unexpected token in WHEN. value:{self.__tokens[self.__position][1]!r} source:{source!r}')
+        # 解析後は字句を保持しない
+        del self.__tokens
+        del self.__position
+
+    def compile(source: str) -> 'WhenExpression':
+        """実行条件式取得
+
+        同じ実行条件項目の実行条件式は、生成済みのものを返却する（シナリオ、ホストをまたいで共有し、EXPRESSION_CACHE_MAX_ENTRIES件まで保持する）
+
+        Args:
+            source (str): 実行条件項目
+
+        Returns:
+            WhenExpression: 実行条件式
+
+        Raises:
+            ValueError: 実行条件項目の構文が不正な場合に発生
+        """
+        key = source if isinstance(source, str) else None
+        expression = expressions.get(key)
+        if expression is None:
+            expression = expressions.setdefault(key, WhenExpression(source))
+        return expression
+
+    def clear_cache() -> None:
+        """実行条件式破棄
+
+        生成済みの実行条件式を破棄する（設定情報の再読み込み時に使用する）
+        """
+        expressions.clear()
+
+    @property
+    def source(self) -> str:
+        """実行条件項目プロパティ
+
+        Returns:
+            str: 解析した実行条件項目
+        """
+        return self.__source
+
+    @property
+    def references(self) -> Tuple[str, ...]:
+        """参照名プロパティ
+
+        Returns:
+            Tuple[str, ...]: 実行条件項目が参照する名前（出現順）
+        """
+        return tuple(self.__references)
+
+    def evaluate(self, values: Mapping[str, Any]) -> bool:
+        """評価
+
+        Args:
+            values (Mapping[str, Any]): 参照名（または参照名の最初の"."より前）から値を引く辞書
+
+        Returns:
+            bool: 実行条件を満たす場合true 満たさない場合false
+        """
+        return self.__evaluator(values)
+
+    def __call__(self, values: Mapping[str, Any]) -> bool:
+        """評価（evaluate()と同じ）
+
+        Args:
+            values (Mapping[str, Any]): 参照名から値を引く辞書
+
+        Returns:
+            bool: 実行条件を満たす場合true 満たさない場合false
+        """
+        return self.__evaluator(values)
+
+    def __tokenize(source: str) -> List[Tuple[str, Any]]:
+        """字句解析
+
+        Args:
+            source (str): 実行条件項目
+
+        Returns:
+            List[Tuple[str, Any]]: 字句の種類（string/number/operator/name）と値（{{変数名}}はnameの変数名）
+
+        Raises:
+            ValueError: 字句として解析できない文字がある場合に発生
+        """
+        tokens: List[Tuple[str, Any]] = []
+        position = 0
+        source = TEXT_PREFIX_PATTERN.sub(r'\1', source).rstrip()
+        while position < len(source):
+            match = TOKEN_PATTERN.match(source, position)
+            if match is None or match.end() == position:
+                raise ValueError(f'invalid character in WHEN. position:{position} source:{source!r}')
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == 'placeholder':
+                kind = 'name'
+            elif kind == 'string':
+                value = value[1:-1]
+            elif kind == 'number':
+                value = float(value) if '.' in value else int(value)
+            tokens.append((kind, value))
+            position = match.end()
+        return tokens
+
+    def __peek(self) -> Tuple[str, Any]:
+        """次の字句参照
+
+        Returns:
+            Tuple[str, Any]: 次の字句 末尾の場合は(None, None)
+        """
+        return self.__tokens[self.__position] if self.__position < len(self.__tokens) else (None, None)
+
+    def __take(self) -> Tuple[str, Any]:
+        """次の字句取得
+
+        Returns:
+            Tuple[str, Any]: 次の字句
+
+        Raises:
+            ValueError: 末尾の場合に発生
+        """
+        if self.__position >= len(self.__tokens):
+            raise ValueError(f'unexpected end of WHEN. source:{self.__source!r}')
+        token = self.__tokens[self.__position]
+        self.__position += 1
+        return token
+
+    def __parse_or(self) -> Evaluator:
+        """||の解析
+
+        同じ参照の == 比較の文字列は、1つのホスト名パタンにまとめる
+
+        Returns:
+            Evaluator: 評価関数
+        """
+        terms: List[Any] = [self.__parse_and()]
+        while self.__peek() == ('operator', '||'):
+            self.__take()
+            # 末尾の || （複数行で記載した場合の行末の||）は無視する
+            if self.__peek()[0] is None:
+                break
+            terms.append(self.__parse_and())
+        # 参照ごとの == 比較の文字列（記載順）と、それ以外の評価関数
+        alternatives: Dict[str, List[str]] = {}
+        evaluators: List[Evaluator] = []
+        for term in terms:
+            if isinstance(term, tuple):
+                alternatives.setdefault(term[0], []).append(term[1])
+            else:
+                evaluators.append(term)
+        for name, patterns in alternatives.items():
+            evaluators.append(self.__match(name, HostPattern(patterns), True)
+                              if len(patterns) > 1 else self.__compare(name, '==', patterns[0]))
+        if len(evaluators) == 1:
+            return evaluators[0]
+        evaluators = tuple(evaluators)
+        return lambda values: any(evaluator(values) for evaluator in evaluators)
+
+    def __parse_and(self) -> Any:
+        """&&の解析
+
+        Returns:
+            Any: 評価関数 == 比較が1つだけの場合は、||でまとめるため(参照名, 文字列)
+        """
+        terms: List[Any] = [self.__parse_unary()]
+        while self.__peek() == ('operator', '&&'):
+            self.__take()
+            terms.append(self.__parse_unary())
+        if len(terms) == 1:
+            return terms[0]
+        evaluators = tuple(self.__evaluator_of(term) for term in terms)
+        return lambda values: all(evaluator(values) for evaluator in evaluators)
+
+    def __parse_unary(self) -> Any:
+        """否定、括弧、比較の解析
+
+        Returns:
+            Any: 評価関数 参照 == 文字列の場合は(参照名, 文字列)
+
+        Raises:
+            ValueError: 構文が不正な場合に発生
+        """
+        kind, value = self.__take()
+        if (kind, value) == ('operator', '!'):
+            evaluator = self.__evaluator_of(self.__parse_unary())
+            return lambda values: not evaluator(values)
+        if (kind, value) == ('operator', '('):
+            evaluator = self.__parse_or()
+            if self.__take() != ('operator', ')'):
+                raise ValueError(f'missing ")" in WHEN. source:{self.__source!r}')
+            return evaluator
+        if kind == 'name' and value in TRUE_KEYWORDS:
+            return WhenExpression.__constant(True)
+        if kind == 'name' and value in FALSE_KEYWORDS:
+            return WhenExpression.__constant(False)
+        if kind != 'name':
+            raise ValueError(f'reference expected in WHEN. value:{value!r} source:{self.__source!r}')
+        self.__references.setdefault(value, None)
+        operator_kind, operator = self.__peek()
+        if operator_kind != 'operator' or operator not in COMPARE_OPERATORS:
+            return self.__truth(value)
+        self.__take()
+        operand_kind, operand = self.__take()
+        if operand_kind not in ('string', 'number'):
+            raise ValueError(f'literal expected in WHEN. value:{operand!r} source:{self.__source!r}')
+        if operator == '==' and operand_kind == 'string':
+            return (value, operand)
+        return self.__compare(value, operator, operand)
+
+    def __evaluator_of(self, term: Any) -> Evaluator:
+        """評価関数変換
+
+        Args:
+            term (Any): 評価関数、または(参照名, 文字列)
+
+        Returns:
+            Evaluator: 評価関数
+        """
+        return self.__compare(term[0], '==', term[1]) if isinstance(term, tuple) else term
+
+    def __compare(self, name: str, operator: str, operand: Any) -> Evaluator:
+        """比較の評価関数生成
+
+        Args:
+            name (str): 参照名
+            operator (str): 比較演算子（==、!=、=~、!~）
+            operand (Any): 比較する値（文字列または数値）
+
+        Returns:
+            Evaluator: 評価関数
+        """
+        if operator in ('=~', '!~') or (isinstance(operand, str) and REGEX_SPECIAL_CHARS.intersection(operand)):
+            return self.__match(name, HostPattern([str(operand)]), operator in ('==', '=~'))
+        reference = WhenExpression.__reference(name)
+        equal = operator == '=='
+        if isinstance(operand, str):
+            return lambda values: (WhenExpression.__text(reference(values)) == operand) == equal
+        return lambda values: (WhenExpression.__number(reference(values)) == operand) == equal
+
+    def __match(self, name: str, hostPattern: HostPattern, positive: bool) -> Evaluator:
+        """正規表現照合の評価関数生成
+
+        Args:
+            name (str): 参照名
+            hostPattern (HostPattern): 照合するパタン
+            positive (bool): 一致した場合に真とする場合true 一致しない場合に真とする場合false
+
+        Returns:
+            Evaluator: 評価関数（値がない場合は一致しないものとする）
+        """
+        reference = WhenExpression.__reference(name)
+
+        def match(values: Mapping[str, Any]) -> bool:
+            text = WhenExpression.__text(reference(values))
+            return (text is not None and hostPattern.matches(text)) == positive
+        return match
+
+    def __truth(self, name: str) -> Evaluator:
+        """真偽値の評価関数生成
+
+        Args:
+            name (str): 参照名
+
+        Returns:
+            Evaluator: 評価関数（値がtrue、またはTRUE_VALUESの文字列の場合に真）
+        """
+        reference = WhenExpression.__reference(name)
+
+        def truth(values: Mapping[str, Any]) -> bool:
+            value = reference(values)
+            return value in TRUE_VALUES if isinstance(value, str) else value is True
+        return truth
+
+    def __reference(name: str) -> Callable[[Mapping[str, Any]], Any]:
+        """参照関数生成
+
+        Args:
+            name (str): 参照名
+
+        Returns:
+            Callable[[Mapping[str, Any]], Any]: 辞書から参照名の値を引く関数（値がない場合はNone）
+        """
+        head, *parts = name.split('.')
+
+        def reference(values: Mapping[str, Any]) -> Any:
+            if name in values:
+                return values[name]
+            value = values.get(head)
+            for part in parts:
+                if value is None:
+                    return None
+                value = value.get(part) if isinstance(value, Mapping) else getattr(value, part, None)
+            return value
+        return reference
+
+    def __constant(result: bool) -> Evaluator:
+        """定数の評価関数生成
+
+        Args:
+            result (bool): 評価結果
+
+        Returns:
+            Evaluator: 常にresultを返す評価関数
+        """
+        return lambda values: result
+
+    def __text(value: Any) -> str:
+        """比較用文字列変換
+
+        Args:
+            value (Any): 参照した値
+
+        Returns:
+            str: 文字列 値がない場合（None、欠損値）はNone
+        """
+        if value is None or Workbook.is_null(value):
+            return None
+        return value if isinstance(value, str) else str(value)
+
+    def __number(value: Any) -> Any:
+        """比較用数値変換
+
+        Args:
+            value (Any): 参照した値
+
+        Returns:
+            Any: 数値 数値に変換できない場合はNone
+        """
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+
+if __name__ == '__main__':
+    import glob
+    import os
+    import sys
+    from MM_Workbook import ENGINE_XML
+
+    # 同梱のシナリオ設定情報ファイル（または引数で指定したファイル）のすべての実行条件項目を解析できることを確認する
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    config_file_names = sys.argv[1:] or sorted(glob.glob(os.path.join(base_dir, '*.xlsx')) + glob.glob(os.path.join(base_dir, 'old_xlsx', '*.xlsx'))
+                                               + glob.glob(os.path.join(base_dir, os.pardir, '*.xlsx')))
+    sources: Dict[str, str] = {}
+    for config_file_name in config_file_names:
+        workbook = Workbook.open(config_file_name, ENGINE_XML)
+        for sheet_name in workbook.sheet_names:
+            for row in workbook.rows(sheet_name):
+                source = getattr(row, 'WHEN', None)
+                if isinstance(source, str):
+                    sources.setdefault(source, f'{os.path.basename(config_file_name)} {sheet_name}')
+    errors = 0
+    for source, location in sources.items():
+        try:
+            WhenExpression(source)
+        except ValueError as error:
+            errors += 1
+            print(f'{location}: {error}')
+    print(f'{len(sources)} WHEN expressions in {len(config_file_names)} files, {errors} errors')
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,421 @@
+"""シナリオ設定情報ワークブック
+
+シナリオ設定情報エクセルファイルを一度だけ開き、MAIN/SUB/LISTの各ローダへシートを提供する
+シートの読み込みエンジンは、pandas（従来方式）、openpyxl（読み取り専用ストリーミング）、xml（xlsxのXML直接解析）から選択できる
+Excel以外の形式（CSV/TSVディレクトリ、JSON Lines、SQLite）は、ファイル形式から読み込みエンジンを決定する
+
+"""
+import os
+import sys
+import threading
+from collections import defaultdict
+from typing import List, Dict, Tuple, Any, Iterable, Sequence
+
+from MM_AsciiFilter import AsciiFilter
+from MM_XlsxReader import XlsxReader
+from MM_SheetFingerprint import SheetFingerprint
+from MM_ScenarioSource import ScenarioSource, SOURCE_ENGINES, ENGINE_CSV, ENGINE_JSONL, ENGINE_SQLITE
+
+
+# 読み込みエンジン pandas：pd.ExcelFile.parse + iterrows（従来方式）
+ENGINE_PANDAS = 'pandas'
+# 読み込みエンジン openpyxl：read_only + iter_rows(values_only=True)によるストリーミング
+ENGINE_OPENPYXL = 'openpyxl'
+# 読み込みエンジン xml：xlsxの共有文字列とシートのXMLパートを逐次解析（pandas、openpyxlを使用しない）
+ENGINE_XML = 'xml'
+# 選択可能な読み込みエンジン
+ENGINES = (ENGINE_PANDAS, ENGINE_OPENPYXL, ENGINE_XML) + SOURCE_ENGINES
+
+# 欠損値として扱う文字列（pandasのread_excel既定値と同じ）
+NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+# Excelのエラー値（pandasではNaNとして読み込まれる）
+ERROR_VALUES = frozenset({'#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A', '#GETTING_DATA'})
+# 真偽値として変換する文字列（pandasのread_excel既定値と同じ）
+TRUE_VALUES = frozenset({'True', 'TRUE', 'true'})
+FALSE_VALUES = frozenset({'False', 'FALSE', 'false'})
+# 欠損値
+NAN = float('nan')
+
+# 開いているワークブックセッション（キーはファイルの絶対パスと読み込みエンジン）
+workbooks: Dict[Tuple[str, str], 'Workbook'] = {}
+# ワークブックセッション辞書の排他ロック
+workbooks_lock = threading.Lock()
+
+
+class Workbook:
+    """ワークブックセッション
+
+    シナリオ設定情報ファイルを一度だけ開いてシート名を索引し、各ローダにシートの読み込みを提供する
+    同じファイルに対するMAIN/SUB/LISTの読み込みは、同一のセッションを共有する
+
+    """
+
+    def __init__(self, config_file_name: str, engine: str = ENGINE_PANDAS):
+        """初期化
+
+        引数で指定されたシナリオ設定情報ファイルを開き、インスタンス属性に保持する
+        Excel以外の形式の場合、読み込みエンジンはファイル形式から決定する（引数の読み込みエンジンは使用しない）
+
+        Args:
+            config_file_name (str): シナリオ設定情報ファイルパス（CSV/TSVの場合はディレクトリ）
+            engine (str): 読み込みエンジン pandas（従来方式）、openpyxl（ストリーミング）、xml（XML直接解析）
+
+        Raises:
+            ValueError: engineがpandas、openpyxl、xml、csv、jsonl、sqlite以外の場合に発生
+        """
+        engine = ScenarioSource.engine(config_file_name) or engine
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be {{'pandas'|'openpyxl'|'xml'|'csv'|'jsonl'|'sqlite'}}. value:{engine}")
+        self.__config_file_name: str = config_file_name
+        self.__engine: str = engine
+        # ファイルの更新日時とサイズ（再オープン要否の判定に使用）
+        self.__file_stat: Tuple[int, int] = Workbook.__stat(config_file_name)
+        # シートのフィンガープリント（最初に参照された時に一度だけ求め、MAIN/SUB/LISTの各ローダで共有する）
+        self.__fingerprint: SheetFingerprint = None
+        self.__fingerprint_lock = threading.Lock()
+        # 設定ファイル読み込み（zip展開と共有文字列の解析はここで一度だけ行う）
+        if engine == ENGINE_PANDAS:
+            import pandas as pd
+            self.__config_file = pd.ExcelFile(config_file_name, engine='openpyxl')
+            # 設定ファイルのシート名読み込み（返却値はList型）
+            self.__sheet_names: List[str] = list(self.__config_file.sheet_names)
+        elif engine == ENGINE_XML:
+            self.__config_file = XlsxReader(config_file_name)
+            # 設定ファイルのシート名読み込み（返却値はList型）
+            self.__sheet_names: List[str] = self.__config_file.sheet_names
+        elif engine in SOURCE_ENGINES:
+            self.__config_file = ScenarioSource.open(config_file_name, engine)
+            # 設定ファイルのシート名読み込み（返却値はList型）
+            self.__sheet_names: List[str] = self.__config_file.sheet_names
+        else:
+            import openpyxl
+            self.__config_file = openpyxl.load_workbook(config_file_name, read_only=True, data_only=True, keep_links=False)
+            # 設定ファイルのシート名読み込み（返却値はList型）
+            self.__sheet_names: List[str] = list(self.__config_file.sheetnames)
+
+    @property
+    def config_file_name(self) -> str:
+        """シナリオ設定情報ファイルパスプロパティ
+
+        インスタンス属性のシナリオ設定情報ファイルパスを取得する
+
+        Returns:
+            str: シナリオ設定情報ファイルパス
+        """
+        return self.__config_file_name
+
+    @property
+    def engine(self) -> str:
+        """読み込みエンジンプロパティ
+
+        インスタンス属性の読み込みエンジンを取得する
+
+        Returns:
+            str: 読み込みエンジン
+        """
+        return self.__engine
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """シート名プロパティ
+
+        インスタンス属性のシート名リストを取得する
+
+        Returns:
+            List[str]: シート名リスト（ファイル内の並び順）
+        """
+        return self.__sheet_names
+
+    @property
+    def fingerprint(self) -> SheetFingerprint:
+        """シートフィンガープリントプロパティ
+
+        シナリオ設定情報ファイルのシートのフィンガープリントを取得する
+        最初に参照された時にファイルから求め、以降は同じフィンガープリントを返却する
+
+        Returns:
+            SheetFingerprint: シートのフィンガープリント
+        """
+        if self.__fingerprint is None:
+            with self.__fingerprint_lock:
+                if self.__fingerprint is None:
+                    self.__fingerprint = SheetFingerprint(self.__config_file_name)
+        return self.__fingerprint
+
+    def parse(self, sheet_name: str):
+        """シート読み込み
+
+        開いているシナリオ設定情報ファイルから指定されたシートをDataFrameとして読み込む（pandasエンジンのみ）
+
+        Args:
+            sheet_name (str): シート名
+
+        Returns:
+            pd.DataFrame: 読み込んだシート
+        """
+        return self.__config_file.parse(sheet_name)
+
+    def rows(self, sheet_name: str) -> List[tuple]:
+        """シート行読み込み
+
+        指定されたシートの2行目以降を、1行目の列名を属性名とする行タプルのリストとして返却する
+        文字列のセルはASCIIコードのみとし、空のセルはNaNとする
+        列名が属性名として使えない場合、属性名は「_列番号」となる
+
+        Args:
+            sheet_name (str): シート名
+
+        Returns:
+            List[tuple]: 行タプル（namedtuple）のリスト
+        """
+        if self.__engine == ENGINE_PANDAS:
+            return AsciiFilter.rows(self.__config_file.parse(sheet_name))
+        if self.__engine == ENGINE_XML or self.__engine in SOURCE_ENGINES:
+            return Workbook.frame_rows(self.__config_file.rows(sheet_name))
+        # 読み取り専用シートはシートのdimension情報が誤っている場合があるため再計算させる
+        sheet = self.__config_file[sheet_name]
+        sheet.reset_dimensions()
+        return Workbook.frame_rows(sheet.iter_rows(values_only=True))
+
+    def is_modified(self) -> bool:
+        """更新判定
+
+        セッションを開いた後にシナリオ設定情報ファイルが更新されたかどうかを判定する
+
+        Returns:
+            bool: 更新されている場合true 更新されていない場合false
+        """
+        return Workbook.__stat(self.__config_file_name) != self.__file_stat
+
+    def close(self) -> None:
+        """クローズ
+
+        開いているシナリオ設定情報ファイルを閉じる
+        """
+        self.__config_file.close()
+
+    def open(config_file_name: str, engine: str = ENGINE_PANDAS) -> 'Workbook':
+        """ワークブックセッション取得
+
+        指定されたシナリオ設定情報ファイルのセッションを返却する
+        既に開いているセッションがあり、ファイルが更新されていない場合はそのセッションを返却する
+        Excel以外の形式の場合、読み込みエンジンはファイル形式から決定する
+
+        Args:
+            config_file_name (str): シナリオ設定情報ファイルパス（CSV/TSVの場合はディレクトリ）
+            engine (str): 読み込みエンジン pandas（従来方式）、openpyxl（ストリーミング）、xml（XML直接解析）
+
+        Returns:
+            Workbook: ワークブックセッション
+        """
+        engine = ScenarioSource.engine(config_file_name) or engine
+        key = (os.path.abspath(config_file_name), engine)
+        with workbooks_lock:
+            workbook = workbooks.get(key)
+            # 未オープン、またはファイルが更新されている場合は開き直す
+            if workbook is None or workbook.is_modified():
+                if workbook is not None:
+                    workbook.close()
+                workbook = Workbook(config_file_name, engine)
+                workbooks[key] = workbook
+            return workbook
+
+    def detach_all() -> None:
+        """ワークブックセッション破棄（子プロセス用）
+
+        fork で引き継いだワークブックセッションを、閉じずに破棄する
+        引き継いだファイルは親プロセスと共有しているため、子プロセスでは使用せず開き直させる
+        """
+        global workbooks_lock
+        # 親プロセスの他スレッドが保持したまま引き継いだ可能性があるため、ロックも作り直す
+        workbooks_lock = threading.Lock()
+        workbooks.clear()
+
+    def is_null(value: Any) -> bool:
+        """欠損値判定
+
+        行タプルの値が欠損値かどうかを、pd.isnullと同じ規則で判定する
+        pandasを読み込んでいない場合、値はNoneかNaNのいずれかであるため、pandasは読み込まない
+
+        Args:
+            value (Any): 行タプルの値
+
+        Returns:
+            bool: 欠損値の場合true 欠損値でない場合false
+        """
+        if value is None:
+            return True
+        value_type = type(value)
+        if value_type == float:
+            return value != value
+        if value_type == str or value_type == int or value_type == bool:
+            return False
+        # pandasエンジンで読み込んだ値（NaT、pd.NA、numpyの数値など）はpandasで判定する
+        pandas = sys.modules.get('pandas')
+        return pandas is not None and bool(pandas.isnull(value))
+
+    def frame_rows(raw_rows: Iterable[Sequence[Any]]) -> List[tuple]:
+        """行タプル生成
+
+        シートのセル値の並びから、pd.ExcelFile.parseと同じ規則で列名と値を決定し、行タプルのリストを返却する
+        ・末尾の空セル、空行を除去し、1行目を列名とする（空の列名は「Unnamed: 列番号」、重複は「列名.連番」）
+        ・空文字列と欠損値文字列はNaNとし、整数値の実数は整数とする
+        ・列内の値がすべて数値の場合は数値に揃える（欠損値を含む場合は実数）
+        ・文字列のセルはASCIIコードのみとする
+
+        Args:
+            raw_rows (Iterable[Sequence[Any]]): シートのセル値の並び（1行目は列名）
+
+        Returns:
+            List[tuple]: 行タプル（namedtuple）のリスト
+        """
+        data: List[List[Any]] = []
+        last_row_with_data = -1
+        for row_number, raw_row in enumerate(raw_rows):
+            converted_row = [Workbook.__convert_cell(value) for value in raw_row]
+            # 末尾の空セルを除去
+            while converted_row and converted_row[-1] == '':
+                converted_row.pop()
+            if converted_row:
+                last_row_with_data = row_number
+            data.append(converted_row)
+        # 末尾の空行を除去
+        data = data[:last_row_with_data + 1]
+        if not data:
+            return []
+        # 各行を最大列数まで空セルで埋める
+        width = max(len(data_row) for data_row in data)
+        for data_row in data:
+            data_row.extend([''] * (width - len(data_row)))
+        row_type = AsciiFilter.row_type(Workbook.dedup_columns(data[0]))
+        if len(data) == 1:
+            return []
+        # 列単位で型を揃え、行タプルに組み直す
+        columns = [Workbook.__infer_column(column) for column in zip(*data[1:])]
+        data.clear()
+        return list(map(row_type._make, zip(*columns)))
+
+    def __convert_cell(value: Any) -> Any:
+        """セル値変換
+
+        Args:
+            value (Any): openpyxl、またはxlsxリーダで読み込んだセル値
+
+        Returns:
+            Any: pandasと同じ規則で変換したセル値（空セルは空文字列）
+        """
+        if value is None:
+            return ''
+        value_type = type(value)
+        if value_type == float:
+            if value.is_integer():
+                return int(value)
+        elif value_type == str and value in ERROR_VALUES:
+            return NAN
+        return value
+
+    def dedup_columns(header: List[Any]) -> List[Any]:
+        """列名決定
+
+        1行目のセル値から、pd.ExcelFile.parseと同じ規則で列名を決定する
+
+        Args:
+            header (List[Any]): 1行目のセル値
+
+        Returns:
+            List[Any]: 列名リスト（空の列名は「Unnamed: 列番号」、重複は「列名.連番」）
+        """
+        columns = [f'Unnamed: {i}' if column == '' else column for i, column in enumerate(header)]
+        counts: Dict[Any, int] = defaultdict(int)
+        for i, column in enumerate(columns):
+            org_column = column
+            cur_count = counts[column]
+            while cur_count > 0:
+                counts[org_column] = cur_count + 1
+                column = f'{org_column}.{cur_count}'
+                if column in columns:
+                    cur_count += 1
+                else:
+                    cur_count = counts[column]
+            columns[i] = column
+            counts[column] = cur_count + 1
+        return columns
+
+    def __infer_column(column: Sequence[Any]) -> List[Any]:
+        """列値変換
+
+        Args:
+            column (Sequence[Any]): 列のセル値
+
+        Returns:
+            List[Any]: pandasと同じ規則で型を揃えた列の値（文字列はASCIIコードのみ）
+        """
+        values = [NAN if type(value) == str and value in NA_VALUES else value for value in column]
+        numbers = Workbook.__to_numbers(values)
+        if numbers is not None:
+            return numbers
+        # 先頭が数値でなく、欠損値以外がすべて真偽値として解釈できる場合は真偽値に揃える
+        if type(values[0]) not in (int, bool) and all(
+                type(value) == bool or value in TRUE_VALUES or value in FALSE_VALUES or value != value for value in values):
+            return [value in TRUE_VALUES if type(value) == str else value for value in values]
+        return AsciiFilter.filter_column(values)
+
+    def __to_numbers(values: List[Any]) -> List[Any]:
+        """数値列変換
+
+        Args:
+            values (List[Any]): 欠損値をNaNとした列の値
+
+        Returns:
+            List[Any]: 列の値がすべて数値（真偽値を含む）として解釈できる場合は数値の列（欠損値または実数を含む場合は実数に揃える）
+                       数値として解釈できない値を含む場合はNone
+        """
+        numbers: List[Any] = []
+        is_float = False
+        is_bool = True
+        for value in values:
+            value_type = type(value)
+            if value_type == bool:
+                numbers.append(value)
+                continue
+            is_bool = False
+            if value_type == int:
+                numbers.append(value)
+            elif value_type == float:
+                numbers.append(value)
+                is_float = True
+            elif value_type == str:
+                try:
+                    number = int(value)
+                except ValueError:
+                    try:
+                        number = float(value)
+                    except ValueError:
+                        return None
+                    is_float = True
+                numbers.append(number)
+            else:
+                return None
+        # すべて真偽値の場合は真偽値のまま（欠損値を含む場合は実数となる）
+        if is_bool and numbers:
+            return numbers
+        if is_float:
+            return [float(number) for number in numbers]
+        return [int(number) for number in numbers]
+
+    def __stat(config_file_name: str) -> Tuple[int, int]:
+        """ファイル状態取得
+
+        Args:
+            config_file_name (str): シナリオ設定情報ファイルパス（CSV/TSVの場合はディレクトリ）
+
+        Returns:
+            Tuple[int, int]: 更新日時（ナノ秒）とファイルサイズ ディレクトリの場合は格納されたファイルの組のタプル
+        """
+        if os.path.isdir(config_file_name):
+            return tuple((file_name, Workbook.__stat(file_name)) for file_name in ScenarioSource.files(config_file_name))
+        stat = os.stat(config_file_name)
+        return (stat.st_mtime_ns, stat.st_size)
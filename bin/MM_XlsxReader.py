@@ -0,0 +1,386 @@
+"""xlsxリーダ
+
+シナリオ設定情報ファイル（xlsx）のzipから共有文字列とシートのXMLパートを逐次解析し、シートのセル値を行ごとに提供する
+pandasとopenpyxlを使用せず、標準ライブラリのみで読み込む
+
+"""
+import re
+import datetime
+import posixpath
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import List, Dict, Tuple, Any, Iterator, Optional
+
+
+# 名前空間（SpreadsheetMLとリレーションシップ）
+NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+NS_DOC_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+# 解析対象の要素名
+TAG_ROW = f'{{{NS_MAIN}}}row'
+TAG_CELL = f'{{{NS_MAIN}}}c'
+TAG_VALUE = f'{{{NS_MAIN}}}v'
+TAG_TEXT = f'{{{NS_MAIN}}}t'
+TAG_RUN_TEXT = f'{{{NS_MAIN}}}r/{{{NS_MAIN}}}t'
+TAG_INLINE_STRING = f'{{{NS_MAIN}}}is'
+TAG_SHARED_STRING = f'{{{NS_MAIN}}}si'
+TAG_SHEET_DATA = f'{{{NS_MAIN}}}sheetData'
+# セル参照の列部分（A1形式）のパタン
+COLUMN_PATTERN = re.compile(r'[A-Z]+')
+# 日付の組み込み表示形式ID（openpyxlの組み込み表示形式のうち日付・時刻となるもの）
+BUILTIN_DATE_FORMAT_IDS = frozenset({14, 15, 16, 17, 18, 19, 20, 21, 22, 45, 46, 47})
+# 経過時間の組み込み表示形式ID
+BUILTIN_TIMEDELTA_FORMAT_IDS = frozenset({46})
+# 表示形式の判定で無視する部分（引用符で囲まれた文字列と、時・分・秒以外の角括弧）のパタン
+FORMAT_STRIP_PATTERN = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+# 日付・時刻の表示形式のパタン
+DATE_FORMAT_PATTERN = re.compile(r'(?<![_\\])[dmhysDMHYS]')
+# 経過時間の表示形式のパタン
+TIMEDELTA_FORMAT_PATTERN = re.compile(r'\[hh?\](:mm(:ss(\.0*)?)?)?|\[mm?\](:ss(\.0*)?)?|\[ss?\](\.0*)?', re.I)
+# 日付シリアル値の基準日（1900年基準と1904年基準）
+WINDOWS_EPOCH = datetime.datetime(1899, 12, 30)
+MAC_EPOCH = datetime.datetime(1904, 1, 1)
+# 欠損値（エラー値のセル）
+NAN = float('nan')
+
+
+class XlsxReader:
+    """xlsxリーダ
+
+    シナリオ設定情報ファイルのzipを開いてシート名とXMLパートを索引し、シートのセル値を行タプルとして逐次返却する
+    各行の値はopenpyxlの読み取り専用シートのiter_rows(values_only=True)と同じとなる（エラー値のセルはNaN）
+    共有文字列と書式情報は、最初にシートを読み込むときに一度だけ解析する
+
+    """
+
+    def __init__(self, config_file_name: str):
+        """初期化
+
+        引数で指定されたシナリオ設定情報ファイルを開き、シート名とXMLパートを索引する
+
+        Args:
+            config_file_name (str): シナリオ設定情報ファイルパス
+        """
+        self.__book: zipfile.ZipFile = zipfile.ZipFile(config_file_name)
+        workbook_part, sheet_parts, self.__part_names = XlsxReader.parts(self.__book)
+        # シート名とXMLパート名（ファイル内の並び順）
+        self.__sheet_parts: Dict[str, str] = dict(sheet_parts)
+        # 1904年基準の場合は日付シリアル値の基準日が変わる
+        self.__epoch: datetime.datetime = XlsxReader.__epoch(self.__book, workbook_part)
+        # 共有文字列と日付・経過時間の書式番号（最初のシート読み込み時に解析する）
+        self.__shared_strings: List[str] = None
+        self.__date_styles: frozenset = None
+        self.__timedelta_styles: frozenset = None
+        self.__lock = threading.Lock()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """シート名プロパティ
+
+        Returns:
+            List[str]: シート名リスト（ファイル内の並び順）
+        """
+        return list(self.__sheet_parts)
+
+    def rows(self, sheet_name: str) -> Iterator[tuple]:
+        """シート行読み込み
+
+        指定されたシートのXMLパートを逐次解析し、1行目から順にセル値のタプルを返却する
+        空のセルはNone、XMLに存在しない行は空のタプルとし、各行のタプルは値のある最後のセルまでとなる
+
+        Args:
+            sheet_name (str): シート名
+
+        Returns:
+            Iterator[tuple]: 行ごとのセル値のタプル
+
+        Raises:
+            KeyError: 指定されたシートがない場合に発生
+        """
+        sheet_part = self.__sheet_parts[sheet_name]
+        self.__load_shared_parts()
+        shared_strings = self.__shared_strings
+        date_styles = self.__date_styles
+        timedelta_styles = self.__timedelta_styles
+        epoch = self.__epoch
+        row_counter = 0
+        with self.__book.open(sheet_part) as source:
+            sheet_data = None
+            for event, element in ET.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == TAG_SHEET_DATA:
+                        sheet_data = element
+                    continue
+                if element.tag != TAG_ROW:
+                    continue
+                row_number = element.get('r')
+                row_number = int(float(row_number)) if row_number else row_counter + 1
+                # XMLに存在しない行は空の行とする
+                for _ in range(row_counter + 1, row_number):
+                    yield ()
+                row_counter = row_number
+                cells: Dict[int, Any] = {}
+                column = 0
+                for cell in element.iter(TAG_CELL):
+                    reference = cell.get('r')
+                    column = XlsxReader.__column_index(reference) if reference else column + 1
+                    cells[column] = XlsxReader.__cell_value(cell, shared_strings, date_styles, timedelta_styles, epoch)
+                if cells:
+                    values = [None] * column
+                    for index, value in cells.items():
+                        if index <= column:
+                            values[index - 1] = value
+                    yield tuple(values)
+                else:
+                    yield ()
+                # 解析済みの行は保持しない
+                element.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+    def close(self) -> None:
+        """クローズ
+
+        開いているシナリオ設定情報ファイルを閉じる
+        """
+        self.__book.close()
+
+    def parts(book: zipfile.ZipFile) -> Tuple[str, List[Tuple[str, str]], Dict[str, str]]:
+        """パート名取得
+
+        ワークブックのリレーションシップから、ワークシートと共有文字列、書式情報のパート名を求める
+
+        Args:
+            book (zipfile.ZipFile): シナリオ設定情報ファイル
+
+        Returns:
+            Tuple[str, List[Tuple[str, str]], Dict[str, str]]: ワークブックパート名、シート名とXMLパート名の組のリスト（ファイル内の並び順）、
+                                                              共有文字列（sharedStrings）と書式情報（styles）のパート名（ない場合はキーなし）
+        """
+        workbook_part = 'xl/workbook.xml'
+        for relation in XlsxReader.relations(book, '_rels/.rels'):
+            if relation[1].endswith('/officeDocument'):
+                workbook_part = relation[2]
+        base_dir = posixpath.dirname(workbook_part)
+        rels_part = posixpath.join(base_dir, '_rels', posixpath.basename(workbook_part) + '.rels')
+        targets: Dict[str, str] = {}
+        part_names: Dict[str, str] = {}
+        for relation_id, relation_type, target in XlsxReader.relations(book, rels_part, base_dir):
+            targets[relation_id] = target
+            for part_type in ('sharedStrings', 'styles'):
+                if relation_type.endswith('/' + part_type):
+                    part_names[part_type] = target
+        sheet_parts: List[Tuple[str, str]] = []
+        for sheet in ET.fromstring(book.read(workbook_part)).iter(f'{{{NS_MAIN}}}sheet'):
+            target = targets.get(sheet.get(f'{{{NS_DOC_REL}}}id'))
+            # グラフシートなどワークシート以外のパートは対象外とする
+            if target is not None and target in book.NameToInfo:
+                sheet_parts.append((sheet.get('name'), target))
+        return workbook_part, sheet_parts, part_names
+
+    def relations(book: zipfile.ZipFile, rels_part: str, base_dir: str = '') -> List[Tuple[str, str, str]]:
+        """リレーションシップ取得
+
+        Args:
+            book (zipfile.ZipFile): シナリオ設定情報ファイル
+            rels_part (str): リレーションシップパート名
+            base_dir (str): 相対パスの基準ディレクトリ
+
+        Returns:
+            List[Tuple[str, str, str]]: リレーションシップのID、種類、参照先パート名の組のリスト
+        """
+        if rels_part not in book.NameToInfo:
+            return []
+        relations: List[Tuple[str, str, str]] = []
+        for relation in ET.fromstring(book.read(rels_part)).iter(f'{{{NS_PKG_REL}}}Relationship'):
+            target = relation.get('Target', '')
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(base_dir, target))
+            relations.append((relation.get('Id'), relation.get('Type', ''), target))
+        return relations
+
+    def __load_shared_parts(self) -> None:
+        """共有パート読み込み
+
+        共有文字列と書式情報を、未解析の場合のみ解析してインスタンス属性に保持する
+        """
+        if self.__shared_strings is not None:
+            return
+        with self.__lock:
+            if self.__shared_strings is not None:
+                return
+            self.__date_styles, self.__timedelta_styles = XlsxReader.__date_styles(self.__book, self.__part_names.get('styles'))
+            self.__shared_strings = XlsxReader.__read_shared_strings(self.__book, self.__part_names.get('sharedStrings'))
+
+    def __read_shared_strings(book: zipfile.ZipFile, shared_strings_part: Optional[str]) -> List[str]:
+        """共有文字列読み込み
+
+        Args:
+            book (zipfile.ZipFile): シナリオ設定情報ファイル
+            shared_strings_part (Optional[str]): 共有文字列パート名
+
+        Returns:
+            List[str]: 共有文字列のリスト（書式とふりがなは除く）
+        """
+        if shared_strings_part is None or shared_strings_part not in book.NameToInfo:
+            return []
+        shared_strings: List[str] = []
+        with book.open(shared_strings_part) as source:
+            for _, element in ET.iterparse(source):
+                if element.tag == TAG_SHARED_STRING:
+                    shared_strings.append(XlsxReader.__text(element).replace('x005F_', ''))
+                    element.clear()
+        return shared_strings
+
+    def __date_styles(book: zipfile.ZipFile, styles_part: Optional[str]) -> Tuple[frozenset, frozenset]:
+        """日付書式番号取得
+
+        Args:
+            book (zipfile.ZipFile): シナリオ設定情報ファイル
+            styles_part (Optional[str]): 書式情報パート名
+
+        Returns:
+            Tuple[frozenset, frozenset]: 表示形式が日付・時刻となるセル書式番号、経過時間となるセル書式番号
+        """
+        if styles_part is None or styles_part not in book.NameToInfo:
+            return frozenset(), frozenset()
+        styles = ET.fromstring(book.read(styles_part))
+        custom_formats: Dict[int, str] = {int(number_format.get('numFmtId')): number_format.get('formatCode', '')
+                                          for number_format in styles.iter(f'{{{NS_MAIN}}}numFmt')}
+        date_styles = set()
+        timedelta_styles = set()
+        cell_formats = styles.find(f'{{{NS_MAIN}}}cellXfs')
+        if cell_formats is None:
+            return frozenset(), frozenset()
+        for style_id, cell_format in enumerate(cell_formats.iter(f'{{{NS_MAIN}}}xf')):
+            format_id = int(cell_format.get('numFmtId', 0))
+            if format_id in custom_formats:
+                format_code = custom_formats[format_id].split(';')[0]
+                if DATE_FORMAT_PATTERN.search(FORMAT_STRIP_PATTERN.sub('', format_code)):
+                    date_styles.add(style_id)
+                if TIMEDELTA_FORMAT_PATTERN.search(format_code):
+                    timedelta_styles.add(style_id)
+            else:
+                if format_id in BUILTIN_DATE_FORMAT_IDS:
+                    date_styles.add(style_id)
+                if format_id in BUILTIN_TIMEDELTA_FORMAT_IDS:
+                    timedelta_styles.add(style_id)
+        return frozenset(date_styles), frozenset(timedelta_styles)
+
+    def __epoch(book: zipfile.ZipFile, workbook_part: str) -> datetime.datetime:
+        """日付基準日取得
+
+        Args:
+            book (zipfile.ZipFile): シナリオ設定情報ファイル
+            workbook_part (str): ワークブックパート名
+
+        Returns:
+            datetime.datetime: 日付シリアル値の基準日
+        """
+        workbook_properties = ET.fromstring(book.read(workbook_part)).find(f'{{{NS_MAIN}}}workbookPr')
+        if workbook_properties is not None and workbook_properties.get('date1904', '').lower() in ('1', 'true'):
+            return MAC_EPOCH
+        return WINDOWS_EPOCH
+
+    def __cell_value(cell: ET.Element, shared_strings: List[str], date_styles: frozenset,
+                     timedelta_styles: frozenset, epoch: datetime.datetime) -> Any:
+        """セル値変換
+
+        Args:
+            cell (ET.Element): セル（<c>要素）
+            shared_strings (List[str]): 共有文字列
+            date_styles (frozenset): 表示形式が日付・時刻となるセル書式番号
+            timedelta_styles (frozenset): 表示形式が経過時間となるセル書式番号
+            epoch (datetime.datetime): 日付シリアル値の基準日
+
+        Returns:
+            Any: openpyxlと同じ規則で変換したセル値（空のセルはNone、エラー値はNaN）
+        """
+        data_type = cell.get('t', 'n')
+        if data_type == 'inlineStr':
+            inline_string = cell.find(TAG_INLINE_STRING)
+            return XlsxReader.__text(inline_string) if inline_string is not None else None
+        value = cell.findtext(TAG_VALUE) or None
+        if value is None:
+            return None
+        if data_type == 'n':
+            number = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+            style_id = int(cell.get('s') or 0)
+            if style_id in date_styles:
+                try:
+                    return XlsxReader.__from_excel(number, epoch, style_id in timedelta_styles)
+                except (OverflowError, ValueError):
+                    # 日付として扱えないシリアル値はエラー値とする
+                    return NAN
+            return number
+        if data_type == 's':
+            return shared_strings[int(value)]
+        if data_type == 'b':
+            return bool(int(value))
+        if data_type == 'e':
+            return NAN
+        if data_type == 'd':
+            return datetime.datetime.fromisoformat(value.rstrip('Z'))
+        return value
+
+    def __from_excel(value: float, epoch: datetime.datetime, timedelta: bool) -> Any:
+        """日付シリアル値変換
+
+        Args:
+            value (float): 日付シリアル値
+            epoch (datetime.datetime): 日付シリアル値の基準日
+            timedelta (bool): 経過時間として変換する場合true
+
+        Returns:
+            Any: 日時（datetime）、時刻（time）、または経過時間（timedelta）
+        """
+        if timedelta:
+            delta = datetime.timedelta(days=value)
+            if delta.microseconds:
+                # ミリ秒単位に丸める
+                delta = datetime.timedelta(seconds=delta.total_seconds() // 1, microseconds=round(delta.microseconds, -3))
+            return delta
+        day, fraction = divmod(value, 1)
+        diff = datetime.timedelta(milliseconds=round(fraction * 86400 * 1000))
+        if 0 <= value < 1 and diff.days == 0:
+            minutes, seconds = divmod(diff.seconds, 60)
+            hours, minutes = divmod(minutes, 60)
+            return datetime.time(hours, minutes, seconds, diff.microseconds)
+        # 1900年基準は1900/2/29が存在するものとして数えるため、それより前の日付を補正する
+        if 0 < value < 60 and epoch == WINDOWS_EPOCH:
+            day += 1
+        return epoch + datetime.timedelta(days=day) + diff
+
+    def __text(element: ET.Element) -> str:
+        """文字列取得
+
+        Args:
+            element (ET.Element): 文字列要素（<si>要素または<is>要素）
+
+        Returns:
+            str: 書式なしの文字列と書式付きの各部分を連結した文字列（ふりがなは除く）
+        """
+        snippets: List[str] = []
+        plain = element.find(TAG_TEXT)
+        if plain is not None:
+            snippets.append(plain.text or '')
+        for run in element.iterfind(TAG_RUN_TEXT):
+            snippets.append(run.text or '')
+        return ''.join(snippets)
+
+    def __column_index(reference: str) -> int:
+        """列番号取得
+
+        Args:
+            reference (str): セル参照（A1形式）
+
+        Returns:
+            int: 列番号（1始まり）
+        """
+        index = 0
+        for letter in COLUMN_PATTERN.match(reference).group():
+            index = index * 26 + ord(letter) - 64
+        return index
@@ -1,43 +1,34 @@
-import re
-import pandas as pd
-import pandas.core.series
-import openpyxl
 from typing import List, Dict, Any
 
-key_list = []
-value_list = []
+# 列情報（get_key_list()、get_row_mainkey()など）の参照先とする既定のメイン設定情報（bind_configで指定する）
+# 列情報は既定のメイン設定情報のget_key_list()などを呼び出すだけのため、複数のメイン設定情報の列情報は各インスタンスから直接参照する
+default_config = None
 
 class MainRow:
 
     def __init__(self, mainrowInfo):
-        global key_list
-        global value_list
         self.mainrowKey = mainrowInfo.key
-        MainRow.append_key(self.mainrowKey)
-
         self.mainrowValue = mainrowInfo.value
-        MainRow.append_value(self.mainrowValue)
 
 
-    def append_key(key):
-        key_list.append(key)
-    
+    def bind_config(config):
+        # 読み込み、キャッシュからの復元では切り替わらないため、参照先は明示的に指定したメイン設定情報となる
+        # （MM_Dao.load()は読み込んだメイン設定情報を指定する）
+        global default_config
+        default_config = config
+
+
     def get_key_list():
-        return key_list
+        return default_config.get_key_list() if default_config is not None else []
     
     def get_row_mainkey(row):
-        row_mainKey = key_list[row]
+        row_mainKey = MainRow.get_key_list()[row]
         return row_mainKey
 
 
-    def append_value(value):
-        value_list.append(value)
-    
     def get_value_list():
-        global value_list
-        return value_list
+        return default_config.get_value_list() if default_config is not None else []
 
     def get_row_mainvalue(row):
-        row_mainValue = value_list[row]
+        row_mainValue = MainRow.get_value_list()[row]
         return row_mainValue
-    
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""MM_Daoインポート時間計測
+
+新しいPythonプロセスでMM_Daoをインポートし、インポート時間（-X importtime）と読み込まれた重いモジュールを計測する
+設定情報をキャッシュから返却するだけのプロセスでも支払う起動時間を追跡するために使用する
+
+    python bench_MM_Dao_import.py [--runs 5] [--top 10] [--max-ms 200]
+
+"""
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from typing import List, Dict, Tuple
+
+
+# 計測対象のモジュール
+TARGET_MODULE = 'MM_Dao'
+# インポートされた場合に報告する重いモジュール（シート読み込み時のみ読み込まれるべきもの）
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl')
+# -X importtimeの出力行（自モジュールの時間|累積時間|モジュール名）のパタン
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)')
+
+
+class ImportBench:
+    """インポート時間計測
+
+    計測ごとに新しいプロセスを起動し、モジュールキャッシュのない状態でのインポート時間を計測する
+
+    """
+
+    def measure(module_name: str = TARGET_MODULE) -> Tuple[Dict[str, int], List[str]]:
+        """インポート時間計測（1回）
+
+        Args:
+            module_name (str): インポートするモジュール名
+
+        Returns:
+            Tuple[Dict[str, int], List[str]]: モジュール名ごとの累積インポート時間（マイクロ秒）、インポートされた重いモジュール名リスト
+        """
+        code = (f'import sys, {module_name}; '
+                f'print(",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))')
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True)
+        cumulative: Dict[str, int] = {}
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_PATTERN.match(line)
+            if match:
+                cumulative[match.group(4)] = int(match.group(2))
+        heavy_modules = [name for name in result.stdout.strip().split(',') if name]
+        return cumulative, heavy_modules
+
+    def run(runs: int, module_name: str = TARGET_MODULE) -> Tuple[List[int], Dict[str, int], List[str]]:
+        """インポート時間計測（複数回）
+
+        1回目はバイトコードの生成を含むため、計測結果に含めない
+
+        Args:
+            runs (int): 計測回数
+            module_name (str): インポートするモジュール名
+
+        Returns:
+            Tuple[List[int], Dict[str, int], List[str]]: 計測ごとの累積インポート時間（マイクロ秒）、
+                                                        モジュール名ごとの累積インポート時間の中央値、インポートされた重いモジュール名リスト
+        """
+        ImportBench.measure(module_name)
+        totals: List[int] = []
+        samples: Dict[str, List[int]] = {}
+        heavy_modules: List[str] = []
+        for _ in range(runs):
+            cumulative, heavy_modules = ImportBench.measure(module_name)
+            totals.append(cumulative.get(module_name, 0))
+            for name, elapsed in cumulative.items():
+                samples.setdefault(name, []).append(elapsed)
+        medians = {name: int(statistics.median(elapsed)) for name, elapsed in samples.items()}
+        return totals, medians, heavy_modules
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MM_Daoのインポート時間を計測する')
+    parser.add_argument('--runs', type=int, default=5, help='計測回数')
+    parser.add_argument('--top', type=int, default=10, help='表示する累積インポート時間の上位モジュール数')
+    parser.add_argument('--max-ms', type=float, default=None, help='中央値がこの時間（ミリ秒）を超えた場合は終了コード1とする')
+    args = parser.parse_args()
+
+    totals, medians, heavy_modules = ImportBench.run(args.runs)
+    median_ms = statistics.median(totals) / 1000
+    print(f'{TARGET_MODULE} import: median {median_ms:.1f} ms, min {min(totals) / 1000:.1f} ms, max {max(totals) / 1000:.1f} ms ({args.runs} runs)')
+    modules = [(name, elapsed) for name, elapsed in medians.items() if name != TARGET_MODULE]
+    for name, elapsed in sorted(modules, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f'  {elapsed / 1000:8.1f} ms  {name}')
+    print(f'heavy modules imported: {", ".join(heavy_modules) if heavy_modules else "none"}')
+    if heavy_modules or (args.max_ms is not None and median_ms > args.max_ms):
+        sys.exit(1)
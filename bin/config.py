@@ -9,39 +9,7 @@ import pandas.core.series
 import openpyxl
 from typing import List, Dict, Any
 
-
-class AsciiFilter:
-    """ASCIIフィルタ
-
-    PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-    文字列以外の場合はそのまま保持する
-    """
-
-    def __init__(self, row: pandas.core.series.Series) -> None:
-        """初期化
-
-        PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-        文字列以外の場合はそのまま保持する
-        """
-        for col_name in row.index:
-            setattr(self, col_name, AsciiFilter.__strip_to_ascii(row[col_name]))
-
-    def __strip_to_ascii(org: Any) -> Any:
-        """ASCIIコード以外削除
-
-        引数が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除して返却する
-        文字列以外の場合はそのまま返却する
-
-        Args:
-            org (Any): 元データ
-
-        Returns:
-            Any: ASCIIコード以外削除データ（文字列以外の場合は元データ）
-        """
-        if org and type(org) == str:
-            # No-Break SpaceをSpaceに変換しascii以外の文字コードを除去
-            return org.replace('\u00a0', '\u0020').encode('ascii', 'ignore').decode('utf-8')
-        return org
+from MM_Workbook import Workbook, ENGINE_PANDAS
 
 
 class CounterConfig:
@@ -867,15 +835,16 @@ class Config:
 
     """
 
-    def __init__(self, config_file_name: str):
+    def __init__(self, config_file_name: str, engine: str = ENGINE_PANDAS):
         """初期化
 
         引数で指定されたホスト設定情報ファイルを読み込み、インスタンス属性に保持する
 
         Args:
             config_file_name (str): ホスト設定情報ファイルパス
+            engine (str): 読み込みエンジン pandas（従来方式）またはopenpyxl（ストリーミング）
         """
-        config_file = pd.ExcelFile(config_file_name, engine='openpyxl')
+        config_file = Workbook.open(config_file_name, engine)
         self.__moConfigs: Dict[str, MoConfig] = Config.__load_collect_info(config_file)
         self.__cmdHostConfigs: Dict[str, CmdHostConfig] = Config.__load_nf_host_info(self.__moConfigs)
         self.__connectConfigs: List[ConnectConfig] = Config.__load_connect_info(config_file)
@@ -913,19 +882,19 @@ class Config:
         """
         return self.__cmdHostConfigs
 
-    def __load_collect_info(config_file: pd.ExcelFile) -> Dict[str, MoConfig]:
+    def __load_collect_info(config_file: Workbook) -> Dict[str, MoConfig]:
         """収集設定情報ロード
 
         設定情報ファイルの「収集情報」シートから情報を読み込み、収集設定情報として返却する
 
         Args:
-            config_file (pd.ExcelFile): ホスト設定情報ファイル（pandasでExcelファイルを表すクラスのオブジェクト）
+            config_file (Workbook): ホスト設定情報ファイルのワークブックセッション
 
         Returns:
             Dict[str, MoConfig]: 収集設定情報 キーはOSS連携ホスト
         """
         # 設定情報ファイルから「収集情報」シートの情報を読み込む
-        collect_sheet = config_file.parse('収集情報')
+        collect_sheet: List[tuple] = config_file.rows('収集情報')
         # 収集設定情報辞書を初期化する
         moConfigs: Dict[str, MoConfig] = {}
         # 収集単位設定情報辞書を初期化する
@@ -937,7 +906,7 @@ class Config:
         # カウンタ設定情報辞書を初期化する
         counterConfigs: Dict[str, CounterConfig] = {}
         # 収集情報シートの行でループする
-        for row in [AsciiFilter(row) for _, row in collect_sheet.iterrows()]:
+        for row in collect_sheet:
             # 収集情報シートの行のOSS連携ホスト名がnullでない場合
             if not pd.isnull(row.mo_host):
                 # 収集単位設定情報辞書を初期化する
@@ -1020,24 +989,24 @@ class Config:
         # コマンド収集ホスト設定情報辞書を返却する
         return cmdHostDict
 
-    def __load_connect_info(config_file: pd.ExcelFile) -> List[ConnectConfig]:
+    def __load_connect_info(config_file: Workbook) -> List[ConnectConfig]:
         """接続設定情報ロード
 
         設定情報ファイルの「接続情報」シートから情報を読み込み、接続設定情報として返却する
         収集ホスト設定情報配下の接続設定情報はpriority、bastionの昇順でソートされる
 
         Args:
-            config_file (pd.ExcelFile): ホスト設定情報ファイル（pandasでExcelファイルを表すオブジェクト）
+            config_file (Workbook): ホスト設定情報ファイルのワークブックセッション
 
         Returns:
             List[ConnectConfig]: 接続設定情報
         """
         # 設定情報ファイルから「接続情報」シートの情報を読み込む
-        connect_sheet = config_file.parse('接続情報')
+        connect_sheet: List[tuple] = config_file.rows('接続情報')
         # 接続設定情報リストを初期化する
         connectConfigs: List[ConnectConfig] = []
         # 接続情報シートの行でループする
-        for row in [AsciiFilter(row) for _, row in connect_sheet.iterrows()]:
+        for row in connect_sheet:
             # 接続情報シートの行のコマンド収集ホスト名がnullでない場合
             if not pd.isnull(row.nf_host):
                 # 接続ホスト設定情報リストを初期化する
@@ -9,39 +9,8 @@ import pandas.core.series
 import openpyxl
 from typing import List, Dict, Any
 
+from MM_AsciiFilter import AsciiFilter
 
-class AsciiFilter:
-    """ASCIIフィルタ
-
-    PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-    文字列以外の場合はそのまま保持する
-    """
-
-    def __init__(self, row: pandas.core.series.Series) -> None:
-        """初期化
-
-        PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-        文字列以外の場合はそのまま保持する
-        """
-        for col_name in row.index:
-            setattr(self, col_name, AsciiFilter.__strip_to_ascii(row[col_name]))
-
-    def __strip_to_ascii(org: Any) -> Any:
-        """ASCIIコード以外削除
-
-        引数が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除して返却する
-        文字列以外の場合はそのまま返却する
-
-        Args:
-            org (Any): 元データ
-
-        Returns:
-            Any: ASCIIコード以外削除データ（文字列以外の場合は元データ）
-        """
-        if org and type(org) == str:
-            # No-Break SpaceをSpaceに変換しascii以外の文字コードを除去
-            return org.replace('\u00a0', '\u0020').encode('ascii', 'ignore').decode('utf-8')
-        return org
 
 class NoteConfig:
     """備考メモ情報
@@ -1195,7 +1164,7 @@ class Config:
         # 備考メモ情報辞書を初期化する
         noteConfigs: Dict[str, NoteConfig] = {}
         # MAINシートの行でループする
-        for row in [AsciiFilter(row) for _, row in collect_sheet.iterrows()]:
+        for row in AsciiFilter.rows(collect_sheet):
             # MAINシートの行のシナリオ名がnullでない場合
             if not pd.isnull(row.scenario):
                 # 実行環境設定情報辞書を初期化する
@@ -1323,7 +1292,7 @@ class Config:
     #     # 接続設定情報リストを初期化する
     #     connectConfigs: List[ConnectConfig] = []
     #     # 接続情報シートの行でループする
-    #     for row in [AsciiFilter(row) for _, row in connect_sheet.iterrows()]:
+    #     for row in AsciiFilter.rows(connect_sheet):
     #         # 接続情報シートの行のコマンド収集ホスト名がnullでない場合
     #         if not pd.isnull(row.nf_host):
     #             # 接続ホスト設定情報リストを初期化する
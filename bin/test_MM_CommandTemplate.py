@@ -0,0 +1,93 @@
+"""コマンドテンプレートの試験
+
+"""
+from types import SimpleNamespace
+
+import pytest
+
+import MM_CommandTemplate
+from MM_BoundedCache import BoundedCache
+from MM_CommandTemplate import CommandTemplate
+from MM_ListConfig import ListConfig
+
+NAN = float('nan')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    CommandTemplate.clear_cache()
+    yield
+    CommandTemplate.clear_cache()
+
+
+def test_render():
+    template = CommandTemplate.compile('gsh delete_dns_server -dn {{LIST001.DN}} -ns {{ LIST001.NS }} -g {{Group_AMF}}')
+    assert template.names == ('LIST001.DN', 'LIST001.NS', 'Group_AMF')
+    assert template.render({'LIST001.DN': 'dn1', 'LIST001.NS': 'ns1', 'Group_AMF': 'g1'}) == \
+        'gsh delete_dns_server -dn dn1 -ns ns1 -g g1'
+    # 同じ変数の複数回の記載はそれぞれ置き換える
+    assert CommandTemplate('{{a}}-{{a}}').render({'a': 'x'}) == 'x-x'
+    # 変数のないコマンド情報はそのまま返却する
+    template = CommandTemplate.compile('gsh list_dns_server')
+    assert template.names == () and template.render({}) == 'gsh list_dns_server'
+
+
+def test_missing_values_keep_placeholder():
+    template = CommandTemplate('show {{a}} {{ b }} {{c.d}} {{e}}')
+    assert template.render({'a': None, 'b': NAN, 'c': {}}) == 'show {{a}} {{ b }} {{c.d}} {{e}}'
+    assert template.render({'e': 0}) == 'show {{a}} {{ b }} {{c.d}} 0'
+
+
+def test_dotted_lookup():
+    template = CommandTemplate('{{row.nf}} {{cfg.host.name}} {{x.y}}')
+    values = {'row': SimpleNamespace(nf='amf1'), 'cfg': {'host': {'name': 'h1'}}, 'x.y': 'whole'}
+    assert template.render(values) == 'amf1 h1 whole'
+    assert template.render({'row': None}) == '{{row.nf}} {{cfg.host.name}} {{x.y}}'
+
+
+def test_equal_values_of_different_types_are_not_shared():
+    # 1、1.0、Trueは等しくハッシュ値も同じため、値そのものをキーにすると最初の置き換え結果を返してしまう
+    template = CommandTemplate('ver {{v}}')
+    assert template.render({'v': 1}) == 'ver 1'
+    assert template.render({'v': 1.0}) == 'ver 1.0'
+    assert template.render({'v': True}) == 'ver True'
+    assert template.render({'v': 0.0}) == 'ver 0.0'
+    assert template.render({'v': -0.0}) == 'ver -0.0'
+    assert template.render({'v': '1'}) == 'ver 1'
+    # 2回目も同じ結果
+    assert [template.render({'v': value}) for value in (True, 1.0, 1)] == ['ver True', 'ver 1.0', 'ver 1']
+
+
+def test_unhashable_values():
+    template = CommandTemplate('{{v}}')
+    assert template.render({'v': [1, 2]}) == '[1, 2]'
+    assert template.render({'v': [1, 2]}) == '[1, 2]'
+    assert template.render({'v': {'a': 1}}) == "{'a': 1}"
+
+
+def test_render_results_are_bounded(monkeypatch):
+    monkeypatch.setattr(MM_CommandTemplate, 'RENDER_CACHE_MAX_ENTRIES', 3)
+    template = CommandTemplate('{{v}}')
+    assert template.render_all({'v': number} for number in range(10)) == [str(number) for number in range(10)]
+    assert len(template._CommandTemplate__rendered) == 3
+
+
+def test_compile_is_shared_and_cleared(monkeypatch):
+    monkeypatch.setattr(MM_CommandTemplate, 'templates', BoundedCache(2))
+    first = CommandTemplate.compile('{{a}}')
+    assert CommandTemplate.compile('{{a}}') is first
+    CommandTemplate.compile('{{b}}')
+    CommandTemplate.compile('{{c}}')
+    assert CommandTemplate.compile('{{a}}') is not first
+    CommandTemplate.clear_cache()
+    assert len(MM_CommandTemplate.templates) == 0
+
+
+def test_main_and_list_values():
+    mainConfigs = [SimpleNamespace(key='Group_AMF', value='g1'), SimpleNamespace(key='Group_AMF', value='g2')]
+    assert CommandTemplate.main_values(mainConfigs) == {'Group_AMF': 'g1'}
+    listConfig = ListConfig('amf1', 'jump1', 'amf1-cnrf-amf', 'amf1-cnrf', 'amf1-host', 'amf1-dn', 'ns1', '10.0.0.1', 1, 'EAST', 0)
+    values = CommandTemplate.list_values(listConfig)
+    assert values['LIST001.DN'] == 'amf1-dn' and values['LIST001.NS'] == 'ns1'
+    assert CommandTemplate('-dn {{LIST001.DN}} -ns {{LIST001.NS}}').render(values) == '-dn amf1-dn -ns ns1'
+    assert 'LIST002.DN' in CommandTemplate.list_values(listConfig, 'LIST002')
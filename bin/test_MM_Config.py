@@ -13,41 +13,9 @@ from MM_CommandConfig import CommandConfig
 from MM_ScenarioConfig import ScenarioConfig
 from MM_ListConfig import ListConfig
 from MM_MainConfig import MainConfig
+from MM_AsciiFilter import AsciiFilter
 
 
-class AsciiFilter:
-    """ASCIIフィルタ
-
-    PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-    文字列以外の場合はそのまま保持する
-    """
-
-    def __init__(self, row: pandas.core.series.Series) -> None:
-        """初期化
-
-        PANDASのSeries（読み込んだExcelファイルの行）が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除してインスタンス属性に保持する
-        文字列以外の場合はそのまま保持する
-        """
-        for col_name in row.index:
-            setattr(self, col_name, AsciiFilter.__strip_to_ascii(row[col_name]))
-
-    def __strip_to_ascii(org: Any) -> Any:
-        """ASCIIコード以外削除
-
-        引数が文字列の場合、文字列をASCIIコードのみとし、他のコードを削除して返却する
-        文字列以外の場合はそのまま返却する
-
-        Args:
-            org (Any): 元データ
-
-        Returns:
-            Any: ASCIIコード以外削除データ（文字列以外の場合は元データ）
-        """
-        if org and type(org) == str:
-            # No-Break SpaceをSpaceに変換しascii以外の文字コードを除去
-            return org.replace('\u00a0', '\u0020').encode('ascii', 'ignore').decode('utf-8')
-        return org
-
 class Config:
     """設定情報
 
@@ -143,7 +111,7 @@ class Config:
         # 接続設定情報リストを初期化する
         mainConfigs: Dict[str, MainConfig] = {}
         # DEFAULT_OPTIONシートの行でループする
-        for row in [AsciiFilter(row) for _, row in main_sheet.iterrows()]:
+        for row in AsciiFilter.rows(main_sheet):
             # DEFAULT_OPTIONシートの行の初期設定項目名"KEY"がnullでない場合
             if not pd.isnull(row.KEY):
                 # DEFAULT_OPTIONシートの行の情報から初期設定情報辞書を生成し、初期設定項目名"KEY"をキーに初期設定情報辞書に追加する
@@ -171,8 +139,8 @@ class Config:
             # リストに格納されている順に取得したサブシート名のシナリオ設定ファイルを取得
             sub_collect_sheet = config_file.parse(sub_sheet_name)
             # SUBシートの行でループする
-            for row in [AsciiFilter(row) for _, row in sub_collect_sheet.iterrows()]:
-                rowkeys = row.__dict__.items()
+            for row in AsciiFilter.rows(sub_collect_sheet):
+                rowkeys = row._asdict().items()
                 print(rowkeys)
                 # rowlist = []
                 # for key, val in rowkeys:
@@ -207,7 +175,7 @@ class Config:
             # リストに格納されている順に取得したリスト名のシナリオ取得
             list_collect_sheet = config_file.parse(list_sheet_name)
             # LISTシートの行でループする
-            for row in [AsciiFilter(row) for _, row in list_collect_sheet.iterrows()]:
+            for row in AsciiFilter.rows(list_collect_sheet):
                 # LISTシートの行のコマンド実行ホスト名"HOST"がnullでない場合
                 if not pd.isnull(row.cNRF_AMF):
                     # LISTシートの行の情報から接続設定情報を生成し、接続設定情報リストに追加する
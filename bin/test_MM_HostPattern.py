@@ -0,0 +1,111 @@
+"""ホスト名パタン、上限付きキャッシュの試験
+
+"""
+import re
+import threading
+
+import pytest
+
+import MM_HostPattern
+from MM_BoundedCache import BoundedCache
+from MM_HostPattern import HostPattern
+
+ALTERNATIVES = ['tam.*', 'osc01', 'os.*', r'amf[0-9]+', 'tam01', 'x.y', '.*-dr']
+HOSTS = ['tam01', 'tam', 'ta', 'osc01', 'osc02', 'os', 'o', 'amf12', 'amf', 'amf1x', 'x.y', 'xzy', 'tok-dr', 'osc-dr', '', 'TAM01']
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    HostPattern.clear_cache()
+    yield
+    HostPattern.clear_cache()
+
+
+def reference_match(alternatives, host):
+    # 選択肢を記載順に1つずつ照合する（照合木、正規表現をまとめる前の方式）
+    for alternative in alternatives:
+        if re.fullmatch(alternative, host):
+            return alternative
+    return None
+
+
+def test_match_same_as_each_alternative_in_order():
+    hostPattern = HostPattern(ALTERNATIVES)
+    for host in HOSTS:
+        assert hostPattern.match(host) == reference_match(ALTERNATIVES, host), host
+    # 照合結果を保持した2回目も同じ
+    assert hostPattern.classify(HOSTS) == [reference_match(ALTERNATIVES, host) for host in HOSTS]
+    assert hostPattern.matches('tam99')
+    assert not hostPattern.matches('smf01')
+
+
+def test_first_alternative_wins():
+    assert HostPattern(['tam01', 'tam.*']).match('tam01') == 'tam01'
+    assert HostPattern(['tam.*', 'tam01']).match('tam01') == 'tam.*'
+    assert HostPattern(['t.m01', 'tam.*']).match('tam01') == 't.m01'
+    assert HostPattern(['tam.*', 't.m01']).match('tam01') == 'tam.*'
+
+
+def test_invalid_regex():
+    with pytest.raises(re.error):
+        HostPattern(['tam(.*'])
+
+
+def test_compile_literals_and_separator():
+    assert HostPattern.compile('handover == "tam.*" || handover == "osc.*"').alternatives == ('tam.*', 'osc.*')
+    assert HostPattern.compile('tam.* || osc.*').alternatives == ('tam.*', 'osc.*')
+    assert HostPattern.compile('tam.*||').alternatives == ('tam.*',)
+
+
+def test_compile_cache_is_bounded_and_cleared(monkeypatch):
+    monkeypatch.setattr(MM_HostPattern, 'patterns', BoundedCache(2))
+    first = HostPattern.compile('tam.*')
+    assert HostPattern.compile('tam.*') is first
+    HostPattern.compile('osc.*')
+    HostPattern.compile('amf.*')
+    assert len(MM_HostPattern.patterns) == 2
+    assert HostPattern.compile('tam.*') is not first
+    HostPattern.clear_cache()
+    assert len(MM_HostPattern.patterns) == 0
+
+
+def test_match_results_are_bounded(monkeypatch):
+    monkeypatch.setattr(MM_HostPattern, 'MATCH_CACHE_MAX_ENTRIES', 3)
+    hostPattern = HostPattern(['tam.*'])
+    assert hostPattern.classify([f'tam{number}' for number in range(10)]) == ['tam.*'] * 10
+    assert len(hostPattern._HostPattern__results) == 3
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache = BoundedCache(2)
+    assert cache.setdefault('a', 1) == 1
+    assert cache.setdefault('b', 2) == 2
+    assert cache.setdefault('a', 9) == 1
+    cache.setdefault('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    cache.setdefault('d', 4)
+    assert cache.get('c', 'none') == 'none'
+    assert len(cache) == 2 and cache.max_entries == 2
+    cache.clear()
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        BoundedCache(0)
+    with pytest.raises(TypeError):
+        cache.get(['unhashable'])
+
+
+def test_bounded_cache_threads():
+    cache = BoundedCache(100)
+    results = []
+
+    def register(number):
+        results.append(cache.setdefault(number % 10, number))
+
+    threads = [threading.Thread(target=register, args=(number,)) for number in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 10
+    assert sorted(set(results)) == sorted(cache.get(key) for key in range(10))
@@ -0,0 +1,125 @@
+"""ホスト並列実行の試験
+
+"""
+import threading
+import time
+from collections import namedtuple
+
+import pytest
+
+from MM_HostRunner import HostRunner, HostResult
+from MM_ListTable import ListTable
+
+Row = namedtuple('Row', ['nf', 'remote_host', 'region', 'del_flg'])
+
+ROWS = [
+    Row('amf1', 'jump1', 'EAST', 0),
+    Row('amf2', 'jump1', 'EAST', 0),
+    Row('amf3', 'jump1', 'EAST', 0),
+    Row('amf4', 'jump2', 'EAST', 1),
+    Row('amf5', 'jump2', 'WEST', 0),
+    Row('amf6', 'jump3', 'WEST', 0),
+    Row('amf7', 'jump3', 'WEST', 0),
+]
+
+
+class Recorder:
+    # 地域ごと、SSH接続ホストごと、全体の同時実行ホスト数の最大値を記録する処理
+
+    def __init__(self, seconds=0.02):
+        self.lock = threading.Lock()
+        self.seconds = seconds
+        self.running = {}
+        self.peaks = {}
+        self.started = []
+
+    def __enter(self, keys):
+        with self.lock:
+            for key in keys:
+                self.running[key] = self.running.get(key, 0) + 1
+                self.peaks[key] = max(self.peaks.get(key, 0), self.running[key])
+
+    def __exit(self, keys):
+        with self.lock:
+            for key in keys:
+                self.running[key] -= 1
+
+    def __call__(self, row):
+        keys = ('all', ('region', row.region), ('remote_host', row.remote_host))
+        self.__enter(keys)
+        with self.lock:
+            self.started.append(row.nf)
+        try:
+            time.sleep(self.seconds)
+            return row.nf.upper()
+        finally:
+            self.__exit(keys)
+
+
+def test_results_in_row_order_and_del_flg():
+    runner = HostRunner(ROWS)
+    assert len(runner) == 6
+    assert [row.nf for row in runner.rows] == ['amf1', 'amf2', 'amf3', 'amf5', 'amf6', 'amf7']
+    results = runner.run(Recorder(0))
+    assert [hostResult.position for hostResult in results] == [0, 1, 2, 4, 5, 6]
+    assert [hostResult.result for hostResult in results] == ['AMF1', 'AMF2', 'AMF3', 'AMF5', 'AMF6', 'AMF7']
+    assert all(hostResult.error is None for hostResult in results)
+    assert len(HostRunner(ROWS, del_flg=1)) == 1
+    assert len(HostRunner(ROWS, del_flg=None)) == 7
+
+
+def test_hosts_run_in_parallel():
+    # すべてのホストが同時に実行中でなければ、待ち合わせが時間切れになる
+    barrier = threading.Barrier(6, timeout=5)
+    results = HostRunner(ROWS).run(lambda row: barrier.wait())
+    assert all(hostResult.error is None for hostResult in results)
+
+
+def test_limits_are_respected():
+    recorder = Recorder()
+    results = HostRunner(ROWS, workers=3, region_limit={'EAST': 1}, remote_host_limit=2).run(recorder)
+    assert len(results) == 6
+    assert recorder.peaks['all'] <= 3
+    assert recorder.peaks[('region', 'EAST')] == 1
+    assert all(recorder.peaks[('remote_host', remote_host)] <= 2 for remote_host in ('jump1', 'jump2', 'jump3'))
+    # 地域の上限で待つホストがあっても、他の地域のホストを先に開始する
+    assert recorder.started.index('amf5') < recorder.started.index('amf3')
+
+
+def test_serial_run():
+    recorder = Recorder(0)
+    results = HostRunner(ROWS, workers=None).run(recorder)
+    assert recorder.started == ['amf1', 'amf2', 'amf3', 'amf5', 'amf6', 'amf7']
+    assert recorder.peaks['all'] == 1
+    assert [hostResult.result for hostResult in results] == ['AMF1', 'AMF2', 'AMF3', 'AMF5', 'AMF6', 'AMF7']
+
+
+def test_errors_are_recorded_and_others_continue():
+    def task(row):
+        if row.nf == 'amf2':
+            raise RuntimeError(row.nf)
+        return row.nf
+
+    finished = []
+    results = HostRunner(ROWS).run(task, finished.append)
+    assert isinstance(results[1].error, RuntimeError) and results[1].result is None
+    assert [hostResult.result for hostResult in results if hostResult.error is None] == ['amf1', 'amf3', 'amf5', 'amf6', 'amf7']
+    # 終了したホストごとに呼び出す
+    assert sorted(hostResult.position for hostResult in finished) == [0, 1, 2, 4, 5, 6]
+    assert all(isinstance(hostResult, HostResult) for hostResult in finished)
+
+
+def test_zero_limit_raises():
+    with pytest.raises(ValueError):
+        HostRunner(ROWS, region_limit={'EAST': 0}).run(Recorder(0))
+
+
+def test_list_table():
+    table = ListTable([
+        ('amf1', 'jump1', 'a', 'c', 'h1', 'dn1', 'ns1', '10.0.0.1', 1, 'EAST', 0),
+        ('amf2', 'jump1', 'a', 'c', 'h2', 'dn2', 'ns1', '10.0.0.2', 1, 'EAST', 1),
+        ('amf3', 'jump2', 'a', 'c', 'h3', 'dn3', 'ns1', '10.0.0.3', 1, 'WEST', 0),
+    ])
+    runner = HostRunner(table, remote_host_limit=1)
+    assert [row.nf for row in runner.rows] == ['amf1', 'amf3']
+    assert [(hostResult.position, hostResult.result) for hostResult in runner.run(lambda row: row.host)] == [(0, 'h1'), (2, 'h3')]
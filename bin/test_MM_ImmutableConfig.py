@@ -0,0 +1,77 @@
+"""変更不可設定情報の試験
+
+"""
+import copy
+import pickle
+
+import pytest
+
+from MM_CommandConfig import CommandConfig
+from MM_ImmutableConfig import ImmutableConfig
+from MM_ListConfig import ListConfig
+from MM_MainConfig import MainConfig
+from MM_ScenarioConfig import ScenarioConfig
+
+NAN = float('nan')
+
+
+def command(no='1', command='show dns', when=NAN):
+    return CommandConfig('amf', no, 'CMD', 'dns', when, command, NAN, 'include', 'OK', NAN, 'disable')
+
+
+def test_fields_are_declared_by_slots():
+    config = MainConfig('timeout', 30)
+    assert (config.key, config.value) == ('timeout', 30)
+    assert str(config) == "{'_MainConfig__key': 'timeout', '_MainConfig__value': 30}"
+    assert not hasattr(config, '__dict__')
+    # 名前修飾した属性名での参照も従来どおり使用できる
+    assert config._MainConfig__key == 'timeout'
+    with pytest.raises(TypeError):
+        ImmutableConfig.__init__(MainConfig.__new__(MainConfig), 'timeout')
+
+
+def test_immutable():
+    config = command()
+    with pytest.raises(AttributeError):
+        config.node = 'smf'
+    with pytest.raises(AttributeError):
+        config._CommandConfig__node = 'smf'
+    with pytest.raises(AttributeError):
+        del config._CommandConfig__node
+    assert config.node == 'amf'
+
+
+def test_equality_treats_nan_as_equal():
+    assert command() == command()
+    assert hash(command()) == hash(command())
+    assert command() != command(no='2')
+    assert len({command(), command(), command(no='2')}) == 2
+    assert command() != MainConfig('amf', 1)
+
+
+def test_list_config_converts_integers():
+    config = ListConfig('amf1', 'jump1', 'cnrf-amf', 'cnrf', 'host', 'dn', 'ns', NAN, '2', 'EAST', 0.0)
+    assert (config.ver, config.del_flg) == (2, 0)
+    assert pickle.loads(pickle.dumps(config)) == config
+
+
+def test_pickle_and_copy():
+    scenario = ScenarioConfig('amf_dns_show', [command(), command(no='2')])
+    for restored in (pickle.loads(pickle.dumps(scenario)), copy.copy(scenario), copy.deepcopy(scenario)):
+        assert restored == scenario
+        assert restored.commandConfigs == scenario.commandConfigs
+        assert hash(restored) == hash(scenario)
+
+
+def test_scenario_hash_is_cached():
+    commands = [command(no=str(no)) for no in range(100)]
+    scenario = ScenarioConfig('amf_dns_show', commands)
+    assert isinstance(scenario.commandConfigs, tuple)
+    first = hash(scenario)
+    assert scenario._ImmutableConfig__hash == first
+    assert all(commandConfig._ImmutableConfig__hash is not None for commandConfig in commands)
+    assert hash(scenario) == first
+    # ハッシュ値が異なるシナリオは、実行コマンド設定情報を比較せずに等価でないと判定する
+    other = ScenarioConfig('amf_dns_show', commands[:99])
+    assert scenario != other
+    assert scenario == ScenarioConfig('amf_dns_show', commands)
@@ -0,0 +1,97 @@
+"""接続設定情報、メイン設定情報の列情報の試験
+
+"""
+import os
+import pickle
+
+import pytest
+
+import MM_ListConfig
+import MainRow as MainRowModule
+from MM_ListConfig import ListConfig
+from MM_ListLoadConfig import ListLoadConfig
+from MM_MainLoadConfig import MainLoadConfig
+from MM_MultiLoadConfig import MultiLoadConfig
+from MM_ScenarioSource import ScenarioSource
+from MainRow import MainRow
+
+SAMPLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MM_scenario_config_one.xlsx')
+
+
+@pytest.fixture(autouse=True)
+def unbind():
+    # 既定のローダは試験ごとに解除する
+    yield
+    ListConfig.bind__loader(None)
+    MainRow.bind_config(None)
+
+
+@pytest.fixture
+def small_config(tmp_path):
+    # LIST001シートを先頭3行、MAINシートのmm_versionを変更したCSVディレクトリ
+    config_dir = tmp_path / 'small'
+    ScenarioSource.convert(SAMPLE_CONFIG, str(config_dir), 'csv')
+    list_csv = config_dir / 'LIST001.csv'
+    lines = list_csv.read_text(encoding='utf-8').splitlines(keepends=True)
+    list_csv.write_text(''.join(lines[:4]), encoding='utf-8')
+    main_csv = config_dir / 'MAIN.csv'
+    main_csv.write_text(main_csv.read_text(encoding='utf-8').replace('mm_version,20230908', 'mm_version,20990101'),
+                        encoding='utf-8')
+    return str(config_dir)
+
+
+def test_unbound_accessors_are_empty():
+    ListLoadConfig(SAMPLE_CONFIG)
+    MainLoadConfig(SAMPLE_CONFIG)
+    assert ListConfig.get__nf_list() == []
+    assert MainRow.get_key_list() == []
+
+
+def test_loaders_do_not_overwrite_each_other(small_config):
+    large = ListLoadConfig(SAMPLE_CONFIG)
+    small = ListLoadConfig(small_config)
+    assert len(large.get_column_list('nf')) == 24
+    assert len(small.get_column_list('nf')) == 3
+    assert large.get_row_value('remote_host', 5) == large.listConfigs[5].remote_host
+    large.bind()
+    assert len(ListConfig.get__nf_list()) == 24
+    # 別のローダを生成しても、既定のローダは切り替わらない
+    ListLoadConfig(small_config)
+    assert len(ListConfig.get__cNRF_AMF_list()) == 24
+    assert ListConfig.get__row_host(23) == large.listConfigs[23].host
+    small.bind()
+    assert len(ListConfig.get__nf_list()) == 3
+
+
+def test_unpickle_does_not_rebind(small_config):
+    main = MainLoadConfig(SAMPLE_CONFIG)
+    main.bind()
+    restored = pickle.loads(pickle.dumps(MainLoadConfig(small_config)))
+    assert MainRowModule.default_config is main
+    assert restored.get_value_list()[0] == 20990101
+    assert MainRow.get_row_mainvalue(0) == 20230908
+    listed = ListLoadConfig(SAMPLE_CONFIG)
+    listed.bind()
+    pickle.loads(pickle.dumps(ListLoadConfig(small_config)))
+    assert MM_ListConfig.defaultLoader is listed
+
+
+def test_multi_load_config_does_not_rebind(small_config):
+    listed = ListLoadConfig(small_config)
+    listed.bind()
+    MainLoadConfig(small_config).bind()
+    config = MultiLoadConfig([SAMPLE_CONFIG, small_config], 2)
+    assert len(config.get_column_list('nf')) == 27
+    assert len(ListConfig.get__nf_list()) == 3
+    assert MainRow.get_row_mainvalue(0) == 20990101
+    config.bind()
+    assert ListConfig.get__nf_list() == config.listConfigs.column('nf')
+
+
+def test_main_row_lists_hold_every_row():
+    main = MainLoadConfig(SAMPLE_CONFIG)
+    main.bind()
+    # 列情報リストはmain_nextで読み進めた行ではなく、メイン設定情報の全行を示す
+    assert MainRow.get_key_list() == [mainConfig.key for mainConfig in main.mainConfigs]
+    assert MainRow.get_row_mainkey(0) == 'mm_version'
+    assert MainRow.get_value_list() == main.get_value_list()
@@ -0,0 +1,106 @@
+"""接続設定情報索引の試験
+
+"""
+import pytest
+
+from MM_ListIndex import ListIndex
+from MM_ListTable import ListTable
+
+NAN = float('nan')
+
+
+def list_row(nf, remote_host, region, ip, ver=1, ns='ns1', del_flg=0):
+    # LIST_COLUMNSの並び順の行
+    return (nf, remote_host, f'{nf}-cnrf-amf', f'{nf}-cnrf', f'{nf}-host', f'{nf}-dn', ns, ip, ver, region, del_flg)
+
+
+ROWS = [
+    list_row('amf1', 'jump1', 'EAST', '10.1.0.1'),
+    list_row('amf2', 'jump1', 'WEST', '10.1.2.3', ver=2),
+    list_row('amf3', 'jump2', 'EAST', ' 10.2.0.1 ', ns='ns2'),
+    list_row('amf4', 'jump2', 'EAST', '2001:db8::1'),
+    list_row('amf5', 'jump3', NAN, 'not-an-ip', ver=2),
+    list_row('amf6', 'jump3', 'WEST', '10.1.0.1'),
+    list_row('amf7', 'jump4', 'WEST', NAN),
+]
+
+
+@pytest.fixture
+def index():
+    return ListIndex(ListTable(ROWS))
+
+
+def nfs(table):
+    return [row.nf for row in table]
+
+
+def test_get_unique_column(index):
+    assert index.get('cNRF_AMF', 'amf3-cnrf-amf').nf == 'amf3'
+    assert index.get('host', 'amf9-host') is None
+    # 同じ値の行が複数ある場合は先頭の行
+    assert index.get('remote_host', 'jump3').nf == 'amf5'
+    with pytest.raises(KeyError):
+        index.get('dn', 'amf1-dn')
+
+
+def test_positions_and_find(index):
+    assert index.positions(region='EAST').tolist() == [0, 2, 3]
+    assert index.positions(region=['EAST', 'WEST'], ver=2).tolist() == [1]
+    assert index.positions(ver=(1, 2), ns='ns2').tolist() == [2]
+    assert index.positions(region='NORTH').tolist() == []
+    assert index.positions().tolist() == list(range(len(ROWS)))
+    # 欠損値はNaNのオブジェクトが異なっても一致する
+    assert nfs(index.find(region=float('nan'))) == ['amf5']
+    assert nfs(index.find(remote_host='jump2', region='EAST')) == ['amf3', 'amf4']
+
+
+def test_keys(index):
+    assert sorted(index.keys('ver')) == [1, 2]
+    assert set(index.keys('remote_host')) == {'jump1', 'jump2', 'jump3', 'jump4'}
+
+
+def test_matches_table_filter(index):
+    table = index.table
+    for region in ('EAST', 'WEST', NAN):
+        for ver in (1, 2):
+            assert nfs(index.find(region=region, ver=ver)) == nfs(table.filter(region=region, ver=ver))
+
+
+def test_find_network(index):
+    assert nfs(index.find_network('10.1.0.0/16')) == ['amf1', 'amf2', 'amf6']
+    # ホスト部は無視する
+    assert nfs(index.find_network('10.1.2.3/16')) == ['amf1', 'amf2', 'amf6']
+    assert nfs(index.find_network('10.0.0.0/8')) == ['amf1', 'amf2', 'amf3', 'amf6']
+    assert nfs(index.find_network('2001:db8::/32')) == ['amf4']
+    assert nfs(index.find_network('192.168.0.0/16')) == []
+    with pytest.raises(ValueError):
+        index.find_network('10.1.0.0/40')
+
+
+def test_get_ip(index):
+    assert index.get_ip('10.2.0.1').nf == 'amf3'
+    assert index.get_ip('2001:0db8:0:0:0:0:0:1').nf == 'amf4'
+    assert index.get_ip('10.1.0.1').nf == 'amf1'
+    assert index.get_ip('not-an-ip') is None
+    assert index.get_ip('10.9.9.9') is None
+
+
+def test_duplicate_ips(index):
+    duplicates = index.duplicate_ips()
+    assert list(duplicates) == ['10.1.0.1']
+    assert duplicates['10.1.0.1'].tolist() == [0, 5]
+
+
+def test_ip_number():
+    assert ListIndex.ip_number(' 10.0.0.1') == (4, 0x0A000001)
+    assert ListIndex.ip_number('::1') == (6, 1)
+    assert ListIndex.ip_number('10.0.0') is None
+    assert ListIndex.ip_number(NAN) is None
+
+
+def test_empty_table():
+    index = ListIndex(ListTable())
+    assert index.positions(region='EAST').tolist() == []
+    assert index.get('host', 'amf1-host') is None
+    assert index.duplicate_ips() == {}
+    assert len(index.find_network('10.0.0.0/8')) == 0
@@ -0,0 +1,102 @@
+"""接続設定情報テーブルの試験
+
+"""
+import math
+import pickle
+
+import pytest
+
+from MM_ListTable import ListTable, LIST_COLUMNS, NULL_KEY
+
+
+def list_row(nf, remote_host, region, ver=1, del_flg=0, ip=float('nan')):
+    # LIST_COLUMNSの並び順の行
+    return (nf, remote_host, 'cnrf-amf', 'cnrf', f'{nf}-host', f'{nf}-dn', f'{nf}-ns', ip, ver, region, del_flg)
+
+
+ROWS = [
+    list_row('amf1', 'jump1', 'EAST'),
+    list_row('amf2', 'jump1', 'WEST', ver=2),
+    list_row('amf3', 'jump2', 'EAST', del_flg=1),
+    list_row('amf4', 'jump2', 'EAST', ip='10.0.0.4'),
+]
+
+
+@pytest.fixture
+def table():
+    return ListTable(ROWS)
+
+
+def test_len_and_row_values(table):
+    assert len(table) == 4
+    values = table[1].values()
+    assert list(values) == list(LIST_COLUMNS)
+    assert [values[column] for column in LIST_COLUMNS if column != 'ip'] == [value for column, value in zip(LIST_COLUMNS, ROWS[1]) if column != 'ip']
+    assert math.isnan(values['ip'])
+    assert table[3].ip == '10.0.0.4'
+    assert table[-1].nf == 'amf4'
+    assert [row.nf for row in table[1:3]] == ['amf2', 'amf3']
+
+
+def test_invalid_rows():
+    with pytest.raises(TypeError):
+        ListTable([ROWS[0][:-1]])
+    with pytest.raises(ValueError):
+        ListTable([list_row('amf1', 'jump1', 'EAST', ver='x')])
+
+
+def test_column_and_categories(table):
+    assert table.column('remote_host') == ['jump1', 'jump1', 'jump2', 'jump2']
+    assert table.categories('remote_host') == ['jump1', 'jump2']
+    assert table.column('ver') == [1, 2, 1, 1]
+    assert table.value('del_flg', 2) == 1
+    # 欠損値は1つの値にまとめて符号化する
+    assert len(table.categories('ip')) == 2
+
+
+def test_filter(table):
+    assert [row.nf for row in table.filter(region='EAST', del_flg=0)] == ['amf1', 'amf4']
+    assert [row.nf for row in table.filter(ver=(1, 2), remote_host=['jump1'])] == ['amf1', 'amf2']
+    assert len(table.filter(region='NORTH')) == 0
+    assert [row.nf for row in table.filter(ip=float('nan'))] == ['amf1', 'amf2', 'amf3']
+    with pytest.raises(KeyError):
+        table.mask(unknown=1)
+
+
+def test_select(table):
+    assert [row.nf for row in table.select([3, 0])] == ['amf4', 'amf1']
+    assert [row.nf for row in table.select(table.mask(del_flg=1))] == ['amf3']
+
+
+def test_concat(table):
+    other = ListTable([list_row('amf5', 'jump3', 'WEST'), list_row('amf6', 'jump1', 'EAST')])
+    joined = ListTable.concat([table, other])
+    assert len(joined) == 6
+    assert joined.column('nf') == table.column('nf') + other.column('nf')
+    assert joined.categories('remote_host') == ['jump1', 'jump2', 'jump3']
+    assert len(joined.categories('ip')) == 2
+    assert joined[5] == other[1]
+    assert len(ListTable.concat([])) == 0
+
+
+def test_compare_value():
+    assert ListTable.compare_value(float('nan')) is NULL_KEY
+    assert ListTable.compare_value(None) is NULL_KEY
+    assert ListTable.compare_value('EAST') == 'EAST'
+
+
+def test_row_equality_and_hash(table):
+    # 欠損値を含む行も、同じ値の行とは等価で、ハッシュ値も一致する
+    copy = ListTable([list_row('amf1', 'jump1', 'EAST')])
+    assert table[0] == copy[0]
+    assert hash(table[0]) == hash(copy[0])
+    assert table[0] != table[1]
+    assert len({row for row in ListTable(ROWS + ROWS[:2])}) == 4
+
+
+def test_table_equality_and_pickle(table):
+    assert table == ListTable(ROWS)
+    assert table != ListTable(ROWS[:3])
+    restored = pickle.loads(pickle.dumps(table))
+    assert restored == table
+    assert restored.column('nf') == table.column('nf')
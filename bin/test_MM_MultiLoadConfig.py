@@ -0,0 +1,56 @@
+"""複数ワークブック設定情報の試験
+
+"""
+import os
+import shutil
+
+import pytest
+
+from MM_MultiLoadConfig import MultiLoadConfig
+from MM_ScenarioSource import ScenarioSource
+from MM_SubLoadConfig import SubLoadConfig
+
+SAMPLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MM_scenario_config_one.xlsx')
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    # サンプルのワークブック、同じ内容のJSON Lines、無関係のJSON Lines、SQLite拡張子のファイルを格納したディレクトリ
+    shutil.copy(SAMPLE_CONFIG, tmp_path / 'site_a.xlsx')
+    ScenarioSource.convert(SAMPLE_CONFIG, str(tmp_path / 'site_b.jsonl'), 'jsonl')
+    (tmp_path / 'requests.jsonl').write_text('{"request_id": "r1", "title": "t"}\n', encoding='utf-8')
+    (tmp_path / 'cache.db').write_bytes(b'not a database')
+    return tmp_path
+
+
+def test_workbook_files_skips_unrelated_sources(config_dir):
+    names = [os.path.basename(file_name) for file_name in MultiLoadConfig.workbook_files(str(config_dir))]
+    assert names == ['site_a.xlsx', 'site_b.jsonl']
+
+
+def test_workbook_files_keeps_explicit_paths(config_dir):
+    file_name = str(config_dir / 'requests.jsonl')
+    assert MultiLoadConfig.workbook_files([file_name]) == [file_name]
+
+
+def test_load_directory(config_dir):
+    config = MultiLoadConfig(str(config_dir), None)
+    assert config.errors == {}
+    assert len(config.subConfigs) == 2 * len(SubLoadConfig(SAMPLE_CONFIG).subConfigs)
+    assert [conflict.name for conflict in config.conflicts][:3] == ['amf_dns_show', 'amf_dns_del', 'amf_dns_up']
+
+
+def test_load_error_raises(config_dir):
+    broken = config_dir / 'site_c.xlsx'
+    broken.write_bytes(b'broken')
+    with pytest.raises(ValueError, match='site_c.xlsx'):
+        MultiLoadConfig(str(config_dir), None)
+
+
+def test_load_error_ignored_with_warning(config_dir):
+    broken = config_dir / 'site_c.xlsx'
+    broken.write_bytes(b'broken')
+    with pytest.warns(RuntimeWarning, match='site_c.xlsx'):
+        config = MultiLoadConfig(str(config_dir), None, ignore_errors=True)
+    assert list(config.errors) == [str(broken)]
+    assert len(config.subConfigs) == 2 * len(SubLoadConfig(SAMPLE_CONFIG).subConfigs)
@@ -0,0 +1,148 @@
+"""シナリオ依存グラフの試験
+
+"""
+import os
+import threading
+
+import pytest
+
+import MM_Dao
+from MM_CommandConfig import CommandConfig
+from MM_Dao import MM_Dao as Dao
+from MM_ScenarioGraph import ScenarioGraph
+from MM_SubLoadConfig import SubLoadConfig
+
+SAMPLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MM_scenario_config_one.xlsx')
+NAN = float('nan')
+
+
+def command(no, task, when, text, var=NAN):
+    return CommandConfig('REMOTE', no, task, f'{no}_{task}', when, text, var, 'no_check', '-', '-', NAN)
+
+
+def items(level_list):
+    return [[commandConfig.item for commandConfig in level] for level in level_list]
+
+
+@pytest.fixture(scope='module')
+def config():
+    return SubLoadConfig(SAMPLE_CONFIG)
+
+
+def test_sample_levels(config):
+    graph = config.get_graph('amf_dns_show')
+    assert items(graph.levels()) == [
+        ['1_CMD_SHOW', '3_CMD_SHOW'], ['2_CMD_SHOW_CHECK', '4_CMD_SHOW_CHECK'], ['5_HANTEI_UP'], ['6_HANTEI_DOWN']]
+    assert graph.dependencies('2_CMD_SHOW_CHECK') == ('1_CMD_SHOW',)
+    assert graph.critical_path({'1_CMD_SHOW': 5}) == ['1_CMD_SHOW', '2_CMD_SHOW_CHECK', '5_HANTEI_UP', '6_HANTEI_DOWN']
+    assert config.get_graph('none') is None
+
+
+def test_independent_commands_run_in_parallel(config):
+    graph = config.get_graph('amf_dns_show')
+    # 最初の段階の2つのコマンドが同時に実行中でなければ、待ち合わせが時間切れになる
+    barrier = threading.Barrier(2, timeout=5)
+
+    def execute(commandConfig, inputs):
+        if commandConfig.item in ('1_CMD_SHOW', '3_CMD_SHOW'):
+            barrier.wait()
+        return commandConfig.item
+
+    results = graph.run(execute, workers=0)
+    assert list(results) == [commandConfig.item for commandConfig in graph.commands]
+    assert not barrier.broken
+
+
+def test_serial_run_does_not_overlap(config):
+    graph = config.get_graph('amf_dns_show')
+    barrier = threading.Barrier(2, timeout=0.2)
+
+    def execute(commandConfig, inputs):
+        if commandConfig.item in ('1_CMD_SHOW', '3_CMD_SHOW'):
+            barrier.wait()
+        return commandConfig.item
+
+    with pytest.raises(threading.BrokenBarrierError):
+        graph.run(execute, workers=None)
+
+
+def test_ordered_tasks_are_configurable(config, monkeypatch):
+    # 既定では設定変更のシナリオは、すべてのコマンドを順に実行する
+    assert [len(level) for level in config.get_graph('amf_dns_del').levels()] == [1] * 6
+    unordered = config.get_graph('amf_dns_del', ())
+    assert len(unordered.levels()) < 6
+    # MM_Daoの設定値で順序を保つタスクを変更する
+    monkeypatch.setattr(MM_Dao, 'scenarioOrderedTasks', ())
+    assert items(Dao.get_graph(config, 'amf_dns_del').levels()) == items(unordered.levels())
+    monkeypatch.setattr(MM_Dao, 'scenarioOrderedTasks', ('CMD_SHOW',))
+    assert [len(level) for level in Dao.get_graph(config, 'amf_dns_show').levels()] == [1, 1, 1, 1, 1, 1]
+
+
+def test_references_come_from_declared_reads_and_writes():
+    graph = ScenarioGraph([
+        command(1, 'CMD_SHOW', 'true', 'gsh list_dns_server', var='gsh'),
+        # {{}}で囲まない単語、文字列リテラルは変数の参照とみなさない
+        command(2, 'CMD_SHOW', '"gsh" == "gsh"', 'gsh list_dns_server'),
+        command(3, 'CMD_SHOW', 'true', 'gsh list {{gsh}}'),
+        command(4, 'CMD_SHOW', 'gsh == "x"', 'gsh list_dns_server'),
+        command(5, 'CMD_SHOW', '1_CMD_SHOW.status == "OK"', 'gsh show'),
+        command(6, 'CMD_CHECK', 'true', 'get_item(2_CMD_SHOW.raw)'),
+        # 実行条件式の{{変数名}}
+        command(7, 'CMD_CHECK', '{{gsh}} == "x"', 'gsh show'),
+    ], ())
+    assert graph.dependencies('1_CMD_SHOW') == ()
+    assert graph.dependencies('2_CMD_SHOW') == ()
+    assert graph.dependencies('3_CMD_SHOW') == ('1_CMD_SHOW',)
+    assert graph.dependencies('4_CMD_SHOW') == ('1_CMD_SHOW',)
+    assert graph.dependencies('5_CMD_SHOW') == ('1_CMD_SHOW',)
+    assert graph.dependencies('6_CMD_CHECK') == ('2_CMD_SHOW',)
+    assert graph.dependencies('7_CMD_CHECK') == ('1_CMD_SHOW',)
+
+
+def test_same_variable_writes_keep_order():
+    graph = ScenarioGraph([
+        command(1, 'HANTEI', 'true', 'update_var("UP")', var='status'),
+        command(2, 'HANTEI', 'true', 'update_var("DOWN")', var='status'),
+        command(3, 'CMD_SHOW', 'true', 'gsh show'),
+    ], ())
+    assert items(graph.levels()) == [['1_HANTEI', '3_CMD_SHOW'], ['2_HANTEI']]
+
+
+def test_invalid_when_is_conservative():
+    graph = ScenarioGraph([
+        command(1, 'CMD_SHOW', 'true', 'gsh show', var='status'),
+        command(2, 'CMD_SHOW', 'status ==', 'gsh show'),
+        command(3, 'CMD_SHOW', '"status" ==', 'gsh show'),
+    ], ())
+    assert graph.dependencies('2_CMD_SHOW') == ('1_CMD_SHOW',)
+    assert graph.dependencies('3_CMD_SHOW') == ()
+
+
+def test_ordered_task_waits_for_all_previous():
+    graph = ScenarioGraph([
+        command(1, 'CMD_SHOW', 'true', 'gsh show'),
+        command(2, 'CMD_SHOW', 'true', 'gsh show'),
+        command(3, 'CMD_CONFIG_DEL', 'true', 'gsh delete'),
+        command(4, 'CMD_SHOW', 'true', 'gsh show'),
+    ])
+    assert graph.dependencies('3_CMD_CONFIG_DEL') == ('1_CMD_SHOW', '2_CMD_SHOW')
+    assert graph.dependencies('4_CMD_SHOW') == ('3_CMD_CONFIG_DEL',)
+
+
+def test_inputs_are_snapshots_and_errors_propagate(config):
+    graph = config.get_graph('amf_dns_show')
+    started = []
+    lock = threading.Lock()
+
+    def execute(commandConfig, inputs):
+        with lock:
+            started.append(commandConfig.item)
+        assert tuple(inputs) == graph.dependencies(commandConfig.item)
+        if commandConfig.item == '2_CMD_SHOW_CHECK':
+            raise RuntimeError(commandConfig.item)
+        return commandConfig.item.upper()
+
+    with pytest.raises(RuntimeError, match='2_CMD_SHOW_CHECK'):
+        graph.run(execute)
+    # 例外が発生したコマンドに依存するコマンドは開始しない
+    assert '5_HANTEI_UP' not in started and '6_HANTEI_DOWN' not in started
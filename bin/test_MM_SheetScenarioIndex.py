@@ -0,0 +1,105 @@
+"""サブシート別シナリオ索引の試験
+
+"""
+import itertools
+import os
+import threading
+
+import MM_SubLoadConfig
+from MM_CommandConfig import CommandConfig
+from MM_ScenarioConfig import ScenarioConfig
+from MM_ScenarioIndex import ScenarioIndex
+from MM_SheetScenarioIndex import SheetScenarioIndex
+from MM_SubLoadConfig import SubLoadConfig
+
+SAMPLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MM_scenario_config_one.xlsx')
+NAN = float('nan')
+
+
+def command(sheet, no, item):
+    return CommandConfig('REMOTE', no, 'CMD_SHOW', item, 'true', f'{sheet} {no} {item}', NAN, 'no_check', '-', '-', NAN)
+
+
+# 同じシナリオ名を複数のサブシートに定義し、コマンド採番、コマンド概要項目が重複するサブシート
+SHEETS = {
+    'SUB001': [ScenarioConfig('show', [command('SUB001', 2, 'a'), command('SUB001', NAN, 'b')]),
+               ScenarioConfig('down', [command('SUB001', 1, 'a')])],
+    'SUB002': [ScenarioConfig('show', [command('SUB002', 1, 'a'), command('SUB002', 2, 'c')]),
+               ScenarioConfig('up', [command('SUB002', 1, 'a')])],
+    'SUB003': [ScenarioConfig('show', [command('SUB003', 'x', 'b'), command('SUB003', 2, 'd')]),
+               ScenarioConfig('down', [command('SUB003', 3, 'e')])],
+}
+SCENARIOS = ('show', 'down', 'up', 'none')
+
+
+def assert_same(index, expected):
+    assert len(index) == len(expected)
+    for scenario in SCENARIOS:
+        assert (scenario in index) == (scenario in expected)
+        assert index.get_scenario(scenario) is expected.get_scenario(scenario)
+        assert index.get_commands(scenario) == expected.get_commands(scenario)
+        for item in 'abcdez':
+            assert index.get_item(scenario, item) is expected.get_item(scenario, item)
+        for no in (1, 2, 3, 'x', NAN):
+            assert index.get_no(scenario, no) is expected.get_no(scenario, no)
+
+
+def test_matches_merged_index_in_any_load_order():
+    sheet_names = list(SHEETS)
+    for order in itertools.permutations(sheet_names):
+        index = SheetScenarioIndex(sheet_names)
+        loaded = []
+        for sheet_name in order:
+            previous = index
+            index = index.add(sheet_name, ScenarioIndex(SHEETS[sheet_name]))
+            loaded.append(sheet_name)
+            expected = ScenarioIndex(scenarioConfig for name in sheet_names if name in loaded for scenarioConfig in SHEETS[name])
+            assert_same(index, expected)
+            # 追加前の索引は変更しない
+            assert len(previous) <= len(index)
+        assert [commandConfig.command for commandConfig in index.get_commands('show')] == [
+            'SUB002 1 a', 'SUB001 2 a', 'SUB002 2 c', 'SUB003 2 d', 'SUB003 x b', 'SUB001 nan b']
+
+
+def test_add_does_not_change_previous_index():
+    index = SheetScenarioIndex(list(SHEETS)).add('SUB002', ScenarioIndex(SHEETS['SUB002']))
+    added = index.add('SUB001', ScenarioIndex(SHEETS['SUB001']))
+    assert index.get_scenario('show') is SHEETS['SUB002'][0]
+    assert added.get_scenario('show') is SHEETS['SUB001'][0]
+    assert 'down' not in index
+
+
+def test_lazy_load_builds_each_sheet_index_once(monkeypatch):
+    built = []
+
+    class CountingIndex(ScenarioIndex):
+        def __init__(self, subConfigs=()):
+            subConfigs = list(subConfigs)
+            built.append(len(subConfigs))
+            super().__init__(subConfigs)
+
+    monkeypatch.setattr(MM_SubLoadConfig, 'ScenarioIndex', CountingIndex)
+    config = SubLoadConfig(SAMPLE_CONFIG)
+    assert config.get_scenario('amf_dns_up').scenario == 'amf_dns_up'
+    assert config.get_scenario('amf_dns_show').scenario == 'amf_dns_show'
+    config.load_sheets()
+    # 読み込んだサブシートの索引だけを生成し、読み込み済みの全サブシートの索引は生成し直さない
+    assert built == [len(config.get_sheet(sub_sheet_name)) for sub_sheet_name in config.sub_sheet_list]
+    assert len(config.get_commands('amf_dns_del')) == 6
+
+
+def test_concurrent_get_scenario():
+    config = SubLoadConfig(SAMPLE_CONFIG)
+    results = []
+
+    def find(scenario):
+        results.append(config.get_scenario(scenario))
+
+    threads = [threading.Thread(target=find, args=(scenario,))
+               for scenario in ('amf_dns_up', 'amf_dns_del', 'amf_dns_show') * 8]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 24 and all(result is not None for result in results)
+    assert config.loaded_sheet_list == config.sub_sheet_list
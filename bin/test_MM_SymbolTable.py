@@ -0,0 +1,55 @@
+"""シンボルテーブルの試験
+
+"""
+import os
+import pickle
+
+from MM_SubLoadConfig import SubLoadConfig
+from MM_SymbolTable import SymbolTable
+from MM_Workbook import Workbook
+
+SAMPLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MM_scenario_config_one.xlsx')
+
+
+def test_intern_returns_first_object():
+    symbols = SymbolTable()
+    first = ''.join(['RE', 'MOTE'])
+    second = ''.join(['REM', 'OTE'])
+    assert first is not second
+    assert symbols.intern(first) is first
+    assert symbols.intern(second) is first
+    assert len(symbols) == 1
+
+
+def test_intern_keeps_non_strings():
+    symbols = SymbolTable()
+    nan = float('nan')
+    assert symbols.intern(nan) is nan
+    assert symbols.intern(1) == 1
+    assert len(symbols) == 0
+
+
+def first_nodes(config):
+    return [config.get_sheet(sub_sheet_name)[0].commandConfigs[0].node for sub_sheet_name in config.sub_sheet_list]
+
+
+def test_loader_shares_table_across_sheets():
+    config = SubLoadConfig(SAMPLE_CONFIG)
+    nodes = first_nodes(config)
+    assert nodes[0] == nodes[1] == 'REMOTE'
+    # 参照時に1シートずつ読み込んでも、同じ値の文字列は1つのオブジェクトになる
+    assert nodes[0] is nodes[1]
+    # 別々に読み込んだシートは、それぞれのシンボルテーブルでまとめる
+    config_file = Workbook.open(SAMPLE_CONFIG)
+    show = SubLoadConfig.load_sheet(config_file, 'SUB_SHOW')
+    down = SubLoadConfig.load_sheet(config_file, 'SUB_DOWN')
+    assert show[0].commandConfigs[0].node is not down[0].commandConfigs[0].node
+
+
+def test_table_is_not_pickled():
+    config = SubLoadConfig(SAMPLE_CONFIG)
+    config.get_sheet('SUB_SHOW')
+    assert '_SubLoadConfig__symbols' not in config.__getstate__()
+    restored = pickle.loads(pickle.dumps(config))
+    nodes = first_nodes(restored)
+    assert nodes[1] is nodes[2]
@@ -0,0 +1,161 @@
+"""コマンド送信、擬似NFの試験
+
+"""
+import asyncio
+import shlex
+
+import pytest
+
+from MM_FakeNF import FakeNF, LocalTransport
+from MM_Transport import SessionPool, StreamTransport, STATUS_OK, STATUS_NG
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def serve(fakeNF, command_timeout=5.0):
+    # 擬似NFをTCPサーバとして起動し、接続するトランスポートを返す
+    server = await fakeNF.serve()
+    port = server.sockets[0].getsockname()[1]
+    return server, StreamTransport(port, '127.0.0.1', command_timeout=command_timeout)
+
+
+def test_local_session_reused_per_remote_host():
+    fakeNF = FakeNF(latency=0.01)
+    fakeNF.add_server('amf1', 'dn1', 'ns1')
+
+    async def main():
+        async with SessionPool(LocalTransport(fakeNF)) as pool:
+            results = await asyncio.gather(*(pool.run(remote_host, '10.0.0.1', 'amf1', 'gsh list_dns_server')
+                                             for remote_host in ('jump1', 'jump2', 'jump1', 'jump2', 'jump1')))
+            return results, pool.opened
+
+    results, opened = run(main())
+    assert opened == 2
+    assert [result.remote_host for result in results] == ['jump1', 'jump2', 'jump1', 'jump2', 'jump1']
+    assert all(result.status == STATUS_OK and result.output == 'dn1 ns1 ps Class\n' for result in results)
+    assert fakeNF.commands == 5
+
+
+def test_stream_session_reused_per_remote_host():
+    fakeNF = FakeNF()
+    fakeNF.add_server('amf1', 'dn1', 'ns1')
+
+    async def main():
+        server, transport = await serve(fakeNF)
+        try:
+            async with SessionPool(transport) as pool:
+                outputs = []
+                for command in ('gsh list_dns_server', 'gsh list_dns_server_address all', 'gsh check_config'):
+                    outputs.append((await pool.run('jump1', '127.0.0.1', 'amf1', command)).output)
+                return outputs, pool.opened
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    outputs, opened = run(main())
+    assert outputs == ['dn1 ns1 ps Class\n', 'dn1 ns1 ps Class\n', 'Info: configuration is valid\n']
+    assert opened == 1
+
+
+def test_session_dropped_after_timeout():
+    # 応答を待つ時間を過ぎたコマンドの出力を、次のコマンドの出力として受信しない
+    fakeNF = FakeNF(latency={'list_dns_server': 0.3})
+    fakeNF.add_server('amf1', 'dn1', 'ns1')
+
+    async def main():
+        server, transport = await serve(fakeNF, command_timeout=0.05)
+        try:
+            async with SessionPool(transport) as pool:
+                with pytest.raises(asyncio.TimeoutError):
+                    await pool.run('jump1', '127.0.0.1', 'amf1', 'gsh list_dns_server')
+                result = await pool.run('jump1', '127.0.0.1', 'amf1', 'gsh check_config')
+                return result, pool.opened
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    result, opened = run(main())
+    assert result.output == 'Info: configuration is valid\n'
+    assert opened == 2
+
+
+def test_session_dropped_after_cancel():
+    fakeNF = FakeNF(latency={'list_dns_server': 0.3})
+
+    async def main():
+        server, transport = await serve(fakeNF)
+        try:
+            async with SessionPool(transport) as pool:
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(pool.run('jump1', '127.0.0.1', 'amf1', 'gsh list_dns_server'), 0.05)
+                result = await pool.run('jump1', '127.0.0.1', 'amf1', 'gsh check_config')
+                return result, pool.opened
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    result, opened = run(main())
+    assert result.output == 'Info: configuration is valid\n'
+    assert opened == 2
+
+
+def test_session_dropped_after_ng():
+    fakeNF = FakeNF()
+
+    async def main():
+        async with SessionPool(LocalTransport(fakeNF)) as pool:
+            first = await pool.run('jump1', '10.0.0.1', 'amf1', 'gsh check_config')
+            ng = await pool.run('jump1', '10.0.0.1', 'amf1', 'gsh no_such_command')
+            after = await pool.run('jump1', '10.0.0.1', 'amf1', 'gsh check_config')
+            return first, ng, after, pool.opened
+
+    first, ng, after, opened = run(main())
+    assert first.status == STATUS_OK and ng.status == STATUS_NG and after.status == STATUS_OK
+    assert ng.output == 'unknown subcommand: no_such_command\n'
+    assert opened == 2
+
+
+def test_add_pending_activate_round_trip():
+    fakeNF = FakeNF()
+    fakeNF.add_server('amf1', 'dn1', 'ns1')
+
+    async def main():
+        async with SessionPool(LocalTransport(fakeNF)) as pool:
+            async def send(command):
+                result = await pool.run('jump1', '10.0.0.1', 'amf1', command)
+                assert result.status == STATUS_OK, result
+                return result.output
+
+            await send('gsh create_dns_server -dn "q r" -ns ns2')
+            await send('gsh delete_dns_server -dn dn1 -ns ns1')
+            pending = await send('gsh list_config_pending')
+            before = fakeNF.servers('amf1')
+            await send('gsh activate_config_pending')
+            activated = fakeNF.servers('amf1')
+            await send('gsh delete_dns_server -dn "q r" -ns ns2')
+            await send('gsh undo_config_pending')
+            return pending, before, activated, await send('gsh list_config_pending'), await send('gsh list_dns_server')
+
+    pending, before, activated, undone, listed = run(main())
+    # 空白を含む値も引用して出力するため、分割して元の値に戻せる
+    assert [shlex.split(line) for line in pending.splitlines()] == [['New', 'server', 'q r', 'ns2'], ['Deleted', 'server', 'dn1', 'ns1']]
+    assert before == {('dn1', 'ns1')}
+    assert activated == {('q r', 'ns2')}
+    assert undone == ''
+    assert fakeNF.servers('amf1') == {('q r', 'ns2')}
+    assert listed == 'q r ns2 ps Class\n'
+
+
+def test_fake_nf_errors():
+    fakeNF = FakeNF()
+
+    async def main():
+        return [await fakeNF.execute('amf1', command)
+                for command in ('ls', 'gsh create_dns_server -dn dn1', 'gsh list "unterminated')]
+
+    (status1, output1), (status2, output2), (status3, output3) = run(main())
+    assert (status1, output1) == (STATUS_NG, 'command not found: ls\n')
+    assert status2 == STATUS_NG and '-dn and -ns are required' in output2
+    assert status3 == STATUS_NG and output3.startswith('syntax error')
@@ -0,0 +1,131 @@
+"""実行条件式の試験
+
+"""
+import glob
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import MM_WhenExpression
+from MM_BoundedCache import BoundedCache
+from MM_Workbook import Workbook, ENGINE_XML
+from MM_WhenExpression import WhenExpression
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+NAN = float('nan')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    WhenExpression.clear_cache()
+    yield
+    WhenExpression.clear_cache()
+
+
+def bundled_sources():
+    # 同梱のシナリオ設定情報ファイルのすべての実行条件項目
+    config_file_names = sorted(glob.glob(os.path.join(BASE_DIR, '*.xlsx')) + glob.glob(os.path.join(BASE_DIR, 'old_xlsx', '*.xlsx'))
+                               + glob.glob(os.path.join(BASE_DIR, os.pardir, '*.xlsx')))
+    sources = {}
+    for config_file_name in config_file_names:
+        workbook = Workbook.open(config_file_name, ENGINE_XML)
+        for sheet_name in workbook.sheet_names:
+            for row in workbook.rows(sheet_name):
+                source = getattr(row, 'WHEN', None)
+                if isinstance(source, str):
+                    sources.setdefault(source, f'{os.path.basename(config_file_name)} {sheet_name}')
+    return sources
+
+
+def test_bundled_when_expressions_compile():
+    sources = bundled_sources()
+    assert sources
+    for source, location in sources.items():
+        try:
+            WhenExpression(source)
+        except ValueError as error:
+            pytest.fail(f'{location}: {error}')
+
+
+@pytest.mark.parametrize('source', [NAN, None, '', '  ', '-', ' - ', 'true', 'any', 'TRUE'])
+def test_no_condition_is_true(source):
+    assert WhenExpression.compile(source).evaluate({}) is True
+    assert WhenExpression.compile(source).references == ()
+
+
+def test_false_keyword():
+    assert WhenExpression.compile('false')({}) is False
+
+
+def test_result_reference_and_attribute():
+    expression = WhenExpression.compile('1_CMD_SHOW.status == "OK"')
+    assert expression.references == ('1_CMD_SHOW.status',)
+    # 参照名全体のキー、最初の"."より前のキーの辞書、属性のいずれからも引く
+    assert expression({'1_CMD_SHOW.status': 'OK'})
+    assert expression({'1_CMD_SHOW': {'status': 'OK'}})
+    assert expression({'1_CMD_SHOW': SimpleNamespace(status='OK')})
+    assert not expression({'1_CMD_SHOW': SimpleNamespace(status='NG')})
+    assert not expression({})
+
+
+def test_multiline_and_or():
+    expression = WhenExpression.compile('1_CMD_SHOW_CHECK.status == "OK"\n&& 2_CMD_SHOW_CHECK.status == "OK"')
+    assert expression.references == ('1_CMD_SHOW_CHECK.status', '2_CMD_SHOW_CHECK.status')
+    assert expression({'1_CMD_SHOW_CHECK.status': 'OK', '2_CMD_SHOW_CHECK.status': 'OK'})
+    assert not expression({'1_CMD_SHOW_CHECK.status': 'OK', '2_CMD_SHOW_CHECK.status': 'NG'})
+    expression = WhenExpression.compile('a.status == "NG" ||\nb.status == "NG"')
+    assert expression({'a.status': 'OK', 'b.status': 'NG'})
+    assert not expression({'a.status': 'OK', 'b.status': 'OK'})
+
+
+def test_placeholder_is_variable_reference():
+    expression = WhenExpression.compile('{{heisoku_status}} == "UP" ||\n{{ heisoku_status }} == "DOWN"')
+    assert expression.references == ('heisoku_status',)
+    assert expression({'heisoku_status': 'UP'})
+    assert expression({'heisoku_status': 'DOWN'})
+    assert not expression({'heisoku_status': 'SHOW'})
+
+
+def test_text_prefix_and_trailing_or():
+    # 各行の先頭の「'」と、末尾の||は無視する
+    source = 'node.handover == "osc.*"||\n\'node.handover == "chy.*"||\n\'node.handover ==  "b[0-9].*"||'
+    expression = WhenExpression.compile(source)
+    assert expression.references == ('node.handover',)
+    for host, expected in (('osc01', True), ('chy02', True), ('b1x', True), ('tam01', False), ('xosc01', False)):
+        assert expression({'node': {'handover': host}}) is expected, host
+    assert not expression({})
+    assert WhenExpression.compile("  'true")({}) is True
+
+
+def test_operators():
+    values = {'a': 'OK', 'n': 3, 'flag': 'true', 'off': 'no'}
+    assert WhenExpression.compile('a != "NG"')(values)
+    assert WhenExpression.compile('a =~ "O."')(values)
+    assert WhenExpression.compile('a !~ "N."')(values)
+    assert WhenExpression.compile('n == 3')(values)
+    assert WhenExpression.compile('n == 3.0')(values)
+    assert WhenExpression.compile('n != 4')(values)
+    assert WhenExpression.compile('flag')(values)
+    assert not WhenExpression.compile('off')(values)
+    assert WhenExpression.compile('!(a == "NG" || n == 4) && flag')(values)
+    # 文字列の比較は前後の空白を含めて比較する
+    assert not WhenExpression.compile('a == "OK "')(values)
+
+
+@pytest.mark.parametrize('source', ['a ==', 'a == b', '(a == "x"', 'a == "x")', '&& a', 'a # b', '== "x"'])
+def test_invalid_syntax(source):
+    with pytest.raises(ValueError):
+        WhenExpression.compile(source)
+
+
+def test_compile_is_shared_and_bounded(monkeypatch):
+    monkeypatch.setattr(MM_WhenExpression, 'expressions', BoundedCache(2))
+    first = WhenExpression.compile('a == "x"')
+    assert WhenExpression.compile('a == "x"') is first
+    WhenExpression.compile('b == "x"')
+    WhenExpression.compile('c == "x"')
+    assert len(MM_WhenExpression.expressions) == 2
+    assert WhenExpression.compile('a == "x"') is not first
+    WhenExpression.clear_cache()
+    assert len(MM_WhenExpression.expressions) == 0